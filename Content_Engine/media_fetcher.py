@@ -6,6 +6,7 @@ from PIL import Image
 from io import BytesIO
 import logging
 from utils.config_loader import load_config
+from utils.tracing import get_tracer
 
 import os
 import logging
@@ -43,6 +44,10 @@ class MediaFetcher:
         Returns:
             str: Path to downloaded media file
         """
+        with get_tracer().span("fetch_media", keywords=list(keywords), media_type=media_type):
+            return self._fetch_media_for_keywords(keywords, media_type)
+
+    def _fetch_media_for_keywords(self, keywords, media_type):
         mode = self.config['media']['mode']
 
         if mode == "manual":
@@ -236,10 +241,13 @@ class MediaFetcher:
                 filepath = os.path.join(self.temp_dir, filename)
 
                 # Save the file
-                with open(filepath, 'wb') as f:
+                downloaded = 0
+                with get_tracer().span("download", file_type=file_type), open(filepath, 'wb') as f:
                     for chunk in response.iter_content(chunk_size=1024):
                         if chunk:
                             f.write(chunk)
+                            downloaded += len(chunk)
+                get_tracer().count("bytes_downloaded", downloaded)
 
                 logger.info(f"Successfully downloaded {file_type} to {filepath}")
                 return filepath
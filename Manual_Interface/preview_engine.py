@@ -0,0 +1,39 @@
+"""Low-resolution proxy renders for checking pacing and layout."""
+from typing import Dict, List, Optional
+from Media_Handler.video_processor import VideoProcessor
+from utils.config_loader import load_config
+
+# Resolution scale and frame rate per performance.preview_quality
+PREVIEW_SETTINGS = {
+    "low": {"scale": 0.25, "fps": 12},
+    "medium": {"scale": 0.5, "fps": 15},
+    "high": {"scale": 0.75, "fps": 24}
+}
+
+
+class PreviewEngine:
+    """Renders proxies through the same scene/timeline path as the final render."""
+    def __init__(self, video_processor: Optional[VideoProcessor] = None, config: Optional[Dict] = None):
+        self.config = config if config else load_config()
+        self.video_processor = video_processor or VideoProcessor(self.config)
+
+    def get_preview_settings(self, quality: Optional[str] = None) -> Dict:
+        """Get proxy scale and fps for a preview quality level."""
+        quality = quality or self.config.get('performance', {}).get('preview_quality', "medium")
+        if quality not in PREVIEW_SETTINGS:
+            print(f"Warning: Unknown preview quality '{quality}', using medium")
+            quality = "medium"
+        return PREVIEW_SETTINGS[quality]
+
+    def render_proxy(self, scenes: List[Dict], audio_file: str = "", style_name: str = "modern",
+                     quality: Optional[str] = None) -> Optional[str]:
+        """Render a scaled-down, reduced-fps proxy of the video."""
+        settings = self.get_preview_settings(quality)
+        return self.video_processor.process_video(
+            scenes,
+            audio_file,
+            style_name,
+            profile="preview",
+            scale=settings["scale"],
+            fps=settings["fps"]
+        )
@@ -1,4 +1,14 @@
+import hashlib
 import os
+import tempfile
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+from Media_Handler.ffmpeg_utils import fit_video
+from utils.cache_store import CacheStore
+from utils.tracing import get_tracer
 
 def get_asset(asset_name: str, asset_folder: str = "./Content_Engine/assets") -> str:
     """
@@ -11,6 +21,183 @@ def get_asset(asset_name: str, asset_folder: str = "./Content_Engine/assets") ->
     else:
         raise FileNotFoundError(f"Asset '{asset_name}' not found in {asset_folder}")
 
+
+# Content hashes of source files, keyed by (path, size, mtime)
+_source_hashes: Dict[Tuple[str, int, float], str] = {}
+
+
+def source_hash(path: str) -> str:
+    """SHA-256 of a file's contents, memoized while the file is unchanged."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    digest = _source_hashes.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = _source_hashes[key] = sha.hexdigest()
+    return digest
+
+
+def blur_radius(blur: float, height: int) -> float:
+    """Blur radius in pixels for a ``background_blur`` strength (0-10, relative to 1080p)."""
+    return max(float(blur or 0), 0.0) * height / 1080
+
+
+WATERMARK_POSITIONS = ("top-left", "top-right", "bottom-left", "bottom-right")
+
+
+def load_watermark(settings: Dict, size: Tuple[int, int]) -> Optional[Tuple[np.ndarray, Tuple[int, int]]]:
+    """Get the watermark from ``video_style.watermark`` settings for a frame size.
+
+    Returns a read-only RGBA array with opacity applied and its top-left
+    position, or None when the watermark is disabled or missing. The image
+    is decoded and scaled once per file version and frame size.
+    """
+    if not settings or not settings.get('enabled', False):
+        return None
+    path = settings.get('image_path')
+    if not path or not os.path.isfile(path):
+        print(f"Warning: Watermark image not found: {path}")
+        return None
+    position = settings.get('position', "bottom-right")
+    if position not in WATERMARK_POSITIONS:
+        print(f"Warning: Unknown watermark position '{position}', using bottom-right")
+        position = "bottom-right"
+    return _load_watermark(
+        path, os.path.getmtime(path), tuple(size), position,
+        min(max(float(settings.get('opacity', 1.0)), 0.0), 1.0),
+        float(settings.get('scale', 0.15)),
+        float(settings.get('margin', 0.02))
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_watermark(path: str, mtime: float, size: Tuple[int, int], position: str, opacity: float,
+                    scale: float, margin: float) -> Tuple[np.ndarray, Tuple[int, int]]:
+    width, height = size
+    with Image.open(path) as img:
+        img = img.convert('RGBA')
+        # Width is a fraction of the frame width; never upscale past the source
+        target_w = max(min(int(round(width * scale)), img.width), 1)
+        target_h = max(int(round(img.height * target_w / img.width)), 1)
+        if (target_w, target_h) != img.size:
+            img = img.resize((target_w, target_h), Image.LANCZOS)
+        rgba = np.array(img, dtype=np.uint8)
+
+    if opacity < 1.0:
+        rgba[:, :, 3] = np.rint(rgba[:, :, 3] * opacity).astype(np.uint8)
+    rgba.setflags(write=False)
+
+    pad = int(round(width * margin))
+    x = pad if position.endswith("left") else width - pad - target_w
+    y = pad if position.startswith("top") else height - pad - target_h
+    return rgba, (x, y)
+
+
+class BackgroundCache:
+    """Background images and videos pre-scaled to the render resolution.
+
+    Each source is decoded once, cropped to cover the target frame, scaled,
+    blurred if configured and stored in the ``backgrounds`` CacheStore
+    namespace, keyed by the source's content hash and the target geometry.
+    Rendering then only ever sees frames that are already the output size.
+    """
+    def __init__(self, store: Optional[CacheStore] = None, memory_limit_mb: float = 256):
+        self.store = store
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024)
+        self.memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.memory_bytes = 0
+
+    @staticmethod
+    def make_key(kind: str, path: str, size: Tuple[int, int], blur: float, fps: Optional[float] = None) -> str:
+        """Build the cache key for a source prepared at a target geometry."""
+        return CacheStore.make_key("background", kind, source_hash(path), list(size), round(blur, 3), fps)
+
+    def get_image(self, path: str, size: Tuple[int, int], blur: float = 0) -> np.ndarray:
+        """Get an image background as a read-only RGB array of exactly ``size``."""
+        key = self.make_key("image", path, size, blur)
+        image = self.memory.get(key)
+        if image is not None:
+            self.memory.move_to_end(key)
+            get_tracer().count("background_cache_hits")
+            return image
+
+        cached = self.store.get(key, ".npy") if self.store else None
+        if cached:
+            try:
+                image = np.load(cached)
+            except (OSError, ValueError):
+                image = None
+        if image is not None and image.shape[:2] == (size[1], size[0]):
+            get_tracer().count("background_cache_hits")
+        else:
+            get_tracer().count("background_cache_misses")
+            with get_tracer().span("prepare_background", kind="image", file=os.path.basename(path)):
+                image = self._prepare_image(path, size, blur)
+            if self.store:
+                tmp_path = self.store.path_for(key, f".{os.getpid()}.npy")
+                try:
+                    np.save(tmp_path, image)
+                    self.store.put(key, tmp_path, ".npy", move=True)
+                except OSError as e:
+                    print(f"Warning: Could not write background cache entry: {str(e)}")
+
+        image.setflags(write=False)
+        self._remember(key, image)
+        return image
+
+    def get_video(self, path: str, size: Tuple[int, int], fps: float, blur: float = 0) -> str:
+        """Get the path of a video background transcoded to ``size`` and ``fps``."""
+        key = self.make_key("video", path, size, blur, fps)
+        cached = self.store.get(key, ".mp4") if self.store else None
+        if cached:
+            get_tracer().count("background_cache_hits")
+            return cached
+
+        get_tracer().count("background_cache_misses")
+        if self.store:
+            output_file = self.store.path_for(key, f".{os.getpid()}.mp4")
+        else:
+            output_file = os.path.join(tempfile.gettempdir(), f"background_{key[:16]}.mp4")
+        with get_tracer().span("prepare_background", kind="video", file=os.path.basename(path)):
+            fit_video(path, output_file, size, fps, blur_radius(blur, size[1]))
+        if self.store:
+            return self.store.put(key, output_file, ".mp4", move=True)
+        return output_file
+
+    @staticmethod
+    def _prepare_image(path: str, size: Tuple[int, int], blur: float) -> np.ndarray:
+        """Decode, crop to cover, scale and blur an image in one pass."""
+        width, height = size
+        with Image.open(path) as img:
+            # EXIF rotations by 90 degrees swap the stored dimensions
+            rotated = img.getexif().get(0x0112) in (5, 6, 7, 8)
+            src_w, src_h = (img.height, img.width) if rotated else img.size
+            scale = max(width / src_w, height / src_h)
+            if scale < 1:
+                # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 while staying above the target
+                request = (int(src_w * scale) + 1, int(src_h * scale) + 1)
+                img.draft('RGB', (request[1], request[0]) if rotated else request)
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            img = ImageOps.fit(img, (width, height), method=Image.LANCZOS)
+
+        radius = blur_radius(blur, height)
+        if radius > 0:
+            img = img.filter(ImageFilter.GaussianBlur(radius))
+        return np.asarray(img, dtype=np.uint8).copy()
+
+    def _remember(self, key: str, image: np.ndarray):
+        if key in self.memory:
+            return
+        self.memory[key] = image
+        self.memory_bytes += image.nbytes
+        while self.memory_bytes > self.memory_limit and len(self.memory) > 1:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted.nbytes
+
+
 if __name__ == "__main__":
     try:
         print("Asset path:", get_asset("example_image.jpg"))
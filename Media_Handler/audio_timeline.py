@@ -0,0 +1,136 @@
+"""Narration timeline assembled in a single preallocated PCM buffer.
+
+Clips are decoded once to 16-bit PCM and placed at their offsets, so
+building a track costs time in proportion to its length rather than to the
+number of clips times the length, as repeated segment concatenation does.
+"""
+import wave
+from typing import List, Optional, Tuple
+import numpy as np
+from Media_Handler.ffmpeg_utils import decode_audio, probe_duration
+from utils.tracing import get_tracer
+
+SAMPLE_RATE = 44100
+CHANNELS = 1
+# Seconds a narration may run into the next scene before that scene's narration is delayed
+OVERRUN_TOLERANCE = 0.05
+
+
+def read_pcm(path: str, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS) -> np.ndarray:
+    """Read an audio file as int16 samples of shape (frames, channels).
+
+    16-bit WAV files already in the target format are read directly;
+    anything else is decoded and resampled by ffmpeg.
+    """
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, 'rb') as f:
+                if (f.getframerate(), f.getnchannels(), f.getsampwidth()) == (sample_rate, channels, 2):
+                    data = f.readframes(f.getnframes())
+                    return np.frombuffer(data, dtype='<i2').reshape(-1, channels)
+        except (wave.Error, EOFError):
+            pass
+    data = decode_audio(path, sample_rate, channels)
+    return np.frombuffer(data, dtype='<i2').reshape(-1, channels)
+
+
+def audio_duration(path: str) -> Optional[float]:
+    """Length of an audio file in seconds, read from its header rather than decoded."""
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, 'rb') as f:
+                return f.getnframes() / f.getframerate()
+        except (wave.Error, EOFError):
+            pass
+    return probe_duration(path)
+
+
+def write_wav(path: str, samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> str:
+    """Write int16 samples of shape (frames, channels) to a WAV file."""
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(np.ascontiguousarray(samples, dtype='<i2').tobytes())
+    return path
+
+
+class AudioTimeline:
+    """Audio clips placed at offsets (in seconds) on one track."""
+    def __init__(self, sample_rate: int = SAMPLE_RATE, channels: int = CHANNELS):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.clips: List[Tuple[int, np.ndarray]] = []
+
+    def add(self, samples: np.ndarray, offset: float) -> float:
+        """Place int16 samples at ``offset`` seconds and return their duration."""
+        start = max(int(round(offset * self.sample_rate)), 0)
+        self.clips.append((start, samples.reshape(-1, self.channels)))
+        return len(samples) / self.sample_rate
+
+    def add_file(self, path: str, offset: float) -> float:
+        """Decode an audio file once, place it at ``offset`` seconds and return its duration."""
+        return self.add(read_pcm(path, self.sample_rate, self.channels), offset)
+
+    @property
+    def end(self) -> float:
+        """End of the last clip in seconds."""
+        return max((start + len(samples) for start, samples in self.clips), default=0) / self.sample_rate
+
+    def render(self, duration: Optional[float] = None) -> np.ndarray:
+        """Mix all clips into one int16 buffer of ``duration`` seconds (default: up to the last clip).
+
+        Gaps are silent; where clips overlap they are summed and clipped.
+        """
+        total = int(round((self.end if duration is None else duration) * self.sample_rate))
+        with get_tracer().span("mix_audio", clips=len(self.clips), seconds=round(total / self.sample_rate, 2)):
+            track = np.zeros((total, self.channels), dtype=np.int16)
+            # Samples covered by earlier clips, so non-overlapping clips are plain copies
+            covered = np.zeros(total, dtype=bool) if len(self.clips) > 1 else None
+            for start, samples in self.clips:
+                end = min(start + len(samples), total)
+                if end <= start:
+                    continue
+                region = track[start:end]
+                part = samples[:end - start]
+                if covered is not None and covered[start:end].any():
+                    mixed = region.astype(np.int32)
+                    mixed += part
+                    np.clip(mixed, -32768, 32767, out=mixed)
+                    region[:] = mixed
+                else:
+                    region[:] = part
+                if covered is not None:
+                    covered[start:end] = True
+            return track
+
+    def write(self, path: str, duration: Optional[float] = None) -> str:
+        """Render the timeline to a WAV file."""
+        return write_wav(path, self.render(duration), self.sample_rate)
+
+
+def narration_timeline(scene_files: List[Optional[str]], scene_starts: Optional[List[float]] = None,
+                       gap: float = 0.5) -> AudioTimeline:
+    """Place per-scene narration files (None for silent scenes) on one timeline.
+
+    With ``scene_starts`` each narration starts with its scene, or as soon as
+    the previous narration ends if that runs past the scene start, so voices
+    never overlap and scenes timed to their narration stay in sync. Without
+    it narrations follow each other ``gap`` seconds apart.
+    """
+    timeline = AudioTimeline()
+    offset = 0.0
+    for i, file in enumerate(scene_files):
+        if not file:
+            continue
+        if scene_starts is not None:
+            if offset - scene_starts[i] > OVERRUN_TOLERANCE:
+                # Never talk over the previous narration; this one starts late instead
+                print(f"Warning: Previous narration overruns scene {i + 1}; "
+                      f"its narration starts {offset - scene_starts[i]:.2f}s late")
+            else:
+                offset = scene_starts[i]
+            offset += timeline.add_file(file, offset)
+        else:
+            offset += timeline.add_file(file, offset) + gap
+    return timeline
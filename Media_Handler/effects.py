@@ -0,0 +1,235 @@
+"""Per-frame image effects and overlays for scene compositing.
+
+Effects precompute everything that depends only on the frame index when
+they are created, and render each frame into reused thread-local buffers,
+so FramePipeWriter workers can sample them concurrently without
+allocating full-resolution arrays per frame.
+"""
+import math
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+
+class KenBurnsEffect:
+    """Slow zoom into a still image, rendered from a precomputed crop schedule.
+
+    ``source`` must be the image prepared at ``source_size(size, ...)``: the
+    frame size enlarged by the zoom ratio, so even the tightest crop has a
+    source pixel for every output pixel. Each frame is a bilinear resample
+    of that frame's crop rectangle at its sub-pixel offset, which keeps the
+    motion smooth; source pixels are never more than ``1 + zoom_ratio``
+    apart in the output, so there is no decimation to alias.
+    """
+    def __init__(self, source: np.ndarray, size: Tuple[int, int], duration: float, fps: float,
+                 zoom_ratio: float = 0.05):
+        self.source = source
+        self.size = size
+        self.fps = fps
+        self.zoom_ratio = zoom_ratio
+        self.n_frames = max(int(round(duration * fps)), 1)
+        self._local = threading.local()
+
+        width, height = size
+        src_h, src_w = source.shape[:2]
+        # Crop rectangle per frame as (x, y, w, h) in source pixels: the whole
+        # source at the start, zooming in by zoom_ratio towards the centre
+        progress = np.linspace(0.0, 1.0, self.n_frames) if self.n_frames > 1 else np.zeros(1)
+        scale = 1.0 + zoom_ratio * progress
+        crop_w = src_w / scale
+        crop_h = src_h / scale
+        self.crops = np.stack([(src_w - crop_w) / 2, (src_h - crop_h) / 2, crop_w, crop_h], axis=1)
+
+        # Neighbouring source rows and columns and their blend weights for
+        # every output pixel of every frame; columns index the flattened RGB
+        # rows so the horizontal pass runs over contiguous memory
+        self.rows = [self._sample_points(y, h, height, src_h) for _, y, _, h in self.crops]
+        self.cols = []
+        for x, _, w, _ in self.crops:
+            left, right, left_weight, right_weight = self._sample_points(x, w, width, src_w)
+            channels = np.arange(3)
+            self.cols.append((
+                (left[:, None] * 3 + channels).ravel(), (right[:, None] * 3 + channels).ravel(),
+                np.repeat(left_weight, 3), np.repeat(right_weight, 3)
+            ))
+
+    @staticmethod
+    def source_size(size: Tuple[int, int], zoom_ratio: float) -> Tuple[int, int]:
+        """Source image size needed for a frame size and zoom ratio."""
+        factor = 1.0 + zoom_ratio
+        return int(math.ceil(size[0] * factor)), int(math.ceil(size[1] * factor))
+
+    @staticmethod
+    def _sample_points(start: float, extent: float, count: int, limit: int):
+        """Lower and upper neighbour indices, and the 8-bit weights of each."""
+        # Output pixel centres mapped to source pixel coordinates
+        points = np.clip(start + (np.arange(count) + 0.5) * (extent / count) - 0.5, 0, limit - 1)
+        lower = np.floor(points).astype(np.intp)
+        upper = np.minimum(lower + 1, limit - 1)
+        weight = np.rint((points - lower) * 256).astype(np.uint16)
+        return lower, upper, (256 - weight).astype(np.uint16), weight
+
+    def _buffers(self):
+        """Thread-local intermediate and output buffers, reused across frames."""
+        local = self._local
+        if getattr(local, 'out', None) is None:
+            width, height = self.size
+            src_h = self.source.shape[0]
+            local.near = np.empty((src_h, width * 3), dtype=np.uint8)
+            local.far = np.empty((src_h, width * 3), dtype=np.uint8)
+            local.cols = np.empty((src_h, width * 3), dtype=np.uint16)
+            local.part = np.empty((src_h, width * 3), dtype=np.uint16)
+            local.top = np.empty((height, width * 3), dtype=np.uint16)
+            local.bottom = np.empty((height, width * 3), dtype=np.uint16)
+            local.out = np.empty((height, width, 3), dtype=np.uint8)
+        return local
+
+    def get_frame(self, t: float) -> np.ndarray:
+        """Render the frame at time ``t``; the array is reused by the next call on this thread."""
+        index = min(max(int(round(t * self.fps)), 0), self.n_frames - 1)
+        local = self._buffers()
+        source = self.source.reshape(self.source.shape[0], -1)
+        # Horizontal pass: blend neighbouring columns in 16-bit fixed point
+        # (weights sum to 256), then round back to 8-bit values
+        left, right, left_weight, right_weight = self.cols[index]
+        np.take(source, left, axis=1, out=local.near)
+        np.take(source, right, axis=1, out=local.far)
+        np.multiply(local.near, left_weight, out=local.cols)
+        np.multiply(local.far, right_weight, out=local.part)
+        local.cols += local.part
+        local.cols += 128
+        local.cols >>= 8
+        # Vertical pass over the rows of the crop
+        top, bottom, top_weight, bottom_weight = self.rows[index]
+        np.take(local.cols, top, axis=0, out=local.top)
+        np.take(local.cols, bottom, axis=0, out=local.bottom)
+        local.top *= top_weight[:, None]
+        local.bottom *= bottom_weight[:, None]
+        local.top += local.bottom
+        local.top += 128
+        local.top >>= 8
+        np.copyto(local.out.reshape(local.top.shape), local.top, casting='unsafe')
+        return local.out
+
+
+class StaticOverlay:
+    """Still RGBA layers flattened once and blended onto moving frames.
+
+    Layers are composited into one image, cropped to the bounding box of
+    their visible pixels and stored premultiplied in uint16 with alpha
+    scaled to 0..256. Blending a frame then touches only that box, in
+    integer math: ``out = (frame * (256 - a) + rgb * a) >> 8``.
+    """
+    def __init__(self, layers: Iterable[Tuple[np.ndarray, Tuple[int, int]]], size: Tuple[int, int]):
+        """``layers`` are (RGBA uint8 array, (x, y)) pairs, bottom layer first."""
+        self.size = size
+        canvas = Image.new('RGBA', size, (0, 0, 0, 0))
+        for rgba, (x, y) in layers:
+            layer = Image.fromarray(rgba, 'RGBA')
+            # alpha_composite needs a non-negative offset, so crop off-frame parts first
+            left, top = max(-x, 0), max(-y, 0)
+            if left or top:
+                layer = layer.crop((left, top, layer.width, layer.height))
+            if layer.width and layer.height:
+                canvas.alpha_composite(layer, dest=(x + left, y + top))
+
+        self.bbox = canvas.getbbox()
+        self._local = threading.local()
+        if self.bbox is None:
+            return
+        x0, y0, x1, y1 = self.bbox
+        region = np.asarray(canvas.crop(self.bbox), dtype=np.uint16)
+        alpha = (region[:, :, 3:] * 256 + 127) // 255
+        self.alpha_inv = (256 - alpha).astype(np.uint16)
+        self.premultiplied = (region[:, :, :3] * alpha).astype(np.uint16)
+        self.region = (slice(y0, y1), slice(x0, x1))
+
+    @property
+    def empty(self) -> bool:
+        return self.bbox is None
+
+    def apply(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Blend the overlay onto ``frame`` into ``out`` (in place if ``out`` is ``frame``).
+
+        Without ``out`` the result goes to a thread-local buffer that is
+        reused by the next call on the same thread.
+        """
+        if out is None:
+            local = self._local
+            if getattr(local, 'out', None) is None or local.out.shape != frame.shape[:2] + (3,):
+                local.out = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+            out = local.out
+        if out is not frame:
+            np.copyto(out, frame[:, :, :3], casting='unsafe')
+        if self.bbox is None:
+            return out
+
+        local = self._local
+        shape = self.premultiplied.shape
+        if getattr(local, 'scratch', None) is None or local.scratch.shape != shape:
+            local.scratch = np.empty(shape, dtype=np.uint16)
+        target = out[self.region]
+        np.multiply(target, self.alpha_inv, out=local.scratch)
+        np.add(local.scratch, self.premultiplied, out=local.scratch)
+        np.right_shift(local.scratch, 8, out=local.scratch)
+        np.copyto(target, local.scratch, casting='unsafe')
+        return out
+
+
+class ColorCorrection:
+    """Brightness, contrast and saturation compiled to lookup tables.
+
+    Settings range from -50 to 50 as in ``video_style.color_correction``.
+    Brightness and contrast become one 256-entry table per channel;
+    saturation is a 3x3 matrix mixing each pixel with its luma, applied only
+    when it is non-zero.
+    """
+    LUMA = (0.299, 0.587, 0.114)
+
+    def __init__(self, brightness: float = 0, contrast: float = 0, saturation: float = 0):
+        self.settings = (float(brightness), float(contrast), float(saturation))
+        levels = np.arange(256, dtype=np.float32)
+        levels = (levels - 128) * (1 + contrast / 100) + 128 + brightness * 255 / 100
+        lut = np.clip(np.rint(levels), 0, 255).astype(np.uint8)
+        self.luts = np.stack([lut, lut, lut])
+
+        factor = 1 + saturation / 100
+        self.matrix = None
+        if factor != 1:
+            luma = np.array([self.LUMA] * 3, dtype=np.float32)
+            self.matrix = (factor * np.eye(3, dtype=np.float32) + (1 - factor) * luma).T.copy()
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['ColorCorrection']:
+        """Create the stage from ``video_style.color_correction``, or None if it is off."""
+        settings = config.get('video_style', {}).get('color_correction', {}) or {}
+        if not settings.get('enabled', False):
+            return None
+        values = [
+            min(max(float(settings.get(name, 0) or 0), -50.0), 50.0)
+            for name in ("brightness", "contrast", "saturation")
+        ]
+        if not any(values):
+            return None
+        return cls(*values)
+
+    def apply(self, frame: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Correct an RGB uint8 frame into ``out`` (may be ``frame`` itself, or a new array)."""
+        if out is None:
+            out = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+        for channel in range(3):
+            np.take(self.luts[channel], frame[:, :, channel], out=out[:, :, channel])
+
+        if self.matrix is not None:
+            local = self._local
+            if getattr(local, 'pixels', None) is None or local.pixels.shape != out.shape:
+                local.pixels = np.empty(out.shape, dtype=np.float32)
+                local.mixed = np.empty(out.shape, dtype=np.float32)
+            np.copyto(local.pixels, out)
+            np.matmul(local.pixels.reshape(-1, 3), self.matrix, out=local.mixed.reshape(-1, 3))
+            np.clip(local.mixed, 0, 255, out=local.mixed)
+            np.rint(local.mixed, out=local.mixed)
+            np.copyto(out, local.mixed, casting='unsafe')
+        return out
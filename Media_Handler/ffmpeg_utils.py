@@ -0,0 +1,118 @@
+"""FFmpeg helpers for joining pre-rendered video segments and preparing video and audio assets."""
+import os
+import re
+import subprocess
+from typing import List, Optional, Tuple
+from moviepy.config import get_setting
+
+
+def get_ffmpeg_binary() -> str:
+    """Get the ffmpeg binary MoviePy is configured to use."""
+    return get_setting("FFMPEG_BINARY")
+
+
+def concat_segments(
+    segment_files: List[str],
+    output_file: str,
+    audio_file: Optional[str] = None,
+    duration: Optional[float] = None,
+    audio_bitrate: str = "192k"
+) -> str:
+    """Join encoded segments in order without re-encoding the video stream.
+
+    All segments must share codec, resolution, fps and pixel format. If an
+    audio file is given it is muxed in and encoded to AAC; narration is kept
+    as PCM up to this point, so this is its only lossy encode. The output is
+    cut to ``duration`` so long audio does not extend the video.
+    """
+    if not segment_files:
+        raise ValueError("No segments to concatenate")
+
+    # Write concat demuxer list next to the output
+    list_file = f"{os.path.splitext(output_file)[0]}_segments.txt"
+    with open(list_file, 'w', encoding='utf-8') as f:
+        for segment in segment_files:
+            path = os.path.abspath(segment).replace('\\', '/').replace("'", "'\\''")
+            f.write(f"file '{path}'\n")
+
+    cmd = [
+        get_ffmpeg_binary(), '-y', '-loglevel', 'error',
+        '-f', 'concat', '-safe', '0', '-i', list_file
+    ]
+    if audio_file and os.path.exists(audio_file):
+        cmd += ['-i', audio_file, '-map', '0:v', '-map', '1:a', '-c:v', 'copy', '-c:a', 'aac', '-b:a', audio_bitrate]
+    else:
+        cmd += ['-c', 'copy']
+    if duration:
+        cmd += ['-t', f"{duration:.3f}"]
+    cmd.append(output_file)
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg concat failed: {result.stderr.strip()}")
+    finally:
+        os.remove(list_file)
+
+    return output_file
+
+
+def fit_video(
+    source_file: str,
+    output_file: str,
+    size: Tuple[int, int],
+    fps: float,
+    blur: float = 0
+) -> str:
+    """Transcode a video to exactly ``size`` and ``fps``, silent.
+
+    The source is scaled to cover the frame and centre-cropped, with an
+    optional Gaussian blur, so the result can be composited without any
+    per-frame resizing.
+    """
+    width, height = size
+    filters = [
+        f"scale={width}:{height}:force_original_aspect_ratio=increase",
+        f"crop={width}:{height}",
+        f"fps={fps}",
+        "setsar=1"
+    ]
+    if blur > 0:
+        filters.append(f"gblur=sigma={blur:.2f}")
+
+    cmd = [
+        get_ffmpeg_binary(), '-y', '-loglevel', 'error',
+        '-i', source_file,
+        '-vf', ','.join(filters),
+        '-an', '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '16', '-pix_fmt', 'yuv420p',
+        output_file
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg scale failed: {result.stderr.strip()}")
+    return output_file
+
+
+def decode_audio(source_file: str, sample_rate: int, channels: int) -> bytes:
+    """Decode any audio file to interleaved signed 16-bit PCM at ``sample_rate``."""
+    cmd = [
+        get_ffmpeg_binary(), '-loglevel', 'error',
+        '-i', source_file,
+        '-vn', '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', str(channels), '-ar', str(sample_rate),
+        'pipe:1'
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg audio decode failed: {result.stderr.decode(errors='replace').strip()}")
+    return result.stdout
+
+
+def probe_duration(source_file: str) -> Optional[float]:
+    """Duration of a media file from its container headers, without decoding it."""
+    # With no output file ffmpeg only reads the headers and reports them on stderr
+    result = subprocess.run([get_ffmpeg_binary(), '-hide_banner', '-i', source_file], capture_output=True, text=True)
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
@@ -0,0 +1,149 @@
+"""Font registry that resolves style font names to files and caches loaded faces."""
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+from PIL import ImageFont
+from utils.config_loader import load_config
+
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+
+# Used when a style asks for a font that isn't installed
+FALLBACK_FAMILIES = ["Arial", "DejaVu Sans", "Liberation Sans", "Helvetica"]
+
+# Style suffixes stripped from file names so "Roboto-Regular.ttf" answers to "Roboto"
+REGULAR_SUFFIXES = ("regular", "book", "normal")
+
+
+def _normalize(name: str) -> str:
+    """Normalize a family or file name for lookup."""
+    return ''.join(ch for ch in name.lower() if ch.isalnum())
+
+
+def system_font_dirs() -> List[str]:
+    """Get the platform's standard font directories."""
+    if sys.platform.startswith('win'):
+        windir = os.environ.get('WINDIR', 'C:\\Windows')
+        dirs = [os.path.join(windir, 'Fonts')]
+        local = os.environ.get('LOCALAPPDATA')
+        if local:
+            dirs.append(os.path.join(local, 'Microsoft', 'Windows', 'Fonts'))
+        return dirs
+    if sys.platform == 'darwin':
+        return ['/Library/Fonts', '/System/Library/Fonts', os.path.expanduser('~/Library/Fonts')]
+    return ['/usr/share/fonts', '/usr/local/share/fonts', os.path.expanduser('~/.fonts'),
+            os.path.expanduser('~/.local/share/fonts')]
+
+
+class FontRegistry:
+    """Scans font directories once and keeps loaded faces keyed by (family, size)."""
+    def __init__(self, font_dirs: Optional[Iterable[str]] = None, include_system: bool = True):
+        self.font_files: Dict[str, str] = {}
+        self._faces: Dict[Tuple[str, int], ImageFont.ImageFont] = {}
+        self._resolved: Dict[str, Optional[str]] = {}
+
+        # Project fonts are scanned first so they take priority over system fonts
+        for font_dir in font_dirs or []:
+            self.scan(font_dir)
+        if include_system:
+            for font_dir in system_font_dirs():
+                self.scan(font_dir)
+
+    def scan(self, font_dir: str) -> int:
+        """Register every font file under a directory. Returns number of files added."""
+        if not font_dir or not os.path.isdir(font_dir):
+            return 0
+
+        added = 0
+        for root, _, files in os.walk(font_dir):
+            for filename in files:
+                stem, ext = os.path.splitext(filename)
+                if ext.lower() not in FONT_EXTENSIONS:
+                    continue
+
+                path = os.path.join(root, filename)
+                key = _normalize(stem)
+                if key not in self.font_files:
+                    self.font_files[key] = path
+                    added += 1
+
+                # Register regular weights under the bare family name as well
+                for suffix in REGULAR_SUFFIXES:
+                    if key.endswith(suffix) and len(key) > len(suffix):
+                        self.font_files.setdefault(key[:-len(suffix)], path)
+        return added
+
+    def resolve(self, family: str) -> Optional[str]:
+        """Resolve a family name (e.g. "Open Sans") to a font file path."""
+        key = _normalize(family or "")
+        if key in self._resolved:
+            return self._resolved[key]
+
+        path = self.font_files.get(key)
+        if path is None:
+            # Let FreeType try the name itself (absolute paths, fonts on its search path)
+            try:
+                ImageFont.truetype(family, 12)
+                path = family
+            except (OSError, ValueError):
+                path = None
+
+        self._resolved[key] = path
+        return path
+
+    def preload(self, families: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Resolve a set of families up front and report ones that are missing."""
+        resolved = {}
+        for family in families:
+            if family in resolved:
+                continue
+            resolved[family] = self.resolve(family)
+            if resolved[family] is None:
+                print(f"Warning: Font '{family}' not found, a fallback font will be used")
+        return resolved
+
+    def get_font(self, family: str, size: int) -> ImageFont.ImageFont:
+        """Get a loaded font face, loading it on first use."""
+        cache_key = (_normalize(family or ""), int(size))
+        font = self._faces.get(cache_key)
+        if font is not None:
+            return font
+
+        for candidate in [family] + FALLBACK_FAMILIES:
+            path = self.resolve(candidate)
+            if path:
+                try:
+                    font = ImageFont.truetype(path, int(size))
+                    break
+                except OSError:
+                    continue
+        else:
+            # Last resort fallback (size is only supported by newer Pillow)
+            try:
+                font = ImageFont.load_default(size=int(size))
+            except TypeError:
+                font = ImageFont.load_default()
+
+        self._faces[cache_key] = font
+        return font
+
+
+_registry: Optional[FontRegistry] = None
+
+
+def get_font_registry(config: Optional[Dict] = None) -> FontRegistry:
+    """Get the shared font registry, scanning font directories on first use.
+
+    The first call decides which directories are scanned, so without a
+    config the project config is loaded for ``sources.local.paths.fonts``.
+    """
+    global _registry
+    if _registry is None:
+        if config is None:
+            config = load_config()
+        font_dirs = []
+        if config:
+            fonts_path = config.get('sources', {}).get('local', {}).get('paths', {}).get('fonts')
+            if fonts_path:
+                font_dirs.append(fonts_path)
+        _registry = FontRegistry(font_dirs)
+    return _registry
@@ -0,0 +1,164 @@
+"""Streaming raw-frame sink that pipes rendered frames to ffmpeg."""
+import os
+import queue
+import subprocess
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from Media_Handler.ffmpeg_utils import get_ffmpeg_binary
+
+
+class FramePipeWriter:
+    """Render a clip on worker threads and stream frames to an ffmpeg subprocess.
+
+    Frames are produced into a fixed ring of reusable RGB buffers, so memory is
+    capped by ``queue_depth`` and the hot loop does no per-frame allocation
+    beyond what the clip itself does. Compositing runs on the worker threads
+    while ffmpeg encodes, so the two overlap.
+
+    The clip must be safe to sample from several threads; wrap layers backed
+    by file readers (e.g. VideoFileClip) in OrderedFrameReader, or pass
+    ``workers=1``.
+    """
+    def __init__(
+        self,
+        output_file: str,
+        size: Tuple[int, int],
+        fps: float,
+        codec: str = "libx264",
+        preset: str = "medium",
+        ffmpeg_params: Optional[List[str]] = None,
+        queue_depth: int = 8,
+        workers: int = 2
+    ):
+        self.output_file = output_file
+        self.size = size
+        self.fps = fps
+        self.queue_depth = max(queue_depth, workers, 1)
+        self.workers = max(workers, 1)
+
+        cmd = [
+            get_ffmpeg_binary(), '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-vcodec', 'rawvideo',
+            '-s', f"{size[0]}x{size[1]}", '-pix_fmt', 'rgb24',
+            '-r', f"{fps:.02f}", '-an', '-i', '-',
+            '-vcodec', codec, '-preset', preset
+        ]
+        if ffmpeg_params:
+            cmd.extend(ffmpeg_params)
+        if codec == 'libx264' and size[0] % 2 == 0 and size[1] % 2 == 0 and '-pix_fmt' not in (ffmpeg_params or []):
+            cmd.extend(['-pix_fmt', 'yuv420p'])
+        cmd.append(output_file)
+        self.cmd = cmd
+
+    def write_clip(self, clip) -> str:
+        """Encode every frame of a clip and return the output path."""
+        # Durations are whole frames; rounding keeps float error from dropping the last one
+        n_frames = int(round(clip.duration * self.fps))
+        width, height = self.size
+        buffers = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(self.queue_depth)]
+        free_buffers: "queue.Queue[int]" = queue.Queue()
+        for buffer_id in range(self.queue_depth):
+            free_buffers.put(buffer_id)
+
+        ready: Dict[int, int] = {}
+        ready_cond = threading.Condition()
+        next_frame = [0]
+        next_lock = threading.Lock()
+        errors: List[BaseException] = []
+        stop = threading.Event()
+
+        def produce():
+            while not errors and not stop.is_set():
+                # Take a buffer before a frame number so the oldest unwritten
+                # frame always has a buffer and the ring cannot deadlock
+                buffer_id = free_buffers.get()
+                if buffer_id is None or stop.is_set():
+                    return
+                with next_lock:
+                    index = next_frame[0]
+                    next_frame[0] += 1
+                if index >= n_frames:
+                    free_buffers.put(buffer_id)
+                    return
+                try:
+                    frame = clip.get_frame(index / self.fps)
+                    np.copyto(buffers[buffer_id], frame[:, :, :3], casting='unsafe')
+                except BaseException as e:
+                    errors.append(e)
+                    with ready_cond:
+                        ready_cond.notify_all()
+                    return
+                with ready_cond:
+                    ready[index] = buffer_id
+                    ready_cond.notify_all()
+
+        popen_params = {"stdout": subprocess.DEVNULL, "stderr": subprocess.PIPE, "stdin": subprocess.PIPE}
+        if os.name == "nt":
+            popen_params["creationflags"] = 0x08000000  # CREATE_NO_WINDOW
+        proc = subprocess.Popen(self.cmd, **popen_params)
+
+        threads = [threading.Thread(target=produce, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for index in range(n_frames):
+                with ready_cond:
+                    while index not in ready and not errors:
+                        ready_cond.wait()
+                    if errors:
+                        raise errors[0]
+                    buffer_id = ready.pop(index)
+                try:
+                    proc.stdin.write(memoryview(buffers[buffer_id]))
+                except (BrokenPipeError, OSError) as e:
+                    stderr = proc.stderr.read().decode(errors='replace')
+                    raise IOError(f"ffmpeg encoding failed: {stderr.strip() or str(e)}")
+                free_buffers.put(buffer_id)
+        finally:
+            # Stop producers on every exit path; after an early exit they may
+            # hold claimed frames and wait for buffers that are never returned
+            stop.set()
+            for _ in threads:
+                free_buffers.put(None)
+            for thread in threads:
+                thread.join()
+            try:
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass  # ffmpeg already exited; its stderr says why
+            stderr = proc.stderr.read().decode(errors='replace')
+            returncode = proc.wait()
+
+        if returncode != 0:
+            raise IOError(f"ffmpeg encoding failed: {stderr.strip()}")
+        return self.output_file
+
+
+class OrderedFrameReader:
+    """Thread-safe, seek-free frame access to a file-backed clip.
+
+    File readers decode forward and re-seek on any backward step, so frames
+    requested slightly out of order by FramePipeWriter workers would each
+    cost a seek. Reads are serialized and the last ``window`` decoded frames
+    are kept, so workers running a few frames apart are served from memory.
+    """
+    def __init__(self, clip, fps: float, window: int = 16):
+        self.clip = clip
+        self.fps = fps
+        self.window = max(window, 1)
+        self.frames: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_frame(self, t: float) -> np.ndarray:
+        index = int(round(t * self.fps))
+        with self._lock:
+            frame = self.frames.get(index)
+            if frame is None:
+                frame = self.clip.get_frame(index / self.fps)
+                self.frames[index] = frame
+                if len(self.frames) > self.window:
+                    self.frames.popitem(last=False)
+            return frame
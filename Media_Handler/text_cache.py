@@ -0,0 +1,74 @@
+"""Two-tier cache for rasterized text bitmaps."""
+import os
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+from Media_Handler.text_layout import TEXT_LAYOUT_VERSION
+from utils.cache_store import CacheStore
+
+
+class TextImageCache:
+    """In-memory LRU of text bitmaps backed by an on-disk CacheStore."""
+    def __init__(self, store: Optional[CacheStore] = None, memory_limit_mb: float = 128):
+        self.store = store
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024)
+        self.memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, font_file: Optional[str], font_size: int, text_color: str,
+                 stroke_width: int, stroke_color: str, wrap_width: int,
+                 align: str = "center", opacity: float = 1.0) -> str:
+        """Build the content key for a rasterized string."""
+        return CacheStore.make_key(
+            "text", TEXT_LAYOUT_VERSION, text, font_file, font_size, text_color,
+            stroke_width, stroke_color, wrap_width, align, round(opacity, 3)
+        )
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Get a cached bitmap from memory, then disk."""
+        image = self.memory.get(key)
+        if image is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return image
+
+        if self.store:
+            path = self.store.get(key, ".npy")
+            if path:
+                try:
+                    image = np.load(path)
+                except (OSError, ValueError):
+                    image = None
+                if image is not None:
+                    self._remember(key, image)
+                    self.hits += 1
+                    return image
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, image: np.ndarray) -> np.ndarray:
+        """Cache a bitmap in memory and on disk."""
+        image.setflags(write=False)
+        self._remember(key, image)
+
+        if self.store:
+            tmp_path = self.store.path_for(key, f".{os.getpid()}.npy")
+            try:
+                np.save(tmp_path, image)
+                self.store.put(key, tmp_path, ".npy", move=True)
+            except OSError as e:
+                print(f"Warning: Could not write text cache entry: {str(e)}")
+        return image
+
+    def _remember(self, key: str, image: np.ndarray):
+        if key in self.memory:
+            return
+        self.memory[key] = image
+        self.memory_bytes += image.nbytes
+        while self.memory_bytes > self.memory_limit and len(self.memory) > 1:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= evicted.nbytes
@@ -0,0 +1,370 @@
+"""Text layout, glyph atlas and animated text.
+
+Static text and animated text share one layout, so an animation that has
+finished looks the same as the static render. Animated text never
+re-rasterizes strings: each glyph is rasterized once per font, size and
+color into an atlas, and frames are built by blending glyph sprites at
+precomputed positions.
+"""
+import math
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Bump when layout or rasterization changes so cached text bitmaps are invalidated
+TEXT_LAYOUT_VERSION = 2
+
+LINE_SPACING = 4
+
+# Per animation_style: typewriter characters per second, bounce height (in
+# font sizes), bounce length in seconds and delay between glyphs
+ANIMATION_SPEEDS = {
+    "subtle": {'chars_per_second': 18, 'bounce_height': 0.15, 'bounce_seconds': 0.5, 'stagger': 0.04},
+    "medium": {'chars_per_second': 28, 'bounce_height': 0.3, 'bounce_seconds': 0.6, 'stagger': 0.03},
+    "dynamic": {'chars_per_second': 40, 'bounce_height': 0.5, 'bounce_seconds': 0.7, 'stagger': 0.02}
+}
+
+TEXT_EFFECTS = ("none", "typewriter", "bounce")
+
+
+class WordWidths:
+    """Memoized pixel widths of words in one font."""
+    def __init__(self, font):
+        self.font = font
+        self.space = font.getlength(" ")
+        self.widths: Dict[str, float] = {}
+
+    def __call__(self, word: str) -> float:
+        width = self.widths.get(word)
+        if width is None:
+            width = self.widths[word] = self.font.getlength(word)
+        return width
+
+
+_word_widths: Dict[Tuple, WordWidths] = {}
+
+
+def get_word_widths(font_key: Tuple, font) -> WordWidths:
+    """Get the shared word width memo for a font (identified by ``font_key``)."""
+    widths = _word_widths.get(font_key)
+    if widths is None:
+        widths = _word_widths[font_key] = WordWidths(font)
+    return widths
+
+
+def wrap_text(text: str, widths: WordWidths, max_width: float) -> List[str]:
+    """Wrap text on word boundaries by measured pixel width.
+
+    Explicit line breaks are kept; a word wider than the line on its own
+    is broken between characters.
+    """
+    lines = []
+    for paragraph in text.split('\n'):
+        current: List[str] = []
+        current_width = 0.0
+        for word in paragraph.split():
+            width = widths(word)
+            if width > max_width:
+                if current:
+                    lines.append(' '.join(current))
+                pieces = _break_word(word, widths.font, max_width)
+                lines.extend(pieces[:-1])
+                current, current_width = [pieces[-1]], widths(pieces[-1])
+                continue
+            if current and current_width + widths.space + width > max_width:
+                lines.append(' '.join(current))
+                current, current_width = [word], width
+            else:
+                current_width += (widths.space if current else 0) + width
+                current.append(word)
+        lines.append(' '.join(current))
+    return lines
+
+
+def _break_word(word: str, font, max_width: float) -> List[str]:
+    pieces = []
+    current = ""
+    for char in word:
+        if current and font.getlength(current + char) > max_width:
+            pieces.append(current)
+            current = char
+        else:
+            current += char
+    pieces.append(current)
+    return pieces
+
+
+def fit_text(text: str, get_font: Callable[[int], object], font_key: Callable[[int], Tuple], size: int,
+             max_width: int, max_height: int, stroke_width: int = 0, min_size: int = 8,
+             spacing: int = LINE_SPACING) -> Tuple[int, List[str]]:
+    """Find the largest font size up to ``size`` at which wrapped text fits a box.
+
+    Returns the font size and the wrapped lines. If nothing fits, the
+    smallest size is used.
+    """
+    def attempt(font_size: int) -> Tuple[bool, List[str]]:
+        font = get_font(font_size)
+        lines = wrap_text(text, get_word_widths(font_key(font_size), font), max_width - 2 * stroke_width)
+        ascent, descent = font.getmetrics()
+        height = len(lines) * (ascent + descent + spacing) - spacing + 2 * stroke_width
+        return height <= max_height, lines
+
+    fits, lines = attempt(size)
+    if fits or size <= min_size:
+        return size, lines
+
+    # Binary search for the largest size that fits
+    low, high = min_size, size - 1
+    best = (min_size, attempt(min_size)[1])
+    while low <= high:
+        middle = (low + high) // 2
+        fits, middle_lines = attempt(middle)
+        if fits:
+            best = (middle, middle_lines)
+            low = middle + 1
+        else:
+            high = middle - 1
+    return best
+
+
+@dataclass
+class TextLayout:
+    """Lines of text and their pen positions inside a text block."""
+    lines: List[str]
+    origins: List[Tuple[int, int]]  # Top-left ('la' anchor) pen position of each line
+    size: Tuple[int, int]
+    font: object
+    stroke_width: int = 0
+
+    @classmethod
+    def build(cls, lines: List[str], font, align: str = "center", stroke_width: int = 0,
+              spacing: int = LINE_SPACING) -> 'TextLayout':
+        """Lay out pre-wrapped lines with the given alignment."""
+        ascent, descent = font.getmetrics()
+        line_height = ascent + descent + spacing
+        widths = [font.getlength(line) for line in lines]
+        block_width = int(math.ceil(max(widths, default=0))) + 2 * stroke_width
+        block_height = max(len(lines) * line_height - spacing, 0) + 2 * stroke_width
+
+        origins = []
+        for i, width in enumerate(widths):
+            x = stroke_width
+            if align == "center":
+                x += (block_width - 2 * stroke_width - width) / 2
+            elif align == "right":
+                x += block_width - 2 * stroke_width - width
+            origins.append((int(round(x)), stroke_width + i * line_height))
+        return cls(lines, origins, (block_width, block_height), font, stroke_width)
+
+    def render(self, fill: Tuple[int, int, int], stroke_fill: Tuple[int, int, int],
+               opacity: float = 1.0, padding: int = 10) -> np.ndarray:
+        """Rasterize the whole block as an RGBA array with ``padding`` on every side."""
+        width, height = self.size
+        img = Image.new('RGBA', (width + 2 * padding, height + 2 * padding), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        for line, (x, y) in zip(self.lines, self.origins):
+            draw.text(
+                (x + padding, y + padding), line, font=self.font, fill=fill + (255,), anchor='la',
+                stroke_width=self.stroke_width, stroke_fill=stroke_fill + (255,)
+            )
+        array = np.array(img)
+        # Opacity applies to text and outline together so the outline doesn't show through
+        if opacity < 1.0:
+            array[:, :, 3] = (array[:, :, 3].astype(np.float32) * max(opacity, 0.0)).astype(np.uint8)
+        return array
+
+    def glyph_positions(self) -> List[Tuple[str, int, int]]:
+        """Pen position of every visible character, relative to the block."""
+        positions = []
+        for line, (x, y) in zip(self.lines, self.origins):
+            for i, char in enumerate(line):
+                if not char.isspace():
+                    # Prefix lengths keep kerning between neighbouring glyphs
+                    positions.append((char, x + int(round(self.font.getlength(line[:i]))), y))
+        return positions
+
+
+class GlyphSprite:
+    """One rasterized glyph layer, premultiplied for blending."""
+    def __init__(self, rgba: np.ndarray, offset: Tuple[int, int]):
+        self.offset = offset
+        self.height, self.width = rgba.shape[:2]
+        alpha = (rgba[:, :, 3:].astype(np.uint16) * 256 + 127) // 255
+        self.alpha_inv = (256 - alpha).astype(np.uint16)
+        self.premultiplied = (rgba[:, :, :3] * alpha).astype(np.uint16)
+
+
+class GlyphAtlas:
+    """Glyphs of one font, size and color, rasterized on first use.
+
+    With an outline each glyph has two layers, outline then fill, so
+    neighbouring outlines never cover a glyph's fill, just like a whole
+    string drawn by PIL. Translucent text uses one combined layer instead,
+    so the outline doesn't show through the fill.
+    """
+    def __init__(self, font, fill: Tuple[int, int, int], stroke_width: int = 0,
+                 stroke_fill: Tuple[int, int, int] = (0, 0, 0), opacity: float = 1.0):
+        self.font = font
+        self.fill = fill
+        self.stroke_width = stroke_width
+        self.stroke_fill = stroke_fill
+        self.opacity = min(max(opacity, 0.0), 1.0)
+        self.layer_count = 2 if stroke_width > 0 and self.opacity >= 1.0 else 1
+        self.glyphs: Dict[str, Optional[List[GlyphSprite]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, char: str) -> Optional[List[GlyphSprite]]:
+        """Get a glyph's layers (bottom first), or None for glyphs with no pixels."""
+        with self._lock:
+            if char not in self.glyphs:
+                self.glyphs[char] = self._rasterize(char)
+            return self.glyphs[char]
+
+    def _rasterize(self, char: str) -> Optional[List[GlyphSprite]]:
+        left, top, right, bottom = self.font.getbbox(char, anchor='la', stroke_width=self.stroke_width)
+        left, top, right, bottom = math.floor(left), math.floor(top), math.ceil(right), math.ceil(bottom)
+        if right <= left or bottom <= top:
+            return None
+
+        bbox = (left, top, right, bottom)
+        if self.layer_count == 2:
+            layers = [
+                self._draw(char, bbox, self.stroke_fill, self.stroke_width, self.stroke_fill),
+                self._draw(char, bbox, self.fill, 0, self.fill)
+            ]
+        else:
+            layers = [self._draw(char, bbox, self.fill, self.stroke_width, self.stroke_fill)]
+        return [GlyphSprite(rgba, (left, top)) for rgba in layers]
+
+    def _draw(self, char: str, bbox: Tuple[int, int, int, int], fill: Tuple[int, int, int],
+              stroke_width: int, stroke_fill: Tuple[int, int, int]) -> np.ndarray:
+        left, top, right, bottom = bbox
+        img = Image.new('RGBA', (right - left, bottom - top), (0, 0, 0, 0))
+        ImageDraw.Draw(img).text(
+            (-left, -top), char, font=self.font, fill=fill + (255,), anchor='la',
+            stroke_width=stroke_width, stroke_fill=stroke_fill + (255,)
+        )
+        rgba = np.array(img)
+        if self.opacity < 1.0:
+            rgba[:, :, 3] = (rgba[:, :, 3].astype(np.float32) * self.opacity).astype(np.uint8)
+        return rgba
+
+
+_atlases: Dict[Tuple, GlyphAtlas] = {}
+_atlases_lock = threading.Lock()
+
+
+def get_glyph_atlas(font_key: Tuple, font, fill: Tuple[int, int, int], stroke_width: int = 0,
+                    stroke_fill: Tuple[int, int, int] = (0, 0, 0), opacity: float = 1.0) -> GlyphAtlas:
+    """Get the shared atlas for a font (identified by ``font_key``), color and outline."""
+    key = (font_key, fill, stroke_width, stroke_fill, round(opacity, 3))
+    with _atlases_lock:
+        atlas = _atlases.get(key)
+        if atlas is None:
+            atlas = _atlases[key] = GlyphAtlas(font, fill, stroke_width, stroke_fill, opacity)
+        return atlas
+
+
+def _blend_sprite(frame: np.ndarray, sprite: GlyphSprite, x: int, y: int, scratch: np.ndarray):
+    """Blend a premultiplied sprite into ``frame`` at (x, y), clipped to the frame."""
+    height, width = frame.shape[:2]
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + sprite.width, width), min(y + sprite.height, height)
+    if x1 <= x0 or y1 <= y0:
+        return
+    sy, sx = slice(y0 - y, y1 - y), slice(x0 - x, x1 - x)
+    target = frame[y0:y1, x0:x1]
+    work = scratch[:y1 - y0, :x1 - x0]
+    np.multiply(target, sprite.alpha_inv[sy, sx], out=work)
+    np.add(work, sprite.premultiplied[sy, sx], out=work)
+    np.right_shift(work, 8, out=work)
+    np.copyto(target, work, casting='unsafe')
+
+
+class AnimatedText:
+    """Text blocks revealed glyph by glyph (typewriter) or dropped in with a bounce.
+
+    Everything that depends on time is precomputed per frame index:
+    the frame each glyph appears on and, for bounce, one vertical offset
+    curve shared by all glyphs. Drawing a frame blends the visible glyph
+    sprites into it in place.
+    """
+    def __init__(self, effect: str, fps: float, font_size: int, speed: str = "subtle"):
+        self.effect = effect
+        self.fps = fps
+        self.font_size = font_size
+        self.speed = ANIMATION_SPEEDS.get(speed, ANIMATION_SPEEDS["subtle"])
+        self.glyphs: List[Tuple[List[GlyphSprite], int, int]] = []
+        self.appear: List[int] = []
+        self.next_frame = 0
+        self.layer_count = 1
+        self._local = threading.local()
+
+        if effect == "bounce":
+            # Damped bounce: starts above its place and settles on it
+            frames = max(int(round(self.speed['bounce_seconds'] * fps)), 1)
+            t = np.linspace(0.0, 1.0, frames, endpoint=False)
+            height = self.speed['bounce_height'] * font_size
+            self.bounce = -np.rint(height * np.exp(-4 * t) * np.abs(np.cos(1.5 * np.pi * t))).astype(np.int32)
+        else:
+            self.bounce = np.zeros(0, dtype=np.int32)
+
+    def add_block(self, layout: TextLayout, atlas: GlyphAtlas, origin: Tuple[int, int]):
+        """Add a laid-out block at ``origin`` in the frame; it animates after earlier blocks."""
+        if self.effect == "bounce":
+            step = self.speed['stagger'] * self.fps
+        else:
+            step = self.fps / self.speed['chars_per_second']
+        self.layer_count = max(self.layer_count, atlas.layer_count)
+
+        start = self.next_frame
+        count = 0
+        for char, x, y in layout.glyph_positions():
+            layers = atlas.get(char)
+            if layers is None:
+                continue
+            self.glyphs.append((layers, origin[0] + x, origin[1] + y))
+            self.appear.append(start + int(round(count * step)))
+            count += 1
+        self.next_frame = start + int(round(count * step))
+
+    @property
+    def duration(self) -> float:
+        """Seconds until the last glyph has settled."""
+        return (self.next_frame + len(self.bounce)) / self.fps
+
+    def fit(self, seconds: float):
+        """Speed the animation up, if needed, so every glyph has settled within ``seconds``."""
+        limit = max(int(seconds * self.fps) - len(self.bounce), 0)
+        if self.next_frame <= limit:
+            return
+        scale = limit / self.next_frame
+        self.appear = [int(appear * scale) for appear in self.appear]
+        self.next_frame = limit
+
+    def draw(self, frame: np.ndarray, t: float) -> np.ndarray:
+        """Blend the glyphs visible at time ``t`` into ``frame`` in place."""
+        index = int(round(t * self.fps))
+        local = self._local
+        if getattr(local, 'scratch', None) is None:
+            sprites = [sprite for layers, _, _ in self.glyphs for sprite in layers]
+            local.scratch = np.empty((
+                max((s.height for s in sprites), default=1),
+                max((s.width for s in sprites), default=1),
+                3
+            ), dtype=np.uint16)
+
+        bounce_frames = len(self.bounce)
+        # Outlines of every glyph first, then fills
+        for layer in range(self.layer_count):
+            for (layers, x, y), appear in zip(self.glyphs, self.appear):
+                first = self.layer_count - len(layers)
+                if appear > index or layer < first:
+                    continue
+                age = index - appear
+                dy = int(self.bounce[age]) if age < bounce_frames else 0
+                sprite = layers[layer - first]
+                _blend_sprite(frame, sprite, x + sprite.offset[0], y + sprite.offset[1] + dy, local.scratch)
+        return frame
@@ -1,57 +1,207 @@
-"""Video transition effects module."""
+"""Video transition effects module.
+
+Transitions are frame kernels: alpha, offset and index ramps are computed
+once per transition, and frames are only blended inside the overlap
+window. Everywhere else frames from the two clips pass through untouched,
+so a transition costs time in proportion to its length, not the clips'.
+"""
+import threading
 from typing import Dict, Optional
-from moviepy.editor import VideoFileClip, CompositeVideoClip, concatenate_videoclips
-from moviepy.video import fx as vfx
 import numpy as np
+from moviepy.editor import VideoClip, VideoFileClip
+
+
+def _as_rgb8(frame: np.ndarray) -> np.ndarray:
+    """View a frame as RGB uint8 (ColorClip frames, for one, are int64)."""
+    frame = frame[:, :, :3]
+    return frame if frame.dtype == np.uint8 else frame.astype(np.uint8)
+
 
 class TransitionEffect:
-    """Base class for transition effects."""
-    def __init__(self, duration: float = 1.0):
+    """Base class for transition effects.
+
+    Subclasses implement ``blend(a, b, index, out)``, which writes frame
+    ``index`` of the overlap into ``out`` from the outgoing frame ``a`` and
+    the incoming frame ``b``. Ramps are prepared in ``prepare()``.
+    """
+    def __init__(self, duration: float = 1.0, fps: float = 30):
         self.duration = duration
+        self.fps = fps
+        self.n_frames = max(int(round(duration * fps)), 1)
+        # Progress 0..1 across the overlap, one entry per frame
+        self.progress = np.linspace(0.0, 1.0, self.n_frames + 2)[1:-1]
+        self._local = threading.local()
+        self.size = None
+
+    def prepare(self, size):
+        """Precompute per-frame ramps for a frame size (w, h)."""
+        self.size = size
+
+    def blend(self, a: np.ndarray, b: np.ndarray, index: int, out: np.ndarray):
+        raise NotImplementedError
+
+    def _buffers(self, shape):
+        """Thread-local output and scratch buffers, reused across frames."""
+        local = self._local
+        if getattr(local, 'shape', None) != shape:
+            local.shape = shape
+            local.out = np.empty(shape, dtype=np.uint8)
+            local.scratch_a = np.empty(shape, dtype=np.uint16)
+            local.scratch_b = np.empty(shape, dtype=np.uint16)
+        return local
+
+    def _crossfade(self, a, b, weight: int, out, local):
+        """out = (a * (256 - weight) + b * weight) / 256, in place in integer math."""
+        np.multiply(a, 256 - weight, out=local.scratch_a, dtype=np.uint16)
+        np.multiply(b, weight, out=local.scratch_b, dtype=np.uint16)
+        np.add(local.scratch_a, local.scratch_b, out=local.scratch_a)
+        np.right_shift(local.scratch_a, 8, out=local.scratch_a)
+        np.copyto(out, local.scratch_a, casting='unsafe')
+
+    def _frame_index(self, t: float) -> int:
+        # Round: frame times like 29/25 land a hair below the whole frame in floats
+        return min(max(int(round(t * self.fps)), 0), self.n_frames - 1)
+
+    def overlap_clip(self, clip1: VideoClip, clip2: VideoClip) -> VideoClip:
+        """Clip covering only the overlap window: clip1's tail blended into clip2's head.
+
+        Returned frames come from a reused buffer; copy them if you keep them.
+        """
+        self.prepare(tuple(clip1.size))
+        start = clip1.duration - self.duration
+
+        def make_frame(t):
+            a = _as_rgb8(clip1.get_frame(start + t))
+            b = _as_rgb8(clip2.get_frame(t))
+            local = self._buffers(a.shape)
+            self.blend(a, b, self._frame_index(t), local.out)
+            return local.out
+
+        return VideoClip(make_frame, duration=self.duration)
+
+    def __call__(self, clip1: VideoFileClip, clip2: VideoFileClip) -> VideoClip:
+        """Join two clips, overlapping them by the transition duration."""
+        overlap = self.overlap_clip(clip1, clip2)
+        start = clip1.duration - self.duration
+        end = clip1.duration
+
+        def make_frame(t):
+            if t < start:
+                return clip1.get_frame(t)
+            if t < end:
+                return overlap.get_frame(t - start)
+            return clip2.get_frame(t - start)
+
+        return VideoClip(make_frame, duration=clip1.duration + clip2.duration - self.duration)
 
-    def __call__(self, clip1: VideoFileClip, clip2: VideoFileClip) -> VideoFileClip:
-        """Apply transition effect between two clips."""
-        # Ensure clips have proper duration
-        clip1 = clip1.set_duration(clip1.duration)
-        clip2 = clip2.set_duration(clip2.duration)
-        
-        # Create transition clip
-        transition = CompositeVideoClip([
-            clip1.set_end(clip1.duration - self.duration/2),
-            clip2.set_start(-self.duration/2)
-        ])
-        return transition
 
 class FadeTransition(TransitionEffect):
     """Simple fade transition between clips."""
-    def __call__(self, clip1: VideoFileClip, clip2: VideoFileClip) -> VideoFileClip:
-        clip1 = clip1.crossfadein(self.duration)
-        clip2 = clip2.crossfadeout(self.duration)
-        return concatenate_videoclips([clip1, clip2])
+    def prepare(self, size):
+        super().prepare(size)
+        self.weights = np.rint(self.progress * 256).astype(np.int32)
+
+    def blend(self, a, b, index, out):
+        self._crossfade(a, b, int(self.weights[index]), out, self._buffers(a.shape))
+
+
+class DissolveTransition(TransitionEffect):
+    """Pixels switch from one clip to the other in a fixed random order."""
+    def prepare(self, size):
+        super().prepare(size)
+        w, h = size
+        # Each pixel flips once its threshold is passed
+        self.thresholds = np.random.default_rng(0).random((h, w), dtype=np.float32)
+
+    def blend(self, a, b, index, out):
+        mask = self.thresholds < self.progress[index]
+        np.copyto(out, a)
+        np.copyto(out, b, where=mask[:, :, None])
+
 
 class SlideTransition(TransitionEffect):
     """Slide one clip over another."""
-    def __init__(self, duration: float = 1.0, direction: str = "left"):
-        super().__init__(duration)
-        self.direction = direction
-
-    def __call__(self, clip1: VideoFileClip, clip2: VideoFileClip) -> VideoFileClip:
-        w, h = clip1.size
-        direction = self.direction.lower()
-        
-        def slide(t):
-            progress = t / self.duration
-            if direction == "left":
-                return {'x': int(w * (1-progress))}
-            elif direction == "right":
-                return {'x': int(-w * (1-progress))}
-            elif direction == "up":
-                return {'y': int(h * (1-progress))}
-            else:  # down
-                return {'y': int(-h * (1-progress))}
-        
-        sliding = clip2.set_position(slide)
-        return CompositeVideoClip([clip1, sliding])
+    def __init__(self, duration: float = 1.0, fps: float = 30, direction: str = "left"):
+        super().__init__(duration, fps)
+        self.direction = direction.lower()
+
+    def prepare(self, size):
+        super().prepare(size)
+        w, h = size
+        extent = w if self.direction in ("left", "right") else h
+        # Pixels of the incoming clip visible at each frame
+        self.offsets = np.rint(self.progress * extent).astype(np.int32)
+
+    def blend(self, a, b, index, out):
+        shown = int(self.offsets[index])
+        h, w = a.shape[:2]
+        if self.direction == "left":  # enters from the right edge
+            out[:, :w - shown] = a[:, :w - shown]
+            out[:, w - shown:] = b[:, :shown]
+        elif self.direction == "right":  # enters from the left edge
+            out[:, :shown] = b[:, w - shown:]
+            out[:, shown:] = a[:, shown:]
+        elif self.direction == "up":  # enters from the bottom edge
+            out[:h - shown] = a[:h - shown]
+            out[h - shown:] = b[:shown]
+        else:  # down, enters from the top edge
+            out[:shown] = b[h - shown:]
+            out[shown:] = a[shown:]
+
+
+class WipeTransition(TransitionEffect):
+    """Hard-edged wipe that reveals the incoming clip in place."""
+    def __init__(self, duration: float = 1.0, fps: float = 30, direction: str = "left"):
+        super().__init__(duration, fps)
+        self.direction = direction.lower()
+
+    def prepare(self, size):
+        super().prepare(size)
+        w, h = size
+        extent = w if self.direction in ("left", "right") else h
+        self.edges = np.rint(self.progress * extent).astype(np.int32)
+
+    def blend(self, a, b, index, out):
+        edge = int(self.edges[index])
+        h, w = a.shape[:2]
+        if self.direction == "left":  # edge moves right to left
+            out[:, :w - edge] = a[:, :w - edge]
+            out[:, w - edge:] = b[:, w - edge:]
+        elif self.direction == "right":
+            out[:, :edge] = b[:, :edge]
+            out[:, edge:] = a[:, edge:]
+        elif self.direction == "up":
+            out[:h - edge] = a[:h - edge]
+            out[h - edge:] = b[h - edge:]
+        else:
+            out[:edge] = b[:edge]
+            out[edge:] = a[edge:]
+
+
+class ZoomTransition(TransitionEffect):
+    """Outgoing clip zooms in while fading into the incoming clip."""
+    def __init__(self, duration: float = 1.0, fps: float = 30, zoom: float = 1.5):
+        super().__init__(duration, fps)
+        self.zoom = zoom
+
+    def prepare(self, size):
+        super().prepare(size)
+        w, h = size
+        self.weights = np.rint(self.progress * 256).astype(np.int32)
+        # Nearest-neighbour source rows/cols per frame, so zooming is one gather
+        scales = 1.0 + (self.zoom - 1.0) * self.progress
+        self.rows = [np.clip(((np.arange(h) - h / 2) / s + h / 2).astype(np.intp), 0, h - 1) for s in scales]
+        self.cols = [np.clip(((np.arange(w) - w / 2) / s + w / 2).astype(np.intp), 0, w - 1) for s in scales]
+
+    def blend(self, a, b, index, out):
+        local = self._buffers(a.shape)
+        if getattr(local, 'rows_taken', None) is None or local.rows_taken.shape != a.shape:
+            local.rows_taken = np.empty(a.shape, dtype=np.uint8)
+            local.zoomed = np.empty(a.shape, dtype=np.uint8)
+        np.take(a, self.rows[index], axis=0, out=local.rows_taken)
+        np.take(local.rows_taken, self.cols[index], axis=1, out=local.zoomed)
+        self._crossfade(local.zoomed, b, int(self.weights[index]), out, local)
+
 
 class TransitionManager:
     """Manages video transitions."""
@@ -63,28 +213,57 @@ class TransitionManager:
                 "duration": 0.5,
                 "effect": FadeTransition
             },
+            "dissolve": {
+                "name": "Dissolve",
+                "description": "Pixels dissolve from one scene into the next",
+                "duration": 0.7,
+                "effect": DissolveTransition
+            },
             "slide": {
                 "name": "Slide",
                 "description": "Slide scenes horizontally",
                 "duration": 0.7,
                 "effect": SlideTransition
+            },
+            "wipe": {
+                "name": "Wipe",
+                "description": "Hard-edged wipe to the next scene",
+                "duration": 0.6,
+                "effect": WipeTransition
+            },
+            "zoom": {
+                "name": "Zoom",
+                "description": "Zoom into the scene while fading to the next",
+                "duration": 0.8,
+                "effect": ZoomTransition
             }
         }
-    
+
     def get_available_transitions(self) -> Dict:
         """Get available transition effects."""
         return self.transitions
-    
-    def create_transition(self, clip1: VideoFileClip, clip2: VideoFileClip, duration: float = 0.5, type: str = "fade") -> Optional[VideoFileClip]:
+
+    def get_effect(self, transition_type: str = "fade", duration: Optional[float] = None, fps: float = 30) -> TransitionEffect:
+        """Create a transition effect instance."""
+        if transition_type not in self.transitions:
+            print(f"Unknown transition {transition_type}. Using fade.")
+            transition_type = "fade"
+
+        if not duration:
+            duration = self.transitions[transition_type]["duration"]
+
+        transition_class = self.transitions[transition_type]["effect"]
+        return transition_class(duration=duration, fps=fps)
+
+    def create_transition(self, clip1: VideoFileClip, clip2: VideoFileClip, duration: float = 0.5, type: str = "fade",
+                          fps: float = 30) -> Optional[VideoClip]:
         """Create a transition between two video clips."""
         try:
             if type not in self.transitions:
                 print(f"Warning: Unknown transition type '{type}', falling back to fade")
                 type = "fade"
-            
-            transition_class = self.transitions[type]["effect"]
-            transition = transition_class(duration=duration)
-            return transition(clip1, clip2)
+
+            return self.get_effect(type, duration, fps)(clip1, clip2)
         except Exception as e:
             print(f"Error creating transition: {str(e)}")
             return None
@@ -94,20 +273,12 @@ class TransitionManager:
         clip1: VideoFileClip,
         clip2: VideoFileClip,
         transition_type: str = "fade",
-        duration: Optional[float] = None
-    ) -> VideoFileClip:
+        duration: Optional[float] = None,
+        fps: float = 30
+    ) -> VideoClip:
         """Apply transition effect between two clips."""
-        if transition_type not in self.transitions:
-            print(f"Unknown transition {transition_type}. Using fade.")
-            transition_type = "fade"
-        
-        if not duration:
-            duration = self.transitions[transition_type]["duration"]
-        
         try:
-            transition_class = self.transitions[transition_type]["effect"]
-            transition = transition_class(duration=duration)
-            return transition(clip1, clip2)
+            return self.get_effect(transition_type, duration, fps)(clip1, clip2)
         except Exception as e:
             print(f"Error applying transition: {str(e)}")
             return clip1
@@ -115,10 +286,10 @@ class TransitionManager:
 if __name__ == "__main__":
     # Example usage
     manager = TransitionManager()
-    
+
     # List available transitions
     print("Available transitions:", manager.get_available_transitions())
-    
+
     # Preview a transition
     preview = manager.get_available_transitions()
     print("\nTransition Preview:", preview)
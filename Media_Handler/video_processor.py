@@ -1,20 +1,47 @@
 """Video processing module for generating video content."""
+import math
 import os
+import random
+import shutil
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-import textwrap
-from moviepy.config import change_settings
+from PIL import ImageColor
 from moviepy.editor import (
-    VideoFileClip, AudioFileClip, TextClip, ColorClip, CompositeVideoClip,
-    concatenate_videoclips, ImageClip
+    VideoFileClip, ColorClip, CompositeVideoClip,
+    concatenate_videoclips, ImageClip, VideoClip
 )
-from moviepy.video.fx.resize import resize
+from moviepy.video.fx.loop import loop
+from Media_Handler.asset_manager import BackgroundCache, load_watermark
+from Media_Handler.audio_timeline import audio_duration
+from Media_Handler.effects import ColorCorrection, KenBurnsEffect, StaticOverlay
+from Media_Handler.ffmpeg_utils import concat_segments
+from Media_Handler.frame_pipe import FramePipeWriter, OrderedFrameReader
+from Media_Handler.font_registry import get_font_registry
+from Media_Handler.text_cache import TextImageCache
+from Media_Handler.text_layout import (
+    TEXT_EFFECTS, TEXT_LAYOUT_VERSION, AnimatedText, TextLayout, fit_text, get_glyph_atlas,
+    get_word_widths, wrap_text
+)
+from Media_Handler.transitions import TransitionManager
+from Output_Manager.compression_tools import EncoderProfile, get_encoder_profile
+from utils.cache_store import CacheStore
+from utils.config_loader import load_config
+from utils.tracing import get_tracer, isolated_trace
+
+# Bump when rendering changes so cached scene segments are invalidated
+RENDER_VERSION = 3
 
-# Configure MoviePy to use ImageMagick
-change_settings({"IMAGEMAGICK_BINARY": "magick"})
+# Transparent border around rasterized text blocks
+TEXT_PADDING = 10
+# Auto-fit never shrinks text below this fraction of the style font size
+MIN_FONT_SCALE = 0.4
+# Animated text is fully shown within this fraction of its scene
+TEXT_REVEAL_SHARE = 0.5
 
 @dataclass
 class VideoStyle:
@@ -28,6 +55,13 @@ class VideoStyle:
     fps: int = 30
     transition_duration: float = 0.5
     text_margin: int = 50
+    text_align: str = "center"  # left, center, or right
+    stroke_width: int = 0
+    stroke_color: str = "black"
+    text_opacity: float = 1.0
+    layout_scale: float = 1.0  # Proxy scale relative to the style text was laid out for
+
+    STYLE_NAMES = ("modern", "corporate", "creative", "tech", "casual")
 
     @classmethod
     def get_style(cls, style_name: str) -> 'VideoStyle':
@@ -66,74 +100,849 @@ class VideoStyle:
         }
         return styles.get(style_name, styles["modern"])
 
+    def scaled(self, scale: float, fps: Optional[int] = None) -> 'VideoStyle':
+        """Get a copy scaled for proxy rendering, with text and layout scaled proportionally."""
+        width = max(int(self.resolution[0] * scale) // 2 * 2, 2)  # x264 needs even sizes
+        height = max(int(self.resolution[1] * scale) // 2 * 2, 2)
+        return replace(
+            self,
+            resolution=(width, height),
+            fps=fps or self.fps,
+            font_size=max(int(round(self.font_size * scale)), 1),
+            text_margin=int(round(self.text_margin * scale)),
+            stroke_width=int(round(self.stroke_width * scale)) if self.stroke_width else 0,
+            layout_scale=self.layout_scale * scale
+        )
+
 class VideoProcessor:
     """Video processor for generating video content."""
-    def __init__(self):
+    def __init__(self, config: Optional[Dict] = None, static_fast_path: bool = True, encoder_profile: Optional[str] = None):
+        self.config = config if config else load_config()
         self.output_dir = os.path.join("output_manager", "videos")
         os.makedirs(self.output_dir, exist_ok=True)
-
-    def create_text_image(self, text: str, style: VideoStyle, width=None) -> np.ndarray:
-        """Create text image using PIL."""
-        if width is None:
-            width = style.resolution[0] - 2 * style.text_margin
+        self.temp_dir = self.config.get('project', {}).get('temp_dir', './temp/')
+        # Render time-invariant scenes as a single flattened frame
+        self.static_fast_path = static_fast_path
+        
+        # Scene-parallel rendering settings (threads: 0 = auto)
+        performance = self.config.get('performance', {})
+        self.parallel_processing = performance.get('parallel_processing', False)
+        self.workers = performance.get('threads', 0) or os.cpu_count() or 1
+        # Frame pipe: compositing threads per encode and reusable frame buffers
+        self.frame_workers = performance.get('frame_workers', 2)
+        self.frame_queue_depth = performance.get('frame_queue_depth', 8)
+        
+        # Default encoder profile (draft, preview, production, archive)
+        self.encoder_profile = encoder_profile or self.config.get('media', {}).get('encoder_profile', "production")
+        self.encoder_threads = performance.get('encoder_threads', 0)
+        
+        # Resolve style fonts once instead of per text element
+        self.fonts = get_font_registry(self.config)
+        self.fonts.preload(
+            [VideoStyle.get_style(name).font for name in VideoStyle.STYLE_NAMES]
+            + [self.config.get('video_style', {}).get('font', "Arial")]
+        )
         
-        # Use a basic font that's guaranteed to exist
+        # Rendered text bitmaps are reused across scenes and runs
+        self.text_cache = TextImageCache(CacheStore.from_config(self.config, "text", share=0.1))
+        # Encoded scene segments keyed by scene content hash, for incremental re-renders
+        self.segment_cache = CacheStore.from_config(self.config, "segments", share=0.5)
+        self.transitions = TransitionManager()
+        # Background images and videos pre-scaled to the render resolution
+        self.backgrounds = BackgroundCache(CacheStore.from_config(self.config, "backgrounds", share=0.3))
+        self.background_blur = float(self.config.get('video_style', {}).get('background_blur', 0) or 0)
+        # Slow zoom on image backgrounds (zoom_ratio 0.01 to 0.2)
+        self.zoom_effect = bool(self.config.get('video_style', {}).get('zoom_effect', False))
+        self.zoom_ratio = min(max(float(self.config.get('video_style', {}).get('zoom_ratio', 0.05)), 0.01), 0.2)
+        # Brightness/contrast/saturation for backgrounds, None when off
+        self.color_correction = ColorCorrection.from_config(self.config)
+        # Animated text (typewriter, bounce) drawn from glyph atlases
+        video_style = self.config.get('video_style', {})
+        self.text_effect = video_style.get('text_effect', "none") if video_style.get('enable_animations', False) else "none"
+        if self.text_effect not in TEXT_EFFECTS:
+            print(f"Warning: Unknown text effect '{self.text_effect}', text will be static")
+            self.text_effect = "none"
+        self.animation_style = video_style.get('animation_style', "subtle")
+        # Branding overlay per frame size, built on first use
+        self.watermark_settings = self.config.get('video_style', {}).get('watermark', {}) or {}
+        self._watermarks: Dict[Tuple[int, int], Optional[StaticOverlay]] = {}
+        # Scene lengths from narration (scene.auto_timing), within min/max_duration
+        scene_config = self.config.get('scene', {})
+        self.auto_timing = bool(scene_config.get('auto_timing', False))
+        self.min_duration = float(scene_config.get('min_duration', 1) or 1)
+        self.max_duration = float(scene_config.get('max_duration', 0) or 0) or None
+
+    def apply_config_style(self, style: VideoStyle) -> VideoStyle:
+        """Apply text styling options from the video_style config section."""
+        video_style = self.config.get('video_style', {})
+        return replace(
+            style,
+            stroke_width=int(video_style.get('stroke_width', style.stroke_width)),
+            stroke_color=video_style.get('stroke_color', style.stroke_color),
+            text_opacity=float(video_style.get('text_opacity', style.text_opacity))
+        )
+
+    def scene_style(self, scene: Dict, style: VideoStyle) -> VideoStyle:
+        """Get the style a scene renders with.
+
+        A scene styled in the manual editor (``style.font_family``) or with a
+        template (``style.font``) keeps that font; otherwise the job style
+        is used as is.
+        """
+        scene_style = scene.get('style')
+        if not isinstance(scene_style, dict):
+            return style
+        font = scene_style.get('font_family') or scene_style.get('font')
+        return replace(style, font=font) if font and font != style.font else style
+
+    @staticmethod
+    def _parse_color(color: str, default: Tuple[int, int, int] = (255, 255, 255)) -> Tuple[int, int, int]:
+        """Parse a color name or hex string to an RGB tuple."""
         try:
-            # For Windows, don't add .ttf extension
-            font = ImageFont.truetype("Arial", style.font_size)
-        except:
+            return ImageColor.getrgb(color)[:3]
+        except (ValueError, AttributeError):
+            return default
+
+    def _text_box(self, style: VideoStyle, count: int) -> Tuple[int, int]:
+        """Width and height available to each of ``count`` text blocks in a scene."""
+        width = style.resolution[0] - 2 * style.text_margin
+        slot = (style.resolution[1] - 2 * style.text_margin) // (count + 1)
+        return width, max(slot - 2 * TEXT_PADDING, 1)
+
+    def _text_plan_key(self, texts: List[str], style: VideoStyle) -> str:
+        return CacheStore.make_key(
+            "text_plan", TEXT_LAYOUT_VERSION, texts, self.fonts.resolve(style.font), style.font_size,
+            style.stroke_width, list(style.resolution), style.text_margin
+        )
+
+    def plan_scene_text(self, scene: Dict, style: VideoStyle) -> List[Dict]:
+        """Wrap and fit a scene's text blocks, once per scene.
+
+        Each block gets its lines and the largest font size up to the
+        style's that fits its share of the frame. The plan is stored on the
+        scene as ``text_layout``; proxy renders of the style (see
+        ``VideoStyle.scaled``) reuse it with the font scaled, so previews
+        break lines exactly where the final render does.
+        """
+        style = self.scene_style(scene, style)
+        texts = scene.get('text') or []
+        key = self._text_plan_key(texts, style)
+        plan = scene.get('text_layout')
+        if plan and (plan.get('key') == key or style.layout_scale != 1.0):
+            return plan['blocks']
+
+        width, height = self._text_box(style, len(texts))
+        stroke_width = max(style.stroke_width, 0)
+        blocks = []
+        for text in texts:
+            font_size, lines = fit_text(
+                text,
+                lambda size: self.fonts.get_font(style.font, size),
+                lambda size: (self.fonts.resolve(style.font), size),
+                style.font_size,
+                width,
+                height,
+                stroke_width=stroke_width,
+                min_size=max(int(style.font_size * MIN_FONT_SCALE), 8)
+            )
+            if font_size != style.font_size:
+                print(f"  Fitted text at {font_size}px: {text[:40]}")
+            blocks.append({'lines': lines, 'font_size': font_size, 'width': width})
+        scene['text_layout'] = {'key': key, 'blocks': blocks}
+        return blocks
+
+    def plan_text(self, scenes: List[Dict], style: VideoStyle):
+        """Plan text layout for every scene (see ``plan_scene_text``)."""
+        with get_tracer().span("text_layout", scenes=len(scenes)):
+            # Fonts scenes choose themselves are resolved once per job, warning about missing ones
+            scene_fonts = dict.fromkeys(self.scene_style(scene, style).font for scene in scenes)
+            self.fonts.preload(font for font in scene_fonts if font != style.font)
+            for scene in scenes:
+                self.plan_scene_text(scene, style)
+
+    def _block_layout(self, block: Dict, style: VideoStyle) -> TextLayout:
+        """Lay out a planned text block for a style, scaling the font for proxies."""
+        width = style.resolution[0] - 2 * style.text_margin
+        font_size = block['font_size']
+        if width != block['width']:
+            # Round down so the planned lines never overflow the smaller frame
+            font_size = max(int(font_size * width / block['width']), 1)
+        font = self.fonts.get_font(style.font, font_size)
+        return TextLayout.build(block['lines'], font, style.text_align, max(style.stroke_width, 0))
+
+    def create_text_image(self, text: str, style: VideoStyle, width=None, block: Optional[Dict] = None) -> np.ndarray:
+        """Create text image using PIL, reusing cached bitmaps when available.
+        
+        ``block`` is a planned block from ``plan_scene_text``; without one
+        the text is wrapped to ``width`` at the style's font size.
+        """
+        if block is None:
+            if width is None:
+                width = style.resolution[0] - 2 * style.text_margin
+            font = self.fonts.get_font(style.font, style.font_size)
+            widths = get_word_widths((self.fonts.resolve(style.font), style.font_size), font)
+            lines = wrap_text(text, widths, width - 2 * max(style.stroke_width, 0))
+            block = {'lines': lines, 'font_size': style.font_size, 'width': style.resolution[0] - 2 * style.text_margin}
+        layout = self._block_layout(block, style)
+        
+        key = TextImageCache.make_key(
+            '\n'.join(layout.lines), self.fonts.resolve(style.font), layout.font.size, style.text_color,
+            style.stroke_width, style.stroke_color, 0, style.text_align, style.text_opacity
+        )
+        text_array = self.text_cache.get(key)
+        if text_array is None:
+            get_tracer().count("text_cache_misses")
+            text_array = self.text_cache.put(key, self._rasterize_text(layout, style))
+        else:
+            get_tracer().count("text_cache_hits")
+        return text_array
+
+    def _rasterize_text(self, layout: TextLayout, style: VideoStyle) -> np.ndarray:
+        """Rasterize laid-out text with outline and opacity."""
+        return layout.render(
+            self._parse_color(style.text_color),
+            self._parse_color(style.stroke_color, default=(0, 0, 0)),
+            opacity=style.text_opacity,
+            padding=TEXT_PADDING
+        )
+
+    def _text_x_position(self, text_width: int, style: VideoStyle):
+        """Get horizontal text position for the style alignment."""
+        if style.text_align == "left":
+            return style.text_margin
+        if style.text_align == "right":
+            return style.resolution[0] - style.text_margin - text_width
+        return 'center'
+
+    def _scene_duration(self, scene: Dict) -> float:
+        """Get scene duration in seconds from its timing string."""
+        duration = 5.0  # Default 5 seconds
+        if scene.get('timing') and 'to' in scene.get('timing'):
             try:
-                # Try with ttf extension
-                font = ImageFont.truetype("Arial.ttf", style.font_size)
+                parts = scene['timing'].split('to')
+                start_time = float(parts[0].strip())
+                end_time = float(parts[1].strip())
+                duration = end_time - start_time
+                duration = max(duration, 1.0)  # Minimum 1 second
+                print(f"  Duration: {duration:.1f} seconds")
             except:
-                # Last resort fallback
-                font = ImageFont.load_default()
+                print(f"  Invalid timing format, using default duration")
+        return duration
+
+    @staticmethod
+    def _scene_background(scene: Dict) -> Tuple[str, Optional[str]]:
+        """Get a scene's background as (type, path): color, image or video.
+
+        Scenes name a background with ``background_image`` or
+        ``background_video``, or through a ManualStyle's background_type and
+        background_value. Missing files fall back to the style color.
+        """
+        manual_style = scene.get('style') if isinstance(scene.get('style'), dict) else {}
+        candidates = [
+            ("image", scene.get('background_image')),
+            ("video", scene.get('background_video')),
+            (manual_style.get('background_type'), manual_style.get('background_value'))
+        ]
+        for kind, path in candidates:
+            if kind in ("image", "video") and path:
+                if os.path.isfile(path):
+                    return kind, path
+                print(f"  Warning: Background {kind} not found: {path}")
+        return "color", None
+
+    def _build_background(self, scene: Dict, style: VideoStyle, duration: float):
+        """Create the background layer from a pre-scaled asset or the style color.
+
+        Color correction is applied once to still sources (including the
+        zoom source) and per frame, into reused buffers, only for video
+        backgrounds.
+        """
+        kind, path = self._scene_background(scene)
+        color = self.color_correction
+        try:
+            if kind == "image" and self.zoom_effect:
+                size = KenBurnsEffect.source_size(style.resolution, self.zoom_ratio)
+                image = self.backgrounds.get_image(path, size, self.background_blur)
+                if color:
+                    image = color.apply(image)
+                effect = KenBurnsEffect(image, style.resolution, duration, style.fps, self.zoom_ratio)
+                return VideoClip(effect.get_frame, duration=duration)
+            if kind == "image":
+                image = self.backgrounds.get_image(path, style.resolution, self.background_blur)
+                if color:
+                    image = color.apply(image)
+                return ImageClip(image).set_duration(duration)
+            if kind == "video":
+                video_file = self.backgrounds.get_video(path, style.resolution, style.fps, self.background_blur)
+                clip = VideoFileClip(video_file, audio=False)
+                if clip.duration < duration:
+                    clip = clip.fx(loop, duration=duration)
+                # Frame pipe workers sample concurrently; decode in order through one reader
+                reader = OrderedFrameReader(clip, style.fps, window=self.frame_queue_depth * 2)
+                if not color:
+                    return VideoClip(reader.get_frame, duration=duration)
+                # Decoded frames are shared through the reader's window, so each thread
+                # corrects into its own buffer, consumed before it asks for the next frame
+                local = threading.local()
+
+                def make_frame(t):
+                    frame = reader.get_frame(t)
+                    out = getattr(local, 'out', None)
+                    if out is None or out.shape[:2] != frame.shape[:2]:
+                        out = local.out = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+                    return color.apply(frame, out=out)
+
+                return VideoClip(make_frame, duration=duration)
+        except Exception as e:
+            print(f"  Error preparing background {path}: {str(e)}")
+
+        rgb_color = np.array([[self._parse_color(style.background_color, default=(0, 0, 0))]], dtype=np.uint8)
+        if color:
+            rgb_color = color.apply(rgb_color)
+        return ColorClip(
+            size=style.resolution,
+            color=tuple(int(c) for c in rgb_color[0, 0]),
+            duration=duration
+        )
+
+    def _build_scene_layers(self, scene: Dict, style: VideoStyle, duration: float,
+                            animation: Optional[AnimatedText] = None) -> List:
+        """Create background and text layers for a scene.
+
+        With an ``animation`` the text blocks are added to it instead of
+        becoming layers, at the positions the static layers would have.
+        """
+        bg_clip = self._build_background(scene, style, duration)
+        print("  Created background clip")
+        
+        clips = [bg_clip]
         
-        # Parse color
-        if style.text_color.startswith('#'):
-            r = int(style.text_color[1:3], 16)
-            g = int(style.text_color[3:5], 16)
-            b = int(style.text_color[5:7], 16)
-            text_color = (r, g, b, 255)
+        # Add text clips
+        if scene.get('text'):
+            print(f"  Adding {len(scene['text'])} text elements")
+            screen_height = style.resolution[1]
+            margin = style.text_margin
+            spacing = (screen_height - 2 * margin) // (len(scene['text']) + 1)
+            
+            blocks = self.plan_scene_text(scene, style)
+            for j, block in enumerate(blocks):
+                y_pos = margin + spacing * (j + 1)
+                try:
+                    if animation is not None:
+                        self._add_animated_text(animation, block, style, y_pos)
+                        print(f"  Added animated text {j+1}")
+                        continue
+                    text_array = self.create_text_image(scene['text'][j], style, block=block)
+                    x_pos = self._text_x_position(text_array.shape[1], style)
+                    text_clip = ImageClip(text_array)
+                    text_clip = text_clip.set_duration(duration)
+                    text_clip = text_clip.set_position((x_pos, y_pos))
+                    clips.append(text_clip)
+                    print(f"  Added text clip {j+1}")
+                except Exception as e:
+                    print(f"  Error creating text clip {j+1}: {str(e)}")
+        
+        return clips
+
+    def _add_animated_text(self, animation: AnimatedText, block: Dict, style: VideoStyle, y_pos: int):
+        """Lay out a planned text block and add its glyphs to a scene animation."""
+        layout = self._block_layout(block, style)
+        block_width = layout.size[0] + 2 * TEXT_PADDING
+        x_pos = self._text_x_position(block_width, style)
+        if x_pos == 'center':
+            x_pos = (style.resolution[0] - block_width) / 2
+        atlas = get_glyph_atlas(
+            (self.fonts.resolve(style.font), layout.font.size),
+            layout.font,
+            self._parse_color(style.text_color),
+            layout.stroke_width,
+            self._parse_color(style.stroke_color, default=(0, 0, 0)),
+            style.text_opacity
+        )
+        animation.add_block(layout, atlas, (int(x_pos) + TEXT_PADDING, y_pos + TEXT_PADDING))
+
+    @staticmethod
+    def _animate_text(base, animation: AnimatedText, duration: float) -> VideoClip:
+        """Draw animated text over each frame of a base clip."""
+        local = threading.local()
+
+        def make_frame(t):
+            frame = base.get_frame(t)
+            out = getattr(local, 'out', None)
+            if out is None or out.shape[:2] != frame.shape[:2]:
+                out = local.out = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+            np.copyto(out, frame[:, :, :3], casting='unsafe')
+            return animation.draw(out, t)
+
+        return VideoClip(make_frame, duration=duration)
+
+    @staticmethod
+    def _is_static_scene(clips: List) -> bool:
+        """Check whether every layer of a scene is a still image.
+
+        ColorClip is an ImageClip subclass, so a scene made only of background
+        and rasterized text layers produces the same pixels for every frame.
+        """
+        return all(isinstance(clip, ImageClip) for clip in clips)
+
+    def _flatten_static_scene(self, clips: List, style: VideoStyle, duration: float) -> ImageClip:
+        """Composite static layers once and return a single still clip."""
+        frame = CompositeVideoClip(clips, size=style.resolution).get_frame(0)
+        watermark = self.get_watermark(style)
+        if watermark is not None:
+            # Baked in once, so static scenes still cost a single frame
+            frame = np.array(frame, dtype=np.uint8)
+            watermark.apply(frame, out=frame)
+        return ImageClip(frame).set_duration(duration)
+
+    @staticmethod
+    def _layer_rgba(clip, size: Tuple[int, int]) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Get a still layer as an RGBA array and its top-left position in the frame."""
+        rgb = clip.get_frame(0)[:, :, :3].astype(np.uint8)
+        if clip.mask is not None:
+            alpha = np.rint(clip.mask.get_frame(0) * 255).astype(np.uint8)
         else:
-            colors = {
-                'white': (255, 255, 255, 255),
-                'black': (0, 0, 0, 255),
-                'green': (0, 255, 0, 255),
-                'red': (255, 0, 0, 255),
-                'blue': (0, 0, 255, 255)
-            }
-            text_color = colors.get(style.text_color.lower(), (255, 255, 255, 255))
+            alpha = np.full(rgb.shape[:2], 255, dtype=np.uint8)
+        h, w = rgb.shape[:2]
+        x, y = clip.pos(0)
+        if isinstance(x, str):
+            x = {'left': 0, 'center': (size[0] - w) / 2, 'right': size[0] - w}[x]
+        if isinstance(y, str):
+            y = {'top': 0, 'center': (size[1] - h) / 2, 'bottom': size[1] - h}[y]
+        return np.dstack([rgb, alpha]), (int(x), int(y))
+
+    def _overlay_static_layers(self, clips: List, style: VideoStyle, duration: float) -> VideoClip:
+        """Flatten still layers into one overlay blended onto each background frame."""
+        background = clips[0]
+        layers = [self._layer_rgba(clip, style.resolution) for clip in clips[1:]]
+        watermark = load_watermark(self.watermark_settings, style.resolution)
+        if watermark is not None:
+            layers.append(watermark)
+        overlay = StaticOverlay(layers, style.resolution)
+        return VideoClip(lambda t: overlay.apply(background.get_frame(t)), duration=duration)
+
+    def build_scene_clip(self, scene: Dict, style: VideoStyle):
+        """Build the clip for a single scene."""
+        with get_tracer().span("composite_scene", scene=scene.get('name', 'Untitled')):
+            return self._build_scene_clip(scene, self.scene_style(scene, style))
+
+    def _build_scene_clip(self, scene: Dict, style: VideoStyle):
+        duration = self._scene_duration(scene)
+        animation = None
+        if self.text_effect != "none" and scene.get('text'):
+            animation = AnimatedText(self.text_effect, style.fps, style.font_size, self.animation_style)
         
-        # Wrap text to fit width
-        wrapped_text = textwrap.fill(text, width=40)  # Approximate characters per line
+        # Create background and text layers
+        try:
+            clips = self._build_scene_layers(scene, style, duration, animation)
+        except Exception as e:
+            print(f"  Error creating background: {str(e)}")
+            return None
+        
+        scene_clip = self._composite_layers(clips, style, duration)
+        if animation is not None:
+            print(f"  Animating text with {self.text_effect} effect")
+            if animation.duration > duration * TEXT_REVEAL_SHARE:
+                print(f"  Speeding up text animation from {animation.duration:.1f}s to fit the scene")
+                animation.fit(duration * TEXT_REVEAL_SHARE)
+            scene_clip = self._animate_text(scene_clip, animation, duration)
+        return scene_clip
+
+    def _composite_layers(self, clips: List, style: VideoStyle, duration: float):
+        """Composite scene layers and the watermark into one clip."""
+        # Static scenes are flattened to one frame instead of re-compositing every frame
+        if self.static_fast_path and self._is_static_scene(clips):
+            print("  Flattening static scene to a single frame")
+            return self._flatten_static_scene(clips, style, duration)
         
-        # Create a temporary image to measure text
-        temp_img = Image.new('RGBA', (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
+        # A moving background under still layers only needs the layers blended in per frame
+        if self.static_fast_path and len(clips) > 1 and self._is_static_scene(clips[1:]):
+            print("  Precompositing static layers over the moving background")
+            return self._overlay_static_layers(clips, style, duration)
         
-        # Measure text dimensions (newer PIL versions)
-        if hasattr(font, 'getbbox'):
-            bbox = font.getbbox(wrapped_text)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
+        # Composite all clips
+        scene_clip = CompositeVideoClip(clips, size=style.resolution).set_duration(duration)
+        watermark = self.get_watermark(style)
+        if watermark is None:
+            return scene_clip
+        # The overlay is shared by every scene of this size, so each scene blends into its
+        # own buffers; transitions hold frames from two scenes at once on the same thread
+        local = threading.local()
+
+        def make_frame(t):
+            frame = scene_clip.get_frame(t)
+            out = getattr(local, 'out', None)
+            if out is None or out.shape[:2] != frame.shape[:2]:
+                out = local.out = np.empty(frame.shape[:2] + (3,), dtype=np.uint8)
+            return watermark.apply(frame, out=out)
+
+        return VideoClip(make_frame, duration=duration)
+
+    def get_watermark(self, style: VideoStyle) -> Optional[StaticOverlay]:
+        """Get the premultiplied watermark overlay for the style's frame size, or None."""
+        size = tuple(style.resolution)
+        if size not in self._watermarks:
+            layer = load_watermark(self.watermark_settings, size)
+            self._watermarks[size] = StaticOverlay([layer], size) if layer else None
+        return self._watermarks[size]
+
+    def _pick_transition(self, scene: Dict, index: int, style: VideoStyle) -> Optional[Tuple[str, float]]:
+        """Choose the transition out of a scene as (type, duration), or None for a cut.
+
+        A scene's own ``transitions`` list wins, then a pick from
+        scene.transition_types when scene.random_transitions is on, then
+        video_style.transition. Random picks are seeded by the scene so
+        re-renders schedule the same transitions and reuse cached segments.
+        """
+        video_style = self.config.get('video_style', {})
+        scene_config = self.config.get('scene', {})
+        if scene.get('transitions'):
+            name = scene['transitions'][0]
+        elif scene_config.get('random_transitions') and scene_config.get('transition_types'):
+            rng = random.Random(f"{index}:{scene.get('name', '')}:{scene.get('text', [])}")
+            name = rng.choice(scene_config['transition_types'])
         else:
-            # Older PIL versions - estimate size
-            text_width = len(wrapped_text) * (style.font_size // 2)
-            text_height = wrapped_text.count('\n') * style.font_size + style.font_size
+            name = video_style.get('transition', "none")
+
+        name = str(name or "none").lower()
+        if name == "none":
+            return None
+        if name not in self.transitions.transitions:
+            print(f"Warning: Unknown transition type '{name}', falling back to fade")
+            name = "fade"
+        duration = float(video_style.get('transition_duration', style.transition_duration) or 0)
+        return name, duration or self.transitions.transitions[name]['duration']
+
+    def plan_timeline(self, scenes: List[Dict], style: VideoStyle) -> List[Dict]:
+        """Schedule scene bodies and the transitions between them.
+
+        Each transition is centred on the cut between two scenes and takes
+        half its length from each side, so scene start times (and narration
+        sync) don't move. Scene items cover what is left of each scene
+        (``start``..``end`` in scene time); transition items are rendered on
+        their own. Times are whole frames so segments join without drift.
+        """
+        fps = style.fps
+        frames = [max(int(round(self._scene_duration(scene) * fps)), 1) for scene in scenes]
+
+        # Frames each transition takes from either side of its cut
+        halves = []
+        for i in range(len(scenes) - 1):
+            transition = self._pick_transition(scenes[i], i, style)
+            half = 0
+            if transition:
+                # Leave at least one frame of each scene body
+                limit = (min(frames[i], frames[i + 1]) - 1) // 2
+                half = min(int(round(transition[1] * fps / 2)), limit)
+            halves.append((transition, half) if half > 0 else (None, 0))
+
+        items = []
+        for i in range(len(scenes)):
+            head = halves[i - 1][1] if i > 0 else 0
+            tail = halves[i][1] if i < len(halves) else 0
+            items.append({
+                'kind': "scene",
+                'index': i,
+                'start': head / fps,
+                'end': (frames[i] - tail) / fps
+            })
+            if tail:
+                items.append({
+                    'kind': "transition",
+                    'index': i,
+                    'type': halves[i][0][0],
+                    'duration': 2 * tail / fps
+                })
+        return items
+
+    def time_scenes_to_audio(self, scenes: List[Dict], scene_files: List[Optional[str]], style: VideoStyle) -> List[float]:
+        """Set each scene's timing from the length of its narration.
+
+        Lengths are read from the audio headers, clamped to
+        ``scene.min_duration``..``scene.max_duration`` and rounded to whole
+        frames (rounding up, so narration never runs into the next scene),
+        then written back as consecutive ``timing`` strings so the
+        rendered timeline and ``scene_starts`` follow the voice-over. Scenes
+        without narration keep their current length. Returns the durations.
+        """
+        durations = []
+        frame = 0
+        with get_tracer().span("auto_timing", scenes=len(scenes)):
+            for scene, audio in zip(scenes, scene_files):
+                duration = audio_duration(audio) if audio else None
+                if duration is None:
+                    duration = self._scene_duration(scene)
+                else:
+                    duration = max(duration, self.min_duration)
+                    if self.max_duration:
+                        duration = min(duration, self.max_duration)
+                # The tolerance keeps float error from adding a frame to exact lengths
+                frames = max(math.ceil(duration * style.fps - 1e-6), 1)
+                scene['timing'] = f"{frame / style.fps:.3f} to {(frame + frames) / style.fps:.3f}"
+                durations.append(frames / style.fps)
+                frame += frames
+        return durations
+
+    def scene_starts(self, scenes: List[Dict], style: VideoStyle) -> List[float]:
+        """Start time of each scene in the final video, in seconds.
+
+        Transitions are centred on cuts (see ``plan_timeline``), so scenes
+        start where the previous ones' whole-frame durations add up to.
+        """
+        starts, frames = [], 0
+        for scene in scenes:
+            starts.append(frames / style.fps)
+            frames += max(int(round(self._scene_duration(scene) * style.fps)), 1)
+        return starts
+
+    def build_transition_clip(self, clip1, clip2, transition_type: str, duration: float, style: VideoStyle):
+        """Build the overlap window between two scene clips.
+
+        The outgoing scene's last frame is held past its end and the incoming
+        scene's first frame before its start, since the window is centred on
+        the cut rather than taken out of both clips' running time.
+        """
+        half = duration / 2
+        last = max(clip1.duration - 1.0 / style.fps, 0)
+        outgoing = VideoClip(lambda t: clip1.get_frame(min(t, last)), duration=clip1.duration + half)
+        incoming = VideoClip(lambda t: clip2.get_frame(max(t - half, 0)), duration=clip2.duration + half)
+        effect = self.transitions.get_effect(transition_type, duration, style.fps)
+        return effect.overlap_clip(outgoing, incoming)
+
+    def _timeline_item_clip(self, item: Dict, scene_clips: Dict[int, object], style: VideoStyle):
+        """Get the clip for a timeline item from the built scene clips it needs."""
+        i = item['index']
+        if item['kind'] == "transition":
+            clip1, clip2 = scene_clips.get(i), scene_clips.get(i + 1)
+            if clip1 is None or clip2 is None:
+                return None
+            with get_tracer().span("transition", type=item['type'], scene=i):
+                return self.build_transition_clip(clip1, clip2, item['type'], item['duration'], style)
+
+        clip = scene_clips.get(i)
+        if clip is None:
+            return None
+        if item['start'] > 0 or item['end'] < clip.duration:
+            clip = clip.subclip(item['start'], item['end'])
+        return clip
+
+    def build_timeline(self, scenes: List[Dict], style: VideoStyle):
+        """Build every scene and transition into a single clip."""
+        scene_clips = {}
+        for i, scene in enumerate(scenes):
+            try:
+                print(f"\nProcessing scene {i+1}: {scene.get('name', 'Untitled')}")
+                scene_clips[i] = self.build_scene_clip(scene, style)
+                if scene_clips[i] is not None:
+                    print(f"  Scene {i+1} processed successfully")
+            except Exception as e:
+                print(f"  Error processing scene {i+1}: {str(e)}")
+
+        clips = []
+        for item in self.plan_timeline(scenes, style):
+            clip = self._timeline_item_clip(item, scene_clips, style)
+            if clip is not None:
+                clips.append(clip)
+
+        if not clips:
+            return None
+        print(f"\nCombining {len(clips)} clips into final video")
+        return concatenate_videoclips(clips)
+
+    def get_encoder(self, profile_name: Optional[str] = None, parallel: bool = False) -> EncoderProfile:
+        """Get the encoder profile for a job.
         
-        # Create image with proper size
-        img = Image.new('RGBA', (text_width + 20, text_height + 20), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+        When scenes are encoded in parallel each encoder gets an equal share
+        of the CPU unless performance.encoder_threads is set.
+        """
+        threads = self.encoder_threads
+        if not threads and parallel:
+            threads = max((os.cpu_count() or 1) // self.workers, 1)
+        return get_encoder_profile(profile_name or self.encoder_profile, self.config, threads=threads)
+
+    def write_clip(self, clip, output_file: str, style: VideoStyle, encoder: Optional[EncoderProfile] = None) -> str:
+        """Encode a clip through the streaming frame pipe."""
+        encoder = encoder or self.get_encoder()
+        writer = FramePipeWriter(
+            output_file,
+            size=style.resolution,
+            fps=style.fps,
+            codec='libx264',
+            preset=encoder.preset,
+            ffmpeg_params=encoder.ffmpeg_params(style.fps),
+            queue_depth=self.frame_queue_depth,
+            workers=self.frame_workers
+        )
+        tracer = get_tracer()
+        with tracer.span("encode", file=os.path.basename(output_file), profile=encoder.name):
+            writer.write_clip(clip)
+        tracer.count("frames_rendered", int(round(clip.duration * style.fps)))
+        return output_file
+
+    def _process_sequential(self, scenes: List[Dict], audio_file: str, style: VideoStyle, output_file: str,
+                            encoder: EncoderProfile) -> bool:
+        """Build all scenes in this process and encode them in one pass."""
+        final_video = self.build_timeline(scenes, style)
+        if final_video is None:
+            print("Error: No valid scene clips generated")
+            return False
         
-        # Draw text
-        draw.text((10, 10), wrapped_text, font=font, fill=text_color)
+        # Stream frames to the encoder, then mux narration without re-encoding video
+        video_only = f"{os.path.splitext(output_file)[0]}_video.mp4"
+        print(f"Writing video to {output_file}")
+        try:
+            self.write_clip(final_video, video_only, style, encoder)
+            with get_tracer().span("concat", segments=1):
+                concat_segments([video_only], output_file, audio_file=audio_file, duration=final_video.duration)
+        finally:
+            if os.path.exists(video_only):
+                os.remove(video_only)
+        return True
+
+    def scene_hash(self, scene: Dict, style: VideoStyle, encoder: Optional[EncoderProfile] = None) -> str:
+        """Hash everything that affects a scene's rendered pixels."""
+        assets = {
+            key: _asset_fingerprint(value)
+            for key, value in scene.items()
+            if isinstance(value, str) and os.path.isfile(value)
+        }
+        return CacheStore.make_key(
+            "scene", RENDER_VERSION,
+            scene.get('text', []),
+            self._scene_duration(scene),
+            asdict(self.scene_style(scene, style)),
+            scene.get('background', ''),
+            scene.get('visuals', []),
+            scene.get('transitions', []),
+            assets,
+            self._background_fingerprint(scene),
+            self.color_correction.settings if self.color_correction else None,
+            self._watermark_fingerprint(),
+            [self.text_effect, self.animation_style] if self.text_effect != "none" else None,
+            self.static_fast_path,
+            # Thread count doesn't change the picture, so segments are shared across it
+            asdict(replace(encoder, threads=0)) if encoder else None
+        )
+
+    def _background_fingerprint(self, scene: Dict) -> Optional[List]:
+        kind, path = self._scene_background(scene)
+        if path is None:
+            return None
+        zoom = self.zoom_ratio if kind == "image" and self.zoom_effect else None
+        return [kind, _asset_fingerprint(path), self.background_blur, zoom]
+
+    def _watermark_fingerprint(self) -> Optional[List]:
+        settings = self.watermark_settings
+        path = settings.get('image_path')
+        if not settings.get('enabled', False) or not path or not os.path.isfile(path):
+            return None
+        return [_asset_fingerprint(path), {key: value for key, value in settings.items() if key != 'image_path'}]
+
+    def _process_segments(self, scenes: List[Dict], audio_file: str, style: VideoStyle, output_file: str,
+                          encoder: EncoderProfile) -> bool:
+        """Render each timeline item to its own segment and join them losslessly.
+        
+        Scene bodies and transitions are separate segments, so a transition
+        only re-renders its own overlap window. Segments whose hash is already
+        in the segment cache are reused; the rest are rendered, in a process
+        pool when parallel processing is on.
+        """
+        segment_dir = os.path.join(self.temp_dir, f"segments_{os.path.splitext(os.path.basename(output_file))[0]}")
+        os.makedirs(segment_dir, exist_ok=True)
         
-        # Convert to numpy array for MoviePy
-        return np.array(img)
+        items = self.plan_timeline(scenes, style)
+        segments: List[Optional[Tuple[str, float]]] = [None] * len(items)
+        scene_keys = [self.scene_hash(scene, style, encoder) for scene in scenes]
+        item_keys = [self._item_hash(item, scene_keys) for item in items]
+        # This video's segments must survive until the concat, even past the cache size limit
+        pin = self.segment_cache.pin(item_keys) if self.segment_cache else nullcontext()
+        try:
+            with pin:
+                jobs = []
+                for n, item in enumerate(items):
+                    cached = self.segment_cache.get(item_keys[n], ".mp4") if self.segment_cache else None
+                    if cached:
+                        get_tracer().count("segment_cache_hits")
+                        print(f"  Reusing cached {item['kind']} segment {n+1}")
+                        segments[n] = (cached, self._item_duration(item))
+                    else:
+                        needed = {i: scenes[i] for i in self._item_scenes(item)}
+                        segment_file = os.path.join(segment_dir, f"{item['kind']}_{n:04d}.mp4")
+                        jobs.append((n, (item, needed, style, segment_file, self.config, self.static_fast_path, encoder)))
+                
+                if jobs:
+                    workers = min(self.workers, len(jobs)) if self.parallel_processing else 1
+                    print(f"Rendering {len(jobs)} of {len(items)} segments with {workers} worker process(es)")
+                    if workers > 1:
+                        with ProcessPoolExecutor(max_workers=workers) as executor:
+                            # map() keeps results in timeline order
+                            results = list(executor.map(_render_timeline_segment, [job for _, job in jobs]))
+                    else:
+                        results = [_render_timeline_segment(job) for _, job in jobs]
+                    
+                    tracer = get_tracer()
+                    for (n, _), (result, events) in zip(jobs, results):
+                        tracer.merge(events)
+                        if result is not None and self.segment_cache:
+                            path, duration = result
+                            result = (self.segment_cache.put(item_keys[n], path, ".mp4", move=True), duration)
+                        segments[n] = result
+                
+                segments = [segment for segment in segments if segment is not None]
+                if not segments:
+                    print("Error: No valid scene clips generated")
+                    return False
+                
+                total_duration = sum(duration for _, duration in segments)
+                print(f"\nJoining {len(segments)} segments into final video")
+                print(f"Writing video to {output_file}")
+                with get_tracer().span("concat", segments=len(segments)):
+                    concat_segments(
+                        [path for path, _ in segments],
+                        output_file,
+                        audio_file=audio_file,
+                        duration=total_duration
+                    )
+                return True
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+            if self.segment_cache:
+                self.segment_cache.evict()
+                self.segment_cache.flush()
+
+    @staticmethod
+    def _item_scenes(item: Dict) -> List[int]:
+        """Indexes of the scenes a timeline item is rendered from."""
+        if item['kind'] == "transition":
+            return [item['index'], item['index'] + 1]
+        return [item['index']]
+
+    @staticmethod
+    def _item_duration(item: Dict) -> float:
+        if item['kind'] == "transition":
+            return item['duration']
+        return item['end'] - item['start']
 
-    def process_video(self, scenes: List[Dict], audio_file: str = "", style_name: str = "modern") -> Optional[str]:
-        """Process scenes into a video."""
+    @staticmethod
+    def _item_hash(item: Dict, scene_keys: List[str]) -> str:
+        """Segment cache key for a timeline item, from its scenes' hashes."""
+        return CacheStore.make_key(
+            item['kind'],
+            [scene_keys[i] for i in VideoProcessor._item_scenes(item)],
+            {key: value for key, value in item.items() if key != 'index'}
+        )
+
+    def process_video(self, scenes: List[Dict], audio_file: str = "", style_name: str = "modern",
+                      profile: Optional[str] = None, scale: float = 1.0, fps: Optional[int] = None,
+                      output_name: Optional[str] = None) -> Optional[str]:
+        """Process scenes into a video.
+        
+        ``profile`` selects the encoder profile for this job (draft, preview,
+        production or archive); the processor default is used if omitted.
+        ``scale`` and ``fps`` render a proxy of the same timeline at reduced
+        resolution and frame rate. ``output_name`` replaces the default
+        timestamped file name.
+        """
         try:
             # Input validation
             if not scenes or len(scenes) == 0:
@@ -141,122 +950,30 @@ class VideoProcessor:
                 return None
             
             print(f"Processing {len(scenes)} scenes with {style_name} style")
-            style = VideoStyle.get_style(style_name)
-            scene_clips = []
-            
-            # Process each scene
-            for i, scene in enumerate(scenes):
-                try:
-                    print(f"\nProcessing scene {i+1}: {scene.get('name', 'Untitled')}")
-                    
-                    # Calculate duration
-                    duration = 5.0  # Default 5 seconds
-                    if scene.get('timing') and 'to' in scene.get('timing'):
-                        try:
-                            parts = scene['timing'].split('to')
-                            start_time = float(parts[0].strip())
-                            end_time = float(parts[1].strip())
-                            duration = end_time - start_time
-                            duration = max(duration, 1.0)  # Minimum 1 second
-                            print(f"  Duration: {duration:.1f} seconds")
-                        except:
-                            print(f"  Invalid timing format, using default duration")
-                    
-                    # Create background clip
-                    try:
-                        color = style.background_color.lstrip('#')
-                        rgb_color = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
-                        bg_clip = ColorClip(
-                            size=style.resolution,
-                            color=rgb_color,
-                            duration=duration
-                        )
-                        print("  Created background clip")
-                        
-                        clips = [bg_clip]
-                        
-                        # Add text clips
-                        if scene.get('text'):
-                            print(f"  Adding {len(scene['text'])} text elements")
-                            screen_height = style.resolution[1]
-                            margin = style.text_margin
-                            spacing = (screen_height - 2 * margin) // (len(scene['text']) + 1)
-                            
-                            for j, text in enumerate(scene['text']):
-                                try:
-                                    # Directly use TextClip with preset font
-                                    text_clip = TextClip(
-                                        text, 
-                                        fontsize=style.font_size,
-                                        color=style.text_color,
-                                        bg_color=None,
-                                        font='Arial',
-                                        method='pango'  # Try pango method (should work without ImageMagick)
-                                    )
-                                    
-                                    # Position text and set duration
-                                    y_pos = margin + spacing * (j + 1)
-                                    text_clip = text_clip.set_position(('center', y_pos))
-                                    text_clip = text_clip.set_duration(duration)
-                                    
-                                    clips.append(text_clip)
-                                    print(f"  Added text clip {j+1}")
-                                except Exception as e:
-                                    print(f"  Error creating text clip {j+1}: {str(e)}")
-                                    # Try alternative method with PIL if TextClip fails
-                                    try:
-                                        text_array = self.create_text_image(text, style)
-                                        pil_text_clip = ImageClip(text_array)
-                                        pil_text_clip = pil_text_clip.set_duration(duration)
-                                        pil_text_clip = pil_text_clip.set_position(('center', y_pos))
-                                        clips.append(pil_text_clip)
-                                        print(f"  Added text clip {j+1} using PIL alternative")
-                                    except Exception as e2:
-                                        print(f"  Error with PIL alternative: {str(e2)}")
-                        
-                        # Composite all clips
-                        scene_clip = CompositeVideoClip(clips, size=style.resolution)
-                        scene_clip = scene_clip.set_duration(duration)
-                        
-                        scene_clips.append(scene_clip)
-                        print(f"  Scene {i+1} processed successfully")
-                        
-                    except Exception as e:
-                        print(f"  Error creating background: {str(e)}")
-                        
-                except Exception as e:
-                    print(f"  Error processing scene {i+1}: {str(e)}")
-            
-            # Final check before compositing
-            if not scene_clips or len(scene_clips) == 0:
-                print("Error: No valid scene clips generated")
-                return None
-            
-            print(f"\nCombining {len(scene_clips)} clips into final video")
-            final_video = concatenate_videoclips(scene_clips)
-            
-            # Add audio if provided
-            if audio_file and os.path.exists(audio_file):
-                try:
-                    audio = AudioFileClip(audio_file)
-                    final_video = final_video.set_audio(audio)
-                    print("Added audio to video")
-                except Exception as e:
-                    print(f"Error adding audio: {str(e)}")
+            style = self.apply_config_style(VideoStyle.get_style(style_name))
+            # Text is laid out at full resolution so proxies wrap it the same way
+            self.plan_text(scenes, style)
+            proxy = scale != 1.0 or (fps is not None and fps != style.fps)
+            if proxy:
+                style = style.scaled(scale, fps)
+                print(f"Rendering proxy at {style.resolution[0]}x{style.resolution[1]}, {style.fps} fps")
             
             # Generate unique output filename
             timestamp = int(time.time())
-            output_file = os.path.join(self.output_dir, f"video_{style_name}_{timestamp}.mp4")
+            suffix = "_proxy" if proxy else ""
+            output_name = output_name or f"video_{style_name}_{timestamp}"
+            output_file = os.path.join(self.output_dir, f"{output_name}{suffix}.mp4")
             
-            # Write video file
-            print(f"Writing video to {output_file}")
-            final_video.write_videofile(
-                output_file,
-                fps=style.fps,
-                codec='libx264',
-                audio_codec='aac' if audio_file else None,
-                verbose=False
-            )
+            parallel = self.parallel_processing and self.workers > 1 and len(scenes) > 1
+            encoder = self.get_encoder(profile, parallel)
+            print(f"Using {encoder.name} encoder profile")
+            with get_tracer().span("render_video", scenes=len(scenes), profile=encoder.name):
+                if self.segment_cache is not None or parallel:
+                    rendered = self._process_segments(scenes, audio_file, style, output_file, encoder)
+                else:
+                    rendered = self._process_sequential(scenes, audio_file, style, output_file, encoder)
+            if not rendered:
+                return None
             
             print("Video completed successfully")
             return output_file
@@ -266,3 +983,35 @@ class VideoProcessor:
             print(f"Error processing video: {str(e)}")
             traceback.print_exc()
             return None
+
+
+def _render_timeline_segment(job: Tuple) -> Tuple[Optional[Tuple[str, float]], List[Dict]]:
+    """Render one scene body or transition to an encoded segment (process pool worker).
+    
+    Returns the segment path and duration (None on failure) along with the
+    trace events recorded while rendering, for the parent job's trace.
+    """
+    item, scenes, style, segment_file, config, static_fast_path, encoder = job
+    name = f"{item['kind']} {item['index'] + 1}"
+    with isolated_trace(name) as tracer:
+        try:
+            processor = VideoProcessor(config, static_fast_path=static_fast_path)
+            scene_clips = {}
+            for i, scene in scenes.items():
+                print(f"\nProcessing scene: {scene.get('name', 'Untitled')}")
+                scene_clips[i] = processor.build_scene_clip(scene, style)
+            clip = processor._timeline_item_clip(item, scene_clips, style)
+            if clip is None:
+                return None, tracer.export_events()
+            
+            processor.write_clip(clip, segment_file, style, encoder)
+            return (segment_file, clip.duration), tracer.export_events()
+        except Exception as e:
+            print(f"  Error processing {name}: {str(e)}")
+            return None, tracer.export_events()
+
+
+def _asset_fingerprint(path: str) -> Tuple[int, float]:
+    """Cheap change detector for an asset file referenced by a scene."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime
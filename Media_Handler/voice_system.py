@@ -1,13 +1,20 @@
 """Voice generation system with local and cloud TTS support."""
 import os
-import tempfile
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import pyttsx3
 import requests
-from pydub import AudioSegment
 import hashlib
-import re
+from Media_Handler.audio_timeline import narration_timeline
+from utils.cache_store import CacheStore
+from utils.config_loader import load_config
+from utils.tracing import get_tracer, isolated_trace
+
+# Bump when synthesis output changes, so cached narration is regenerated
+TTS_CACHE_VERSION = 2
 
 @dataclass
 class VoiceConfig:
@@ -21,13 +28,34 @@ class VoiceConfig:
 
 class VoiceSystem:
     """Voice generation system."""
-    def __init__(self):
+    # ElevenLabs synthesis settings; part of the TTS cache key
+    ELEVENLABS_MODEL = "eleven_monolingual_v1"
+    ELEVENLABS_VOICE_SETTINGS = {
+        "stability": 0.75,
+        "similarity_boost": 0.75
+    }
+
+    def __init__(self, config: Optional[Dict] = None):
+        self.config = config if config else load_config()
+        # Synthesized narration keyed by text, voice and engine settings
+        self.cache = CacheStore.from_config(self.config, "tts", share=0.1)
+        # Concurrent synthesis: threads for HTTP engines, processes for pyttsx3
+        performance = self.config.get('performance', {})
+        self.tts_workers = max(int(performance.get('tts_workers', 4)), 1)
+        self.local_tts_processes = max(int(performance.get('local_tts_processes', 2)), 1)
+        # pyttsx3 engines and the cache index are not thread-safe
+        self.local_lock = threading.Lock()
+        self.cache_lock = threading.Lock()
+
         # Initialize local TTS engine
         self.local_engine = pyttsx3.init()
+        engine_voices = self.local_engine.getProperty('voices')
+        # Local synthesis always uses the engine's first voice
+        self.local_voice = engine_voices[0].id if engine_voices else None
         
         # Configure local voices
         self.local_voices = {}
-        for voice in self.local_engine.getProperty('voices'):
+        for voice in engine_voices:
             try:
                 # Use a simple name for local voices
                 voice_id = f"local_{len(self.local_voices) + 1}"
@@ -98,6 +126,26 @@ class VoiceSystem:
     
     def generate_voice(self, text: str, voice_id: str) -> str:
         """Generate voice audio for text."""
+        engine = self.voices[voice_id].engine if voice_id in self.voices else "unknown"
+        with get_tracer().span("tts", voice_id=voice_id, engine=engine, characters=len(text or "")):
+            return self._generate_voice(text, voice_id)
+
+    def _engine_settings(self, voice: VoiceConfig) -> Tuple[Optional[str], Dict]:
+        """Model and settings that shape a voice's audio."""
+        if voice.engine == "elevenlabs":
+            return self.ELEVENLABS_MODEL, self.ELEVENLABS_VOICE_SETTINGS
+        return self.local_voice, {
+            "rate": self.local_engine.getProperty('rate'),
+            "volume": self.local_engine.getProperty('volume')
+        }
+
+    def tts_key(self, text: str, voice_id: str) -> str:
+        """Content key for the narration of text in a voice."""
+        voice = self.voices[voice_id]
+        model_id, voice_settings = self._engine_settings(voice)
+        return CacheStore.make_key("tts", TTS_CACHE_VERSION, text, voice_id, voice.engine, model_id, voice_settings)
+
+    def _generate_voice(self, text: str, voice_id: str) -> str:
         if not text or not voice_id:
             raise ValueError("Text and voice_id are required")
         
@@ -105,28 +153,21 @@ class VoiceSystem:
             raise ValueError(f"Unknown voice: {voice_id}")
         
         voice = self.voices[voice_id]
+        key = self.tts_key(text, voice_id)
+        if self.cache:
+            with self.cache_lock:
+                cached = self.cache.get(key, self._audio_ext(voice))
+            if cached:
+                get_tracer().count("tts_cache_hits")
+                return cached
+            get_tracer().count("tts_cache_misses")
         
-        # Create a safe filename using hash of text
-        text_hash = hashlib.md5(text.encode()).hexdigest()[:10]
-        output_file = os.path.join("output_manager", "audio", f"{voice_id}_{text_hash}.mp3")
+        output_file = self._output_file(key, voice_id)
         
         try:
             if voice.engine == "local":
-                # Use local TTS
-                temp_wav = os.path.join("output_manager", "temp", f"{voice_id}_{text_hash}.wav")
-                
-                # Set voice and save to WAV first
-                self.local_engine.setProperty('voice', next(v.id for v in self.local_engine.getProperty('voices')))
-                self.local_engine.save_to_file(text, temp_wav)
-                self.local_engine.runAndWait()
-                
-                # Convert WAV to MP3 using pydub
-                if os.path.exists(temp_wav):
-                    audio = AudioSegment.from_wav(temp_wav)
-                    audio.export(output_file, format="mp3")
-                    os.remove(temp_wav)  # Clean up temp file
-                else:
-                    raise Exception("Failed to generate WAV file")
+                with self.local_lock:
+                    _synthesize_local(self.local_engine, text, self.local_voice, output_file)
                 
             elif voice.engine == "elevenlabs":
                 # Use ElevenLabs API
@@ -142,20 +183,21 @@ class VoiceSystem:
                 }
                 data = {
                     "text": text,
-                    "model_id": "eleven_monolingual_v1",
-                    "voice_settings": {
-                        "stability": 0.75,
-                        "similarity_boost": 0.75
-                    }
+                    "model_id": self.ELEVENLABS_MODEL,
+                    "voice_settings": self.ELEVENLABS_VOICE_SETTINGS
                 }
                 
                 response = requests.post(url, json=data, headers=headers)
+                get_tracer().count("tts_characters_billed", len(text))
                 if response.status_code == 200:
                     with open(output_file, 'wb') as f:
                         f.write(response.content)
                 else:
                     raise Exception(f"ElevenLabs API error: {response.text}")
             
+            if self.cache:
+                with self.cache_lock:
+                    return self.cache.put(key, output_file, self._audio_ext(voice), move=True)
             return output_file
             
         except Exception as e:
@@ -165,9 +207,108 @@ class VoiceSystem:
                 print("Falling back to local TTS...")
                 return self.generate_voice(text, list(self.local_voices.keys())[0])
             raise
+
+    def _audio_ext(self, voice: VoiceConfig) -> str:
+        """File type narration is kept in: local engines write lossless WAV, ElevenLabs returns MP3."""
+        return ".wav" if voice.engine == "local" else ".mp3"
+
+    def _output_file(self, key: str, voice_id: str) -> str:
+        """Where new audio for a key is written: next to its cache entry, or the audio folder when caching is off."""
+        ext = self._audio_ext(self.voices[voice_id])
+        if self.cache:
+            return self.cache.path_for(key, f".{os.getpid()}{ext}")
+        return os.path.join("output_manager", "audio", f"{voice_id}_{key[:16]}{ext}")
+
+    def generate_voices(self, texts: List[str], voice_id: str) -> List[Optional[str]]:
+        """Generate audio for many texts concurrently, in the order given.
+        
+        Cached and repeated texts are synthesized at most once. ElevenLabs
+        requests run on up to ``performance.tts_workers`` threads; local
+        voices are synthesized in up to ``performance.local_tts_processes``
+        worker processes, each with its own pyttsx3 engine. Texts that fail
+        get None.
+        """
+        if voice_id not in self.voices:
+            raise ValueError(f"Unknown voice: {voice_id}")
+        voice = self.voices[voice_id]
+        keys = [self.tts_key(text, voice_id) for text in texts]
+        
+        # Files stored in this call must survive its later puts, even past the size limit
+        needed = list(keys)
+        if voice.engine != "local":
+            # Failed requests fall back to the first local voice
+            fallback = list(self.local_voices.keys())[0]
+            needed += [self.tts_key(text, fallback) for text in texts]
+        with self.cache.pin(needed) if self.cache else nullcontext():
+            # Unique texts still to synthesize, in first-seen order
+            results: Dict[str, Optional[str]] = {}
+            pending: Dict[str, str] = {}
+            for key, text in zip(keys, texts):
+                if key in results or key in pending:
+                    continue
+                cached = self.cache.get(key, self._audio_ext(voice)) if self.cache else None
+                if cached:
+                    get_tracer().count("tts_cache_hits")
+                    results[key] = cached
+                else:
+                    pending[key] = text
+            
+            if voice.engine == "local" and self.local_tts_processes > 1 and len(pending) > 1:
+                results.update(self._generate_local_parallel(pending, voice_id))
+            elif pending:
+                workers = min(self.tts_workers if voice.engine != "local" else 1, len(pending))
+                print(f"Synthesizing {len(pending)} voice-over(s) with {workers} thread(s)")
+                
+                def generate(text):
+                    try:
+                        return self.generate_voice(text, voice_id)
+                    except Exception as e:
+                        print(f"Error generating voice: {str(e)}")
+                        return None
+                
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results.update(zip(pending, executor.map(generate, pending.values())))
+        
+        return [results[key] for key in keys]
+
+    def _generate_local_parallel(self, pending: Dict[str, str], voice_id: str) -> Dict[str, Optional[str]]:
+        """Synthesize texts with the local engine in a pool of worker processes."""
+        workers = min(self.local_tts_processes, len(pending))
+        print(f"Synthesizing {len(pending)} voice-over(s) with {workers} local TTS process(es)")
+        jobs = [
+            (text, self.local_voice, self._output_file(key, voice_id))
+            for key, text in pending.items()
+        ]
+        get_tracer().count("tts_cache_misses", len(jobs))
+        with get_tracer().span("tts", voice_id=voice_id, engine="local", characters=sum(map(len, pending.values()))):
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map() keeps results in submission order
+                outputs = list(executor.map(_local_tts_job, jobs))
+        
+        results = {}
+        tracer = get_tracer()
+        for key, (output_file, events) in zip(pending, outputs):
+            tracer.merge(events)
+            if output_file and self.cache:
+                output_file = self.cache.put(key, output_file, self._audio_ext(self.voices[voice_id]), move=True)
+            results[key] = output_file
+        return results
     
-    def generate_voice_for_scenes(self, scenes: List[Dict], voice_id: str) -> str:
-        """Generate voice audio for multiple scenes."""
+    def generate_voice_for_scenes(self, scenes: List[Dict], voice_id: str,
+                                  scene_starts: Optional[List[float]] = None, gap: float = 0.5) -> str:
+        """Generate one voice-over track for multiple scenes.
+        
+        With ``scene_starts`` (seconds, one per scene, e.g. from
+        ``VideoProcessor.scene_starts``) each scene's narration starts with
+        its scene, or when the previous narration ends if that runs past the
+        scene start; otherwise narrations follow each other ``gap`` seconds
+        apart.
+        """
+        scene_files = self.generate_scene_voices(scenes, voice_id)
+        return self.combine_scene_voices(scenes, scene_files, voice_id, scene_starts, gap)
+
+    def generate_scene_voices(self, scenes: List[Dict], voice_id: str) -> List[Optional[str]]:
+        """Generate each scene's narration, concurrently; one file (or None) per scene, in order."""
         if not scenes:
             raise ValueError("No scenes provided")
         
@@ -175,45 +316,48 @@ class VoiceSystem:
         temp_dir = "output_manager/temp"
         os.makedirs(temp_dir, exist_ok=True)
         
-        # Generate audio for each scene
-        scene_files = []
-        for i, scene in enumerate(scenes):
-            if scene.get('voiceover'):
-                try:
-                    # Generate audio for scene
-                    scene_file = self.generate_voice(scene['voiceover'], voice_id)
-                    if os.path.exists(scene_file):  # Only add if file was created
-                        scene_files.append(scene_file)
-                except Exception as e:
-                    print(f"Error generating voice for scene {i + 1}: {str(e)}")
-                    continue
+        scene_files: List[Optional[str]] = [None] * len(scenes)
+        voiced = [(i, scene['voiceover']) for i, scene in enumerate(scenes) if scene.get('voiceover')]
+        try:
+            with get_tracer().span("tts_scenes", scenes=len(voiced)):
+                generated = self.generate_voices([text for _, text in voiced], voice_id)
+        finally:
+            if self.cache:
+                # Persist access times so eviction keeps recently used narration
+                self.cache.flush()
+        for (i, _), scene_file in zip(voiced, generated):
+            if scene_file and os.path.exists(scene_file):  # Only add if file was created
+                scene_files[i] = scene_file
+            else:
+                print(f"Error generating voice for scene {i + 1}")
+        return scene_files
+
+    def combine_scene_voices(self, scenes: List[Dict], scene_files: List[Optional[str]], voice_id: str,
+                             scene_starts: Optional[List[float]] = None, gap: float = 0.5) -> str:
+        """Mix per-scene narration (from ``generate_scene_voices``) into one track.
         
-        if not scene_files:
+        Narrations are placed as described in ``narration_timeline`` and never overlap.
+        """
+        voiced = [(i, file) for i, file in enumerate(scene_files) if file]
+        if not voiced:
             raise ValueError("No voice-over content generated")
         
         # Combine all scene audio
-        text_hash = hashlib.md5(''.join(str(s) for s in scenes).encode()).hexdigest()[:10]
-        output_file = os.path.join("output_manager", "audio", f"combined_{voice_id}_{text_hash}.mp3")
+        text_hash = hashlib.md5((''.join(str(s) for s in scenes) + str(scene_starts)).encode()).hexdigest()[:10]
+        # Kept as PCM; the only lossy encode is to AAC when the video is muxed
+        output_file = os.path.join("output_manager", "audio", f"combined_{voice_id}_{text_hash}.wav")
         
         try:
-            # Load first file
-            combined = AudioSegment.from_mp3(scene_files[0])
-            
-            # Add silence between scenes and append remaining files
-            for file in scene_files[1:]:
-                silence = AudioSegment.silent(duration=500)  # 0.5 seconds
-                scene_audio = AudioSegment.from_mp3(file)
-                combined = combined + silence + scene_audio
-            
-            # Export combined audio
-            combined.export(output_file, format="mp3")
+            with get_tracer().span("combine_audio", files=len(voiced)):
+                # Export combined audio
+                narration_timeline(scene_files, scene_starts, gap).write(output_file)
             
             return output_file
             
         except Exception as e:
             print(f"Error combining audio: {str(e)}")
             # Return first scene audio as fallback
-            return scene_files[0] if scene_files else None
+            return voiced[0][1]
     
     def preview_voice(self, voice_id: str, text: Optional[str] = None) -> str:
         """Generate a voice preview."""
@@ -225,6 +369,40 @@ class VoiceSystem:
         
         return self.generate_voice(text, voice_id)
 
+def _synthesize_local(engine, text: str, engine_voice: Optional[str], output_file: str):
+    """Synthesize text with a pyttsx3 engine straight to a WAV file."""
+    if engine_voice:
+        engine.setProperty('voice', engine_voice)
+    engine.save_to_file(text, output_file)
+    engine.runAndWait()
+    if not os.path.exists(output_file):
+        raise Exception("Failed to generate WAV file")
+
+
+# pyttsx3 engine of a local TTS worker process, created on first use
+_worker_engine = None
+
+
+def _local_tts_job(job: Tuple) -> Tuple[Optional[str], List[Dict]]:
+    """Synthesize one text with the local engine (process pool worker).
+    
+    Returns the output path (None on failure) along with the trace events
+    recorded while synthesizing, for the parent job's trace.
+    """
+    global _worker_engine
+    text, engine_voice, output_file = job
+    with isolated_trace("local tts") as tracer:
+        try:
+            if _worker_engine is None:
+                _worker_engine = pyttsx3.init()
+            with tracer.span("tts", engine="local", characters=len(text)):
+                _synthesize_local(_worker_engine, text, engine_voice, output_file)
+            return output_file, tracer.export_events()
+        except Exception as e:
+            print(f"Error generating voice: {str(e)}")
+            return None, tracer.export_events()
+
+
 if __name__ == "__main__":
     # Example usage
     voice_system = VoiceSystem()
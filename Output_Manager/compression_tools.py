@@ -0,0 +1,102 @@
+"""Encoder profiles mapping quality settings to x264 parameters."""
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+# CRF per quality level (lower is better quality, larger files)
+QUALITY_CRF = {
+    "low": 28,
+    "medium": 23,
+    "high": 20
+}
+
+
+@dataclass
+class EncoderProfile:
+    """x264 settings for one kind of render job."""
+    name: str
+    preset: str = "medium"
+    crf: Optional[int] = 23
+    bitrate: Optional[str] = None  # Average bitrate, used when crf is None
+    maxrate: Optional[str] = None  # Caps CRF output (constrained quality)
+    tune: Optional[str] = None
+    gop_seconds: float = 2.0
+    threads: int = 0  # 0 = let x264 decide
+
+    def ffmpeg_params(self, fps: float) -> List[str]:
+        """Get ffmpeg output arguments (everything except codec and preset)."""
+        params = []
+        if self.crf is not None:
+            params += ['-crf', str(self.crf)]
+            if self.maxrate:
+                params += ['-maxrate', self.maxrate, '-bufsize', _double_rate(self.maxrate)]
+        elif self.bitrate:
+            params += ['-b:v', self.bitrate]
+        if self.tune:
+            params += ['-tune', self.tune]
+        if self.gop_seconds:
+            params += ['-g', str(max(int(round(fps * self.gop_seconds)), 1))]
+        if self.threads:
+            params += ['-threads', str(self.threads)]
+        return params
+
+
+PROFILE_NAMES = ("draft", "preview", "production", "archive")
+
+
+def get_encoder_profile(name: str, config: Optional[Dict] = None, threads: int = 0) -> EncoderProfile:
+    """Build a named encoder profile from config.
+
+    - draft: fastest encode, low quality, for checking content
+    - preview: fast encode at ``performance.preview_quality``
+    - production: ``media.quality`` CRF capped at ``media.bitrate``
+    - archive: slow preset, near-transparent quality
+    """
+    config = config or {}
+    media = config.get('media', {})
+    performance = config.get('performance', {})
+    tune = media.get('tune') or None
+
+    profiles = {
+        "draft": EncoderProfile(
+            name="draft",
+            preset="ultrafast",
+            crf=32,
+            tune=tune,
+            gop_seconds=10.0
+        ),
+        "preview": EncoderProfile(
+            name="preview",
+            preset="veryfast",
+            crf=QUALITY_CRF.get(performance.get('preview_quality', "medium"), 23) + 4,
+            tune=tune,
+            gop_seconds=5.0
+        ),
+        "production": EncoderProfile(
+            name="production",
+            preset="medium",
+            crf=QUALITY_CRF.get(media.get('quality', "high"), 20),
+            maxrate=media.get('bitrate'),
+            tune=tune,
+            gop_seconds=2.0
+        ),
+        "archive": EncoderProfile(
+            name="archive",
+            preset="slow",
+            crf=16,
+            tune=tune,
+            gop_seconds=2.0
+        )
+    }
+
+    if name not in profiles:
+        print(f"Warning: Unknown encoder profile '{name}', falling back to production")
+        name = "production"
+    return replace(profiles[name], threads=threads)
+
+
+def _double_rate(rate: str) -> str:
+    """Double a bitrate string like "5000k" for the VBV buffer size."""
+    rate = str(rate).strip()
+    suffix = rate[-1] if rate[-1:].isalpha() else ""
+    value = float(rate[:-1] if suffix else rate)
+    return f"{int(value * 2)}{suffix}"
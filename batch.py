@@ -0,0 +1,207 @@
+"""Non-interactive batch rendering of many scripts.
+
+Usage:
+    python batch.py scripts/                 # every *.txt script in a directory
+    python batch.py jobs.jsonl --workers 4   # one JSON job per line
+
+Manifest lines look like:
+    {"id": "promo-1", "script": "scripts/promo.txt", "voice_id": "local_1", "style": "tech"}
+    {"template": "explainer", "context": {"topic": "DNS", ...}, "style": "modern"}
+
+``script`` may be a file path or the script text itself. Jobs without a
+script are generated from ``template`` and ``context``.
+"""
+import argparse
+import copy
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from utils.config_loader import load_config
+from utils.tracing import start_trace, trace_path
+
+
+def load_jobs(source: str, defaults: Dict) -> List[Dict]:
+    """Load jobs from a directory of scripts or a JSONL manifest."""
+    jobs = []
+    if os.path.isdir(source):
+        for filename in sorted(os.listdir(source)):
+            if filename.lower().endswith('.txt'):
+                jobs.append({
+                    'id': os.path.splitext(filename)[0],
+                    'script': os.path.join(source, filename)
+                })
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    job = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{source}:{line_number}: invalid JSON: {e}")
+                job.setdefault('id', f"job_{line_number}")
+                jobs.append(job)
+
+    return [{**defaults, **job} for job in jobs]
+
+
+def _load_script(job: Dict) -> str:
+    """Get script text for a job from a file, inline text or a template."""
+    script = job.get('script')
+    if script:
+        if os.path.isfile(script):
+            with open(script, 'r', encoding='utf-8') as f:
+                return f.read()
+        return script
+
+    if job.get('template'):
+        from Content_Engine.api_generator import ScriptGenerator
+        return ScriptGenerator().generate_script(job['template'], job.get('context', {}))
+
+    raise ValueError("Job needs a 'script' or a 'template'")
+
+
+def run_job(job: Dict, config: Optional[Dict] = None) -> Dict:
+    """Render a single job and return its result summary."""
+    from main import parse_manual_script, prepare_scenes
+    from Media_Handler.video_processor import VideoProcessor, VideoStyle
+
+    started = time.time()
+    tracer = start_trace(str(job.get('id')))
+    result = {
+        'id': job.get('id'),
+        'status': 'failed',
+        'output': None,
+        'audio': None,
+        'scenes': 0,
+        'error': None,
+        'trace': None
+    }
+
+    try:
+        script_text = _load_script(job)
+        with tracer.span("parse_script"):
+            scenes = parse_manual_script(script_text)
+        if not scenes:
+            raise ValueError("No valid scenes found in script")
+        prepare_scenes(scenes)
+        result['scenes'] = len(scenes)
+
+        processor = VideoProcessor(config)
+
+        # Narration is optional; a failed voice-over still produces a silent video
+        audio_file = ""
+        if job.get('voice_id') and not job.get('no_audio'):
+            try:
+                from Media_Handler.voice_system import VoiceSystem
+                style = processor.apply_config_style(VideoStyle.get_style(job.get('style', "modern")))
+                voice_system = VoiceSystem(config)
+                scene_files = voice_system.generate_scene_voices(scenes, job['voice_id'])
+                if processor.auto_timing:
+                    # Fit scenes to their narration before anything is rendered
+                    processor.time_scenes_to_audio(scenes, scene_files, style)
+                audio_file = voice_system.combine_scene_voices(
+                    scenes, scene_files, job['voice_id'], scene_starts=processor.scene_starts(scenes, style)
+                ) or ""
+                result['audio'] = audio_file
+            except Exception as e:
+                result['error'] = f"Voice-over failed: {str(e)}"
+
+        output_file = processor.process_video(
+            scenes,
+            audio_file,
+            job.get('style', "modern"),
+            profile=job.get('profile'),
+            output_name=f"{job.get('id')}_{int(started)}"
+        )
+        if output_file:
+            result['status'] = 'ok'
+            result['output'] = output_file
+        else:
+            result['error'] = result['error'] or "Video generation failed"
+
+    except Exception as e:
+        result['error'] = str(e)
+        traceback.print_exc()
+
+    result['seconds'] = round(time.time() - started, 3)
+    try:
+        result['trace'] = tracer.write(trace_path(config or load_config(), str(job.get('id'))))
+        result['stages'] = tracer.summary()['stages']
+    except OSError as e:
+        print(f"Warning: Could not write trace: {str(e)}")
+    return result
+
+
+def _run_job_entry(args) -> Dict:
+    """Process pool entry point."""
+    job, config = args
+    return run_job(job, config)
+
+
+def run_batch(jobs: List[Dict], workers: int = 1, config: Optional[Dict] = None) -> List[Dict]:
+    """Render jobs with up to ``workers`` running at once, keeping job order in results."""
+    config = config if config else load_config()
+    if workers > 1:
+        # Jobs already use every worker; don't also fan out scenes inside each job
+        config = copy.deepcopy(config)
+        config.setdefault('performance', {})['parallel_processing'] = False
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_run_job_entry, [(job, config) for job in jobs]))
+    return [run_job(job, config) for job in jobs]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Render many scripts without prompts.")
+    parser.add_argument("source", help="Directory of .txt scripts or a .jsonl manifest")
+    parser.add_argument("--workers", type=int, default=1, help="Jobs to render at once")
+    parser.add_argument("--voice", dest="voice_id", help="Default voice id (omit for silent videos)")
+    parser.add_argument("--style", default="modern", help="Default video style")
+    parser.add_argument("--profile", help="Default encoder profile")
+    parser.add_argument("--no-audio", action="store_true", help="Skip voice-over for every job")
+    parser.add_argument("--summary", help="Where to write the JSON result summary")
+    args = parser.parse_args(argv)
+
+    config = load_config()
+    defaults = {'style': args.style, 'no_audio': args.no_audio}
+    if args.voice_id:
+        defaults['voice_id'] = args.voice_id
+    if args.profile:
+        defaults['profile'] = args.profile
+
+    jobs = load_jobs(args.source, defaults)
+    if not jobs:
+        print(f"No jobs found in {args.source}")
+        return 1
+
+    print(f"Rendering {len(jobs)} jobs with {args.workers} worker(s)")
+    started = time.time()
+    results = run_batch(jobs, args.workers, config)
+
+    summary = {
+        'source': args.source,
+        'jobs': len(results),
+        'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+        'failed': sum(1 for r in results if r['status'] != 'ok'),
+        'seconds': round(time.time() - started, 3),
+        'results': results
+    }
+    summary_file = args.summary or os.path.join(
+        config['project']['output_dir'], f"batch_summary_{int(started)}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(summary_file)), exist_ok=True)
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\n{summary['succeeded']} succeeded, {summary['failed']} failed")
+    print(f"Summary written to {summary_file}")
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,270 @@
+"""Rendering benchmark with synthetic scripts and per-stage timings.
+
+Usage:
+    python benchmark.py                                   # default matrix
+    python benchmark.py --scenes 10 40 --density low high \\
+        --resolution 1280x720 1920x1080 --transitions none fade --output bench.json
+
+Each case generates a script in the parse_manual_script format and times
+parse, TTS (with a local stand-in engine, so results don't depend on a
+speech backend or network, followed by the real scene timing and narration
+mix), composition (every frame drawn, nothing encoded) and a full
+``process_video`` render with a cold segment cache, then a re-render served
+from that cache. The render's own trace breaks it down into scene builds,
+encodes and the final mux. Each case runs in a fresh process so its peak
+memory is its own. Results are printed and written as JSON so runs can be
+compared across commits.
+"""
+import argparse
+import copy
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from utils.config_loader import load_config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Words of on-screen text per scene for each density level
+TEXT_DENSITY = {
+    "low": 1,
+    "medium": 3,
+    "high": 6
+}
+
+WORDS = (
+    "video automation pipeline renders scenes with narration text and "
+    "transitions for every script in the nightly batch using templates"
+).split()
+
+
+def generate_script(scene_count: int, density: str, scene_seconds: int = 3) -> str:
+    """Generate a synthetic script in the manual script format."""
+    lines = []
+    items = TEXT_DENSITY.get(density, 3)
+    for i in range(scene_count):
+        start = i * scene_seconds
+        lines.append(f"[Scene {i + 1}] - {start} to {start + scene_seconds}")
+        lines.append(f"Visual: Synthetic visual {i + 1}")
+        words = [WORDS[(i + j) % len(WORDS)] for j in range(8 + items * 4)]
+        lines.append(f"Voice-over: \"{' '.join(words).capitalize()}.\"")
+        lines.append("")
+        texts = [
+            ' '.join(WORDS[(i + j + k) % len(WORDS)] for k in range(3 + j % 4)).title()
+            for j in range(items)
+        ]
+        lines.append(f"On-screen text: {' | '.join(texts)}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+class StandInTTS:
+    """Local stand-in for a TTS engine that writes tone WAVs sized by word count."""
+    def __init__(self, output_dir: str, words_per_second: float = 2.5, sample_rate: int = 22050):
+        self.output_dir = output_dir
+        self.words_per_second = words_per_second
+        self.sample_rate = sample_rate
+        os.makedirs(output_dir, exist_ok=True)
+
+    def generate_voice(self, text: str, index: int) -> str:
+        """Synthesize a placeholder narration file for text."""
+        duration = max(len(text.split()) / self.words_per_second, 0.5)
+        t = np.arange(int(duration * self.sample_rate)) / self.sample_rate
+        samples = (np.sin(2 * np.pi * 220 * t) * 3000).astype(np.int16)
+        path = os.path.join(self.output_dir, f"scene_{index:04d}.wav")
+        with wave.open(path, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(self.sample_rate)
+            f.writeframes(samples.tobytes())
+        return path
+
+
+def peak_rss_mb() -> Dict[str, Optional[float]]:
+    """Peak resident set size of this process and its children, in MB.
+
+    These are high-water marks for the process lifetime, so cases are run
+    in a process of their own (see ``run_case_isolated``).
+    """
+    if resource is None:
+        return {'self': None, 'children': None}
+    # ru_maxrss is KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        'self': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+        'children': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1)
+    }
+
+
+def run_case(case: Dict, config: Dict, work_dir: str) -> Dict:
+    """Run one benchmark case and return its timings."""
+    from main import parse_manual_script, prepare_scenes
+    from Media_Handler.audio_timeline import narration_timeline
+    from Media_Handler.video_processor import VideoProcessor, VideoStyle
+    from utils.tracing import start_trace
+
+    def make_processor(cache_name: str) -> VideoProcessor:
+        # Cold caches of its own, so the render takes the production segment path
+        stage_config = copy.deepcopy(config)
+        stage_config.setdefault('project', {})['cache_dir'] = os.path.join(work_dir, cache_name)
+        processor = VideoProcessor(stage_config, encoder_profile=case['profile'])
+        processor.output_dir = work_dir
+        return processor
+
+    stages = {}
+    processor = make_processor("cache")
+    width, height = case['resolution']
+    style = processor.apply_config_style(VideoStyle.get_style("modern"))
+    scale = width / style.resolution[0]
+
+    # Parse
+    started = time.perf_counter()
+    script = generate_script(case['scenes'], case['density'])
+    scenes = prepare_scenes(parse_manual_script(script))
+    for scene in scenes:
+        scene['transitions'] = [case['transition']]
+    stages['parse'] = time.perf_counter() - started
+
+    # TTS: stand-in synthesis, then timing and mixing as in a real voice-over
+    started = time.perf_counter()
+    tts = StandInTTS(os.path.join(work_dir, "audio"))
+    scene_files = [
+        tts.generate_voice(scene['voiceover'], i) if scene.get('voiceover') else None
+        for i, scene in enumerate(scenes)
+    ]
+    if processor.auto_timing:
+        processor.time_scenes_to_audio(scenes, scene_files, style)
+    audio_file = narration_timeline(scene_files, processor.scene_starts(scenes, style)).write(
+        os.path.join(work_dir, "narration.wav")
+    )
+    stages['tts'] = time.perf_counter() - started
+
+    # Composition: draw every frame without encoding, since clips composite lazily
+    composer = make_processor("composition_cache")
+    started = time.perf_counter()
+    composer.plan_text(scenes, style)
+    frame_style = style.scaled(scale) if scale != 1.0 else style
+    timeline = composer.build_timeline(scenes, frame_style)
+    frames = int(round(timeline.duration * frame_style.fps))
+    for index in range(frames):
+        timeline.get_frame(index / frame_style.fps)
+    stages['composition'] = time.perf_counter() - started
+
+    # Render: process_video end to end (segments, pool, encode, mux), traced
+    render_stages = {}
+    for stage in ("render", "rerender"):
+        tracer = start_trace(stage)
+        started = time.perf_counter()
+        output_file = processor.process_video(
+            scenes, audio_file, "modern", profile=case['profile'], scale=scale, output_name="benchmark"
+        )
+        stages[stage] = time.perf_counter() - started
+        if not output_file:
+            raise RuntimeError(f"Benchmark {stage} failed")
+        render_stages[stage] = {name: stage_totals['seconds'] for name, stage_totals in tracer.summary()['stages'].items()}
+
+    return {
+        'case': {**case, 'resolution': f"{width}x{height}"},
+        'frames': frames,
+        'video_seconds': round(timeline.duration, 3),
+        'audio_files': sum(1 for file in scene_files if file),
+        'output_bytes': os.path.getsize(output_file),
+        'stages': {name: round(seconds, 4) for name, seconds in stages.items()},
+        'render_stages': render_stages,
+        'wall_seconds': round(sum(stages.values()), 4),
+        'frames_per_second': round(frames / stages['render'], 2) if stages['render'] else None,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def run_case_isolated(case: Dict, config: Dict, work_dir: str) -> Dict:
+    """Run a case in a fresh process so peak memory isn't carried over from earlier cases."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_case, case, config, work_dir).result()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _parse_resolution(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the rendering pipeline.")
+    parser.add_argument("--scenes", type=int, nargs='+', default=[5, 20])
+    parser.add_argument("--density", nargs='+', default=["low", "high"], choices=sorted(TEXT_DENSITY))
+    parser.add_argument("--resolution", type=_parse_resolution, nargs='+', default=[(1920, 1080)])
+    parser.add_argument("--transitions", nargs='+', default=["none"])
+    parser.add_argument("--profile", default="production", help="Encoder profile to benchmark")
+    parser.add_argument("--auto-timing", action="store_true",
+                        help="Time scenes from narration length instead of the scripted scene lengths")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args(argv)
+
+    # Each case starts with empty caches under its work directory (see run_case)
+    config = copy.deepcopy(load_config())
+    config.setdefault('sources', {}).setdefault('cache', {})['enabled'] = True
+    config.setdefault('scene', {})['auto_timing'] = args.auto_timing
+
+    results = []
+    for scenes, density, resolution, transition in itertools.product(
+        args.scenes, args.density, args.resolution, args.transitions
+    ):
+        case = {
+            'scenes': scenes,
+            'density': density,
+            'resolution': resolution,
+            'transition': transition,
+            'profile': args.profile
+        }
+        work_dir = tempfile.mkdtemp(prefix="benchmark_")
+        try:
+            result = run_case_isolated(case, config, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        results.append(result)
+        print(f"{scenes:>4} scenes  {density:<6} {result['case']['resolution']:<10} {transition:<6} "
+              f"{result['wall_seconds']:>8.2f}s  {result['frames_per_second']} fps  "
+              + "  ".join(f"{k}={v:.2f}s" for k, v in result['stages'].items()))
+
+    report = {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,8 @@ import json
 from Content_Engine.api_generator import ScriptGenerator
 from Media_Handler.voice_system import VoiceSystem
 from Media_Handler.video_processor import VideoProcessor
+from utils.config_loader import load_config
+from utils.tracing import start_trace, trace_path
 
 def parse_manual_script(script_text: str) -> List[Dict]:
     """Parse manually entered script into scenes."""
@@ -91,6 +93,25 @@ def parse_manual_script(script_text: str) -> List[Dict]:
     
     return scenes
 
+def prepare_scenes(scenes: List[Dict]) -> List[Dict]:
+    """Fill in on-screen text and timing for scenes that don't specify them."""
+    for i, scene in enumerate(scenes):
+        if not scene.get('text'):
+            # If no specific text is set, use voiceover as text
+            if scene.get('voiceover'):
+                scenes[i]['text'] = [scene['voiceover']]
+            else:
+                # Default text if nothing else is available
+                scenes[i]['text'] = [f"Scene {i+1}: {scene.get('name', 'Untitled')}"]
+        
+        # Ensure timing is properly formatted
+        if not scene.get('timing') or 'to' not in scene.get('timing', ''):
+            # Calculate a default timing if none exists
+            start_time = i * 5  # 5 seconds per scene as default
+            end_time = start_time + 5
+            scenes[i]['timing'] = f"{start_time} to {end_time}"
+    return scenes
+
 def preview_script(scenes: List[Dict]) -> bool:
     """Show script preview and get user confirmation."""
     print("\n=== Script Preview ===")
@@ -184,6 +205,7 @@ def select_style() -> str:
 
 def main():
     """Main function."""
+    tracer = start_trace("interactive")
     print("\n=== Script Generation ===")
     print("1. Generate from template")
     print("2. Manual input\n")
@@ -230,8 +252,10 @@ def main():
             context[field['id']] = value
         
         # Generate script
-        script_text = script_generator.generate_script(template['id'], context)
-        scenes = parse_manual_script(script_text)
+        with tracer.span("generate_script", template=template['id']):
+            script_text = script_generator.generate_script(template['id'], context)
+        with tracer.span("parse_script"):
+            scenes = parse_manual_script(script_text)
         
     else:
         # Manual input
@@ -248,7 +272,8 @@ def main():
             lines.append(line)
         
         script_text = "\n".join(lines)
-        scenes = parse_manual_script(script_text)
+        with tracer.span("parse_script"):
+            scenes = parse_manual_script(script_text)
     
     # Preview and confirm
     if not scenes:
@@ -268,22 +293,7 @@ def main():
     # Generate video
     print("\nGenerating video...")
     try:
-        # Make sure there's text in every scene
-        for i, scene in enumerate(scenes):
-            if not scene.get('text'):
-                # If no specific text is set, use voiceover as text
-                if scene.get('voiceover'):
-                    scenes[i]['text'] = [scene['voiceover']]
-                else:
-                    # Default text if nothing else is available
-                    scenes[i]['text'] = [f"Scene {i+1}: {scene.get('name', 'Untitled')}"]
-            
-            # Ensure timing is properly formatted
-            if not scene.get('timing') or 'to' not in scene.get('timing', ''):
-                # Calculate a default timing if none exists
-                start_time = i * 5  # 5 seconds per scene as default
-                end_time = start_time + 5
-                scenes[i]['timing'] = f"{start_time} to {end_time}"
+        prepare_scenes(scenes)
         
         # Generate voice audio (optional for now)
         # audio_file = voice_system.generate_voice_for_scenes(scenes, voice_id)
@@ -297,6 +307,9 @@ def main():
         else:
             print("\nVideo generation failed.")
         
+        trace_file = tracer.write(trace_path(load_config(), "interactive"))
+        print(f"Timing report: {trace_file}")
+        
     except Exception as e:
         import traceback
         print(f"Error generating video: {str(e)}")
@@ -8,8 +8,10 @@ import os
 import sys
 import time
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 from moviepy.editor import ColorClip, ImageClip, CompositeVideoClip, concatenate_videoclips
+from Media_Handler.font_registry import get_font_registry
+from utils.config_loader import load_config
 
 # =========================================================
 # STEP 1: Create the output directory
@@ -27,11 +29,8 @@ def create_text_image(text, font_size=60, width=1280, height=720, bg_color=(0,0,
     image = Image.new('RGBA', (width, height), bg_color)
     draw = ImageDraw.Draw(image)
     
-    # Use a guaranteed system font
-    try:
-        font = ImageFont.truetype("C:\\Windows\\Fonts\\Arial.ttf", font_size)
-    except:
-        font = ImageFont.load_default()
+    # Resolve Arial (or a fallback) from project and system font directories
+    font = get_font_registry(load_config()).get_font("Arial", font_size)
     
     # Get text size for centering
     if hasattr(font, 'getbbox'):
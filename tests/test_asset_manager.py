@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+from PIL import Image
+from PIL.JpegImagePlugin import JpegImageFile
+from Media_Handler import asset_manager
+from Media_Handler.asset_manager import BackgroundCache
+from utils.cache_store import CacheStore
+
+RED, GREEN, BLUE = (255, 0, 0), (0, 255, 0), (0, 0, 255)
+
+
+def bands(size, colors, axis=0):
+    """An image split into equal bands of colour along x (axis 0) or y (axis 1)."""
+    width, height = size
+    pixels = np.zeros((height, width, 3), dtype=np.uint8)
+    step = size[axis] // len(colors)
+    for i, color in enumerate(colors):
+        if axis == 0:
+            pixels[:, i * step:(i + 1) * step] = color
+        else:
+            pixels[i * step:(i + 1) * step] = color
+    return Image.fromarray(pixels)
+
+
+def near(pixel, color, tolerance=40):
+    return np.abs(pixel.astype(int) - color).max() <= tolerance
+
+
+@pytest.fixture
+def drafts(monkeypatch):
+    """Record the sizes JPEG draft decoding is asked for and what it decodes to."""
+    calls = []
+    draft = JpegImageFile.draft
+
+    def record(self, mode, size):
+        result = draft(self, mode, size)
+        calls.append((size, self.size))
+        return result
+
+    monkeypatch.setattr(JpegImageFile, "draft", record)
+    return calls
+
+
+def test_wide_image_is_cropped_to_its_centre(tmp_path):
+    path = tmp_path / "wide.png"
+    bands((300, 100), [RED, GREEN, BLUE]).save(path)
+
+    image = BackgroundCache().get_image(str(path), (60, 60))
+
+    assert image.shape == (60, 60, 3)
+    assert near(image[30, 5], GREEN) and near(image[30, 54], GREEN)
+
+
+def test_tall_image_is_cropped_to_its_centre(tmp_path):
+    path = tmp_path / "tall.png"
+    bands((100, 300), [RED, GREEN, BLUE], axis=1).save(path)
+
+    image = BackgroundCache().get_image(str(path), (80, 40))
+
+    assert image.shape == (40, 80, 3)
+    assert near(image[2, 40], GREEN) and near(image[37, 40], GREEN)
+
+
+def test_large_jpeg_is_draft_decoded_above_the_target_size(tmp_path, drafts):
+    path = tmp_path / "large.jpg"
+    bands((1600, 1200), [RED, GREEN, BLUE, RED]).save(path, quality=95)
+
+    image = BackgroundCache().get_image(str(path), (160, 90))
+
+    assert image.shape == (90, 160, 3)
+    [(_, decoded)] = drafts
+    assert decoded == (200, 150)
+
+
+def test_small_jpeg_is_not_draft_decoded(tmp_path, drafts):
+    path = tmp_path / "small.jpg"
+    bands((64, 36), [RED, BLUE]).save(path, quality=95)
+
+    image = BackgroundCache().get_image(str(path), (128, 72))
+
+    assert image.shape == (72, 128, 3)
+    assert drafts == []
+
+
+def test_exif_rotated_jpeg_is_drafted_and_cropped_upright(tmp_path, drafts):
+    # Stored landscape, red on the left; orientation 6 shows it portrait with red on top
+    path = tmp_path / "rotated.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    bands((800, 400), [RED, BLUE]).save(path, quality=95, exif=exif)
+
+    image = BackgroundCache().get_image(str(path), (50, 100))
+
+    assert image.shape == (100, 50, 3)
+    assert near(image[10, 25], RED) and near(image[90, 25], BLUE)
+    [(_, decoded)] = drafts
+    assert decoded == (200, 100)
+
+
+def test_prepared_images_are_reused_from_memory_and_disk(tmp_path, monkeypatch):
+    path = tmp_path / "image.png"
+    bands((120, 80), [RED, GREEN]).save(path)
+    store = CacheStore(str(tmp_path / "cache"), "backgrounds")
+    cache = BackgroundCache(store)
+    first = cache.get_image(str(path), (60, 40), blur=2)
+
+    def prepare(*args):
+        raise AssertionError("background prepared twice")
+
+    monkeypatch.setattr(BackgroundCache, "_prepare_image", staticmethod(prepare))
+    assert cache.get_image(str(path), (60, 40), blur=2) is first
+    from_disk = BackgroundCache(store).get_image(str(path), (60, 40), blur=2)
+    assert np.array_equal(from_disk, first)
+    assert not from_disk.flags.writeable
+
+
+def test_geometry_and_contents_are_part_of_the_key(tmp_path):
+    path = tmp_path / "image.png"
+    bands((120, 80), [RED, GREEN]).save(path)
+    key = BackgroundCache.make_key("image", str(path), (60, 40), 0)
+
+    assert BackgroundCache.make_key("image", str(path), (60, 40), 0) == key
+    assert BackgroundCache.make_key("image", str(path), (40, 60), 0) != key
+    assert BackgroundCache.make_key("image", str(path), (60, 40), 2) != key
+    bands((120, 80), [BLUE, GREEN]).save(path)
+    assert BackgroundCache.make_key("image", str(path), (60, 40), 0) != key
+
+
+def test_videos_are_transcoded_once(tmp_path, monkeypatch):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"source")
+    calls = []
+
+    def fit_video(source, output_file, size, fps, blur):
+        calls.append((size, fps))
+        with open(output_file, 'wb') as f:
+            f.write(b"fitted")
+
+    monkeypatch.setattr(asset_manager, "fit_video", fit_video)
+    cache = BackgroundCache(CacheStore(str(tmp_path / "cache"), "backgrounds"))
+
+    first = cache.get_video(str(path), (64, 36), 30)
+    assert cache.get_video(str(path), (64, 36), 30) == first
+    cache.get_video(str(path), (64, 36), 25)
+    assert calls == [((64, 36), 30), ((64, 36), 25)]
@@ -0,0 +1,76 @@
+import numpy as np
+from Media_Handler.audio_timeline import AudioTimeline, audio_duration, narration_timeline, read_pcm, write_wav
+
+RATE = 1000
+
+
+def tone(seconds, value=1000):
+    return np.full((int(seconds * RATE), 1), value, dtype=np.int16)
+
+
+def test_render_places_clips_at_offsets():
+    timeline = AudioTimeline(sample_rate=RATE)
+    timeline.add(tone(1.0, 100), 0.0)
+    timeline.add(tone(0.5, 200), 2.0)
+    track = timeline.render()
+
+    assert track.shape == (2500, 1)
+    assert (track[:1000] == 100).all()
+    assert (track[1000:2000] == 0).all()
+    assert (track[2000:] == 200).all()
+
+
+def test_render_pads_and_truncates_to_duration():
+    timeline = AudioTimeline(sample_rate=RATE)
+    timeline.add(tone(1.0), 0.5)
+    assert timeline.render(3.0).shape == (3000, 1)
+    assert timeline.render(1.0).shape == (1000, 1)
+
+
+def test_overlapping_clips_are_summed_and_clipped():
+    timeline = AudioTimeline(sample_rate=RATE)
+    timeline.add(tone(1.0, 20000), 0.0)
+    timeline.add(tone(1.0, 20000), 0.5)
+    track = timeline.render()
+
+    assert track[250, 0] == 20000
+    assert track[750, 0] == 32767
+    assert track[1250, 0] == 20000
+
+
+def test_wav_round_trip_and_header_duration(tmp_path):
+    path = str(tmp_path / "tone.wav")
+    samples = tone(1.5, 123)
+    write_wav(path, samples, RATE)
+
+    assert audio_duration(path) == 1.5
+    assert np.array_equal(read_pcm(path, RATE, 1), samples)
+
+
+def test_narration_starts_with_its_scene(tmp_path):
+    files = [
+        write_wav(str(tmp_path / f"{i}.wav"), np.zeros((44100, 1), dtype=np.int16), 44100)
+        for i in range(2)
+    ]
+    # Silent scenes (None) keep their place in the schedule
+    timeline = narration_timeline([files[0], None, files[1]], scene_starts=[0.0, 2.0, 4.0])
+    assert [start for start, _ in timeline.clips] == [0, 4 * timeline.sample_rate]
+
+
+def test_narration_never_overlaps_the_previous_one(tmp_path):
+    long_file = write_wav(str(tmp_path / "long.wav"), np.zeros((44100 * 3, 1), dtype=np.int16), 44100)
+    short_file = write_wav(str(tmp_path / "short.wav"), np.zeros((44100, 1), dtype=np.int16), 44100)
+    timeline = narration_timeline([long_file, short_file], scene_starts=[0.0, 2.0], gap=0.5)
+
+    # The second narration waits for the first to finish instead of mixing with it
+    assert timeline.clips[1][0] == 3 * 44100
+    assert timeline.end == 4.0
+
+
+def test_narration_without_scene_starts_is_spaced_by_gap(tmp_path):
+    files = [
+        write_wav(str(tmp_path / f"{i}.wav"), np.zeros((44100, 1), dtype=np.int16), 44100)
+        for i in range(3)
+    ]
+    timeline = narration_timeline(files, gap=0.5)
+    assert [start for start, _ in timeline.clips] == [0, int(1.5 * 44100), 3 * 44100]
@@ -0,0 +1,126 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from utils.cache_store import CacheStore
+
+
+def make_store(tmp_path, max_bytes=2500, expiry_days=7):
+    store = CacheStore(str(tmp_path), "test", expiry_days=expiry_days)
+    store.max_bytes = max_bytes
+    return store
+
+
+def test_put_and_get_round_trip(tmp_path):
+    store = make_store(tmp_path)
+    path = store.put_bytes("a", b"data", ".bin")
+    assert store.get("a", ".bin") == path
+    with open(path, 'rb') as f:
+        assert f.read() == b"data"
+    assert store.get("missing", ".bin") is None
+
+
+def test_evicts_least_recently_used_over_limit(tmp_path):
+    store = make_store(tmp_path)
+    store.put_bytes("a", b"x" * 1000)
+    store.put_bytes("b", b"x" * 1000)
+    time.sleep(0.01)
+    store.get("a")  # a is now more recent than b
+    store.put_bytes("c", b"x" * 1000)
+
+    assert set(store.index) == {"a", "c"}
+    assert store.total_bytes == 2000
+    assert store.get("b") is None
+
+
+def test_pinned_entries_survive_eviction(tmp_path):
+    store = make_store(tmp_path)
+    keys = [f"k{i}" for i in range(5)]
+    with store.pin(keys):
+        for key in keys:
+            store.put_bytes(key, b"x" * 1000)
+        # Over the limit, but everything the job stored is still there
+        assert all(store.get(key) for key in keys)
+        assert store.total_bytes == 5000
+
+    store.put_bytes("other", b"x" * 1000)
+    assert store.total_bytes <= store.max_bytes
+    assert "other" in store.index
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    store = make_store(tmp_path, max_bytes=10 ** 6, expiry_days=1)
+    store.put_bytes("old", b"x")
+    store.index["old"]['created'] -= 2 * 24 * 3600
+    assert store.get("old") is None
+    assert "old" not in store.index
+
+
+def test_index_is_reloaded(tmp_path):
+    store = make_store(tmp_path)
+    store.put_bytes("a", b"abc")
+    reopened = CacheStore(str(tmp_path), "test")
+    assert reopened.get("a") is not None
+    assert reopened.total_bytes == 3
+
+
+def test_instances_sharing_a_namespace_keep_each_others_entries(tmp_path):
+    first, second = make_store(tmp_path), make_store(tmp_path)
+    first.put_bytes("a", b"x" * 1000)
+    second.put_bytes("b", b"x" * 1000)
+    first.flush()
+
+    reopened = CacheStore(str(tmp_path), "test")
+    assert set(reopened.index) == {"a", "b"}
+    assert reopened.total_bytes == 2000
+
+
+def test_size_limit_counts_every_instance(tmp_path):
+    first, second = make_store(tmp_path), make_store(tmp_path)
+    first.put_bytes("a", b"x" * 1000)
+    time.sleep(0.01)
+    second.put_bytes("b", b"x" * 1000)
+    time.sleep(0.01)
+    first.put_bytes("c", b"x" * 1000)
+
+    assert set(first.index) == {"b", "c"}
+    assert first.get("a") is None
+    assert second.get("a") is None
+
+
+def test_untracked_files_are_adopted(tmp_path):
+    store = make_store(tmp_path)
+    with open(store.path_for("orphan", ".bin"), 'wb') as f:
+        f.write(b"x" * 700)
+
+    reopened = make_store(tmp_path)
+    assert reopened.total_bytes == 700
+    assert reopened.get("orphan", ".bin") is not None
+
+
+def test_pins_are_respected_by_other_instances(tmp_path):
+    job, other = make_store(tmp_path), make_store(tmp_path)
+    job.put_bytes("needed", b"x" * 1000)
+    with job.pin(["needed"]):
+        other.put_bytes("b", b"x" * 1000)
+        other.put_bytes("c", b"x" * 1000)
+        assert job.get("needed") is not None
+    assert not os.listdir(job.pin_dir)
+
+    other.put_bytes("d", b"x" * 1000)
+    assert job.get("needed") is None
+
+
+def test_leases_of_dead_processes_are_ignored(tmp_path):
+    store = make_store(tmp_path, max_bytes=1000)
+    store.put_bytes("a", b"x" * 1000)
+    proc = subprocess.Popen([sys.executable, '-c', "pass"])
+    proc.wait()
+    os.makedirs(store.pin_dir, exist_ok=True)
+    with open(os.path.join(store.pin_dir, f"{proc.pid}-stale.json"), 'w') as f:
+        json.dump(["a"], f)
+
+    store.put_bytes("b", b"x" * 1000)
+    assert store.get("a") is None
+    assert not os.listdir(store.pin_dir)
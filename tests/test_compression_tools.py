@@ -0,0 +1,11 @@
+from Output_Manager.compression_tools import _double_rate
+
+
+def test_double_rate_keeps_suffix():
+    assert _double_rate("5000k") == "10000k"
+    assert _double_rate("2.5M") == "5M"
+
+
+def test_double_rate_plain_number():
+    assert _double_rate("800") == "1600"
+    assert _double_rate(" 64k ") == "128k"
@@ -0,0 +1,95 @@
+import numpy as np
+from Media_Handler.effects import ColorCorrection, KenBurnsEffect, StaticOverlay
+
+
+def test_color_correction_neutral_settings_are_identity():
+    frame = np.random.default_rng(0).integers(0, 256, (4, 5, 3), dtype=np.uint8)
+    assert np.array_equal(ColorCorrection().apply(frame), frame)
+
+
+def test_color_correction_brightness_shifts_and_clips():
+    frame = np.array([[[0, 128, 250]]], dtype=np.uint8)
+    out = ColorCorrection(brightness=10).apply(frame)
+    assert out.tolist() == [[[26, 154, 255]]]
+
+
+def test_color_correction_full_desaturation_is_gray():
+    frame = np.array([[[255, 0, 0], [0, 0, 255]]], dtype=np.uint8)
+    out = ColorCorrection(saturation=-100).apply(frame)
+    assert (out[..., 0] == out[..., 1]).all() and (out[..., 1] == out[..., 2]).all()
+
+
+def test_color_correction_from_config():
+    assert ColorCorrection.from_config({}) is None
+    config = {'video_style': {'color_correction': {'enabled': True, 'brightness': 0, 'contrast': 0}}}
+    assert ColorCorrection.from_config(config) is None
+    config['video_style']['color_correction']['contrast'] = 80
+    assert ColorCorrection.from_config(config).settings == (0.0, 50.0, 0.0)
+
+
+def test_static_overlay_blends_only_its_box():
+    layer = np.zeros((2, 2, 4), dtype=np.uint8)
+    layer[..., :3] = 255
+    layer[..., 3] = 128
+    overlay = StaticOverlay([(layer, (1, 1))], (4, 4))
+    frame = np.full((4, 4, 3), (40, 90, 160), dtype=np.uint8)
+    out = overlay.apply(frame, out=np.empty_like(frame))
+
+    assert out[0, 0].tolist() == [40, 90, 160]
+    assert out[1, 1].tolist() == [148, 173, 207]
+    assert frame[1, 1].tolist() == [40, 90, 160]
+
+
+def test_static_overlay_without_layers_is_empty():
+    overlay = StaticOverlay([], (4, 4))
+    frame = np.zeros((4, 4, 3), dtype=np.uint8)
+    assert overlay.empty
+    assert np.array_equal(overlay.apply(frame), frame)
+
+
+def test_ken_burns_without_zoom_reproduces_the_source():
+    source = np.random.default_rng(1).integers(0, 256, (36, 64, 3), dtype=np.uint8)
+    effect = KenBurnsEffect(source, (64, 36), 1.0, 30, zoom_ratio=0.0)
+    assert np.array_equal(effect.get_frame(0), source)
+    assert np.array_equal(effect.get_frame(0.5), source)
+
+
+def test_ken_burns_zooms_towards_the_centre():
+    size = (64, 36)
+    width, height = KenBurnsEffect.source_size(size, 0.1)
+    assert (width, height) == (71, 40)
+    source = np.zeros((height, width, 3), dtype=np.uint8)
+    source[:, :, 0] = np.linspace(0, 255, width).astype(np.uint8)
+    effect = KenBurnsEffect(source, size, 2.0, 30, zoom_ratio=0.1)
+
+    first, last = effect.get_frame(0)[:, :, 0].astype(int), effect.get_frame(2.0)[:, :, 0].astype(int)
+    # The gradient spreads out as the crop narrows, keeping its centre
+    assert last[:, -1].mean() - last[:, 0].mean() < first[:, -1].mean() - first[:, 0].mean()
+    assert abs(int(first[0, 32]) - int(last[0, 32])) <= 4
+
+
+def test_ken_burns_fine_detail_does_not_shimmer():
+    size = (160, 90)
+    width, height = KenBurnsEffect.source_size(size, 0.05)
+    source = np.zeros((height, width, 3), dtype=np.uint8)
+    source[:, ::2] = 255  # one-pixel stripes, the worst case for decimation
+    effect = KenBurnsEffect(source, size, 3.0, 30, zoom_ratio=0.05)
+
+    means = [effect.get_frame(i / 30).mean() for i in range(effect.n_frames)]
+    assert max(means) - min(means) < 4
+
+
+def test_ken_burns_motion_is_smooth_and_buffers_are_reused():
+    size = (64, 36)
+    width, height = KenBurnsEffect.source_size(size, 0.2)
+    y, x = np.mgrid[0:height, 0:width]
+    source = np.repeat(((x * 3 + y * 2) % 256).astype(np.uint8)[:, :, None], 3, axis=2)
+    effect = KenBurnsEffect(source, size, 4.0, 30, zoom_ratio=0.2)
+
+    previous = effect.get_frame(0).astype(int)
+    for index in range(1, effect.n_frames):
+        frame = effect.get_frame(index / 30)
+        # Sub-pixel steps: no pixel jumps by a whole source column between frames
+        assert np.abs(frame[4:-4, 4:-4].astype(int) - previous[4:-4, 4:-4]).mean() < 1.5
+        previous = frame.astype(int)
+    assert effect.get_frame(0) is effect.get_frame(1)
@@ -0,0 +1,96 @@
+import sys
+import threading
+import numpy as np
+import pytest
+from moviepy.editor import ColorClip, VideoClip
+from Media_Handler.frame_pipe import FramePipeWriter, OrderedFrameReader
+
+SIZE = (256, 256)
+FPS = 25
+
+
+def run_with_timeout(writer, clip, timeout=20):
+    """Run write_clip on a thread; returns (finished, error)."""
+    result = {}
+
+    def target():
+        try:
+            writer.write_clip(clip)
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive(), result.get('error')
+
+
+def early_exit_encoder(frames):
+    """A stand-in encoder that reads a few frames and then exits with an error."""
+    frame_bytes = SIZE[0] * SIZE[1] * 3
+    code = (
+        "import sys\n"
+        f"sys.stdin.buffer.read({frame_bytes * frames})\n"
+        "sys.stderr.write('encoder gave up')\n"
+        "sys.exit(1)\n"
+    )
+    return [sys.executable, '-c', code]
+
+
+@pytest.mark.parametrize("workers", [1, 2, 4])
+def test_encoder_exiting_early_raises_instead_of_hanging(tmp_path, workers):
+    # With a deep enough ring the workers claim every frame before ffmpeg exits
+    writer = FramePipeWriter(str(tmp_path / "out.mp4"), SIZE, FPS, queue_depth=8, workers=workers)
+    writer.cmd = early_exit_encoder(2)
+    clip = ColorClip(SIZE, color=(10, 20, 30), duration=10 / FPS)
+
+    finished, error = run_with_timeout(writer, clip)
+
+    assert finished
+    assert isinstance(error, IOError)
+    assert "encoder gave up" in str(error)
+
+
+def test_frame_errors_are_raised(tmp_path):
+    def make_frame(t):
+        if t >= 3 / FPS:
+            raise ValueError("bad frame")
+        return np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8)
+
+    writer = FramePipeWriter(str(tmp_path / "out.mp4"), SIZE, FPS, queue_depth=4, workers=2)
+    writer.cmd = early_exit_encoder(100)
+    finished, error = run_with_timeout(writer, VideoClip(make_frame, duration=10 / FPS))
+
+    assert finished
+    assert isinstance(error, ValueError)
+
+
+def test_frames_reach_the_encoder_in_order(tmp_path):
+    output = tmp_path / "frames.raw"
+    writer = FramePipeWriter(str(tmp_path / "out.mp4"), SIZE, FPS, queue_depth=3, workers=3)
+    writer.cmd = [sys.executable, '-c', f"import sys; open({str(output)!r}, 'wb').write(sys.stdin.buffer.read())"]
+    n_frames = 12
+    clip = VideoClip(
+        lambda t: np.full((SIZE[1], SIZE[0], 3), int(round(t * FPS)), dtype=np.uint8),
+        duration=n_frames / FPS
+    )
+
+    finished, error = run_with_timeout(writer, clip)
+
+    assert finished and error is None
+    frames = np.frombuffer(output.read_bytes(), dtype=np.uint8).reshape(-1, SIZE[1], SIZE[0], 3)
+    assert [int(frame[0, 0, 0]) for frame in frames] == list(range(n_frames))
+
+
+def test_ordered_reader_serves_recent_frames_from_memory():
+    calls = []
+
+    def make_frame(t):
+        calls.append(t)
+        return np.zeros((2, 2, 3), dtype=np.uint8)
+
+    reader = OrderedFrameReader(VideoClip(make_frame, duration=1), FPS, window=4)
+    calls.clear()  # VideoClip samples a first frame for its size
+    for index in [0, 1, 0, 2, 1, 3]:
+        reader.get_frame(index / FPS)
+    assert len(calls) == 4
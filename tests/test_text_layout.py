@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+from Media_Handler.font_registry import FontRegistry
+from Media_Handler.text_layout import (
+    AnimatedText, GlyphAtlas, TextLayout, WordWidths, fit_text, get_glyph_atlas, wrap_text
+)
+
+FAMILY = "DejaVu Sans"
+
+
+@pytest.fixture(scope="module")
+def fonts():
+    return FontRegistry()
+
+
+def font_key(size):
+    return (FAMILY, size)
+
+
+def test_wrap_text_fits_lines_to_width(fonts):
+    font = fonts.get_font(FAMILY, 24)
+    text = "the quick brown fox jumps over the lazy dog " * 4
+    lines = wrap_text(text, WordWidths(font), 300)
+
+    assert len(lines) > 1
+    assert all(font.getlength(line) <= 300 for line in lines)
+    assert ' '.join(lines).split() == text.split()
+
+
+def test_wrap_text_keeps_explicit_breaks(fonts):
+    widths = WordWidths(fonts.get_font(FAMILY, 24))
+    assert wrap_text("first\nsecond", widths, 1000) == ["first", "second"]
+
+
+def test_wrap_text_breaks_overlong_words(fonts):
+    font = fonts.get_font(FAMILY, 24)
+    lines = wrap_text("x" * 200, WordWidths(font), 200)
+
+    assert ''.join(lines) == "x" * 200
+    assert all(font.getlength(line) <= 200 for line in lines)
+
+
+def test_fit_text_keeps_size_when_text_fits(fonts):
+    size, lines = fit_text("Hello world", lambda s: fonts.get_font(FAMILY, s), font_key, 48, 1000, 200)
+    assert size == 48
+    assert lines == ["Hello world"]
+
+
+def test_fit_text_shrinks_to_the_largest_size_that_fits(fonts):
+    get_font = lambda s: fonts.get_font(FAMILY, s)
+    text = "a long line of narration that will not fit on one line at this size " * 3
+    size, lines = fit_text(text, get_font, font_key, 64, 600, 150)
+
+    assert 8 <= size < 64
+    ascent, descent = get_font(size).getmetrics()
+    assert len(lines) * (ascent + descent + 4) - 4 <= 150
+    # One size up no longer fits
+    bigger = get_font(size + 1)
+    bigger_lines = wrap_text(text, WordWidths(bigger), 600)
+    ascent, descent = bigger.getmetrics()
+    assert len(bigger_lines) * (ascent + descent + 4) - 4 > 150
+
+
+def test_animation_fit_finishes_reveal_in_time():
+    animation = AnimatedText("typewriter", fps=30, font_size=40, speed="subtle")
+    # 150 glyphs at 18 chars/s take about 8.3 s
+    animation.appear = [int(round(i * 30 / 18)) for i in range(150)]
+    animation.next_frame = int(round(150 * 30 / 18))
+    assert animation.duration > 5
+
+    animation.fit(2.5)
+    assert animation.duration <= 2.5
+    assert animation.appear == sorted(animation.appear)
+    assert max(animation.appear) < 2.5 * 30
+
+
+def test_glyph_atlas_rasterizes_each_glyph_once(fonts):
+    atlas = GlyphAtlas(fonts.get_font(FAMILY, 32), (255, 255, 255))
+    layers = atlas.get("A")
+    assert layers is atlas.get("A")
+    assert len(layers) == 1 and layers[0].width > 0
+    assert atlas.get(" ") is None
+
+
+def test_glyph_atlas_layers_for_outlines(fonts):
+    font = fonts.get_font(FAMILY, 32)
+    # Outline and fill as separate layers on the same box, the outline covering more
+    outline, fill = GlyphAtlas(font, (255, 255, 255), stroke_width=2).get("A")
+    assert (outline.width, outline.height) == (fill.width, fill.height)
+    assert (outline.alpha_inv < 256).sum() > (fill.alpha_inv < 256).sum()
+    # Translucent text keeps one combined layer
+    assert len(GlyphAtlas(font, (255, 255, 255), stroke_width=2, opacity=0.5).get("A")) == 1
+
+
+def test_glyph_atlases_are_shared_per_font_and_color(fonts):
+    font = fonts.get_font(FAMILY, 20)
+    atlas = get_glyph_atlas(font_key(20), font, (255, 255, 255))
+    assert get_glyph_atlas(font_key(20), font, (255, 255, 255)) is atlas
+    assert get_glyph_atlas(font_key(20), font, (255, 0, 0)) is not atlas
+
+
+def animated(fonts, effect, text="Hello there"):
+    font = fonts.get_font(FAMILY, 32)
+    layout = TextLayout.build([text], font)
+    animation = AnimatedText(effect, fps=30, font_size=32, speed="subtle")
+    animation.add_block(layout, GlyphAtlas(font, (255, 255, 255)), (10, 20))
+    return animation, layout
+
+
+def lit(animation, t, size=(400, 100)):
+    frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    return animation.draw(frame, t)[:, :, 0] > 0
+
+
+def test_typewriter_reveals_glyphs_in_order(fonts):
+    animation, layout = animated(fonts, "typewriter")
+    assert len(animation.appear) == len(layout.glyph_positions()) == 10  # spaces have no glyph
+    assert animation.appear == sorted(animation.appear)
+
+    counts = [lit(animation, i / 30).sum() for i in range(animation.next_frame + 1)]
+    assert counts == sorted(counts)
+    assert 0 < counts[0] < counts[-1]
+    assert np.array_equal(lit(animation, animation.duration), lit(animation, animation.duration + 1))
+
+
+def test_typewriter_final_frame_matches_the_static_text(fonts):
+    animation, layout = animated(fonts, "typewriter")
+    final = lit(animation, animation.duration)
+    static = layout.render((255, 255, 255), (0, 0, 0), padding=0)[:, :, 3] > 0
+    height, width = static.shape
+    region = final[20:20 + height, 10:10 + width]
+    # Glyphs are drawn one by one, so allow antialiasing differences at the edges
+    assert (region != static).mean() < 0.02
+    assert not final[:20].any() and not final[:, :10].any()
+
+
+def test_bounce_drops_glyphs_onto_their_place(fonts):
+    animation, _ = animated(fonts, "bounce", "H")
+    settled = lit(animation, animation.duration)
+    first = lit(animation, 0)
+    rows = lambda mask: np.flatnonzero(mask.any(axis=1))
+    assert rows(first)[0] < rows(settled)[0]
+    assert rows(first)[-1] - rows(first)[0] == rows(settled)[-1] - rows(settled)[0]
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+from moviepy.editor import ColorClip
+from Media_Handler.transitions import (
+    DissolveTransition, FadeTransition, SlideTransition, TransitionManager, WipeTransition, ZoomTransition
+)
+
+SIZE = (40, 20)
+FPS = 10
+
+
+def frames():
+    a = np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8)
+    b = np.full((SIZE[1], SIZE[0], 3), 200, dtype=np.uint8)
+    return a, b
+
+
+def blend(effect, index):
+    a, b = frames()
+    effect.prepare(SIZE)
+    out = np.empty_like(a)
+    effect.blend(a, b, index, out)
+    return out
+
+
+def test_frame_index_lands_on_exact_frame_times():
+    effect = FadeTransition(duration=2.0, fps=25)
+    # 29 / 25 * 25 is 28.999999999999996 in floats
+    assert [effect._frame_index(i / 25) for i in range(effect.n_frames)] == list(range(effect.n_frames))
+
+
+def test_progress_excludes_the_pure_endpoints():
+    effect = FadeTransition(duration=1.0, fps=FPS)
+    assert effect.n_frames == 10
+    assert 0 < effect.progress[0] < effect.progress[-1] < 1
+
+
+def test_fade_blends_evenly():
+    effect = FadeTransition(duration=1.0, fps=FPS)
+    values = [int(blend(effect, i)[0, 0, 0]) for i in range(effect.n_frames)]
+    assert values == sorted(values)
+    assert 0 < values[0] and values[-1] < 200
+    assert abs(values[4] - 200 * effect.progress[4]) <= 1
+
+
+@pytest.mark.parametrize("direction", ["left", "right", "up", "down"])
+def test_slide_and_wipe_show_the_incoming_share(direction):
+    for effect_class in (SlideTransition, WipeTransition):
+        effect = effect_class(duration=1.0, fps=FPS, direction=direction)
+        for index in (0, 4, 9):
+            out = blend(effect, index)
+            extent = SIZE[0] if direction in ("left", "right") else SIZE[1]
+            shown = int(round(effect.progress[index] * extent))
+            incoming = (out[:, :, 0] == 200).sum()
+            other = SIZE[1] if direction in ("left", "right") else SIZE[0]
+            assert incoming == shown * other
+
+
+def test_wipe_edge_moves_the_requested_way():
+    out = blend(WipeTransition(duration=1.0, fps=FPS, direction="left"), 4)
+    assert out[0, -1, 0] == 200 and out[0, 0, 0] == 0
+
+
+def test_dissolve_switches_pixels_once():
+    effect = DissolveTransition(duration=1.0, fps=FPS)
+    shown = [blend(effect, i)[:, :, 0] == 200 for i in range(effect.n_frames)]
+    for earlier, later in zip(shown, shown[1:]):
+        assert not (earlier & ~later).any()  # a switched pixel never switches back
+    assert 0.3 < shown[4].mean() < 0.7
+
+
+def test_zoom_magnifies_the_outgoing_frame_towards_the_centre():
+    effect = ZoomTransition(duration=1.0, fps=FPS, zoom=2.0)
+    effect.prepare(SIZE)
+    a = np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8)
+    a[:, SIZE[0] // 2:] = 255  # right half white
+    b = np.zeros_like(a)
+    out = np.empty_like(a)
+    effect.blend(a, b, effect.n_frames - 1, out)
+
+    # The centre edge stays put while the outgoing frame fades out
+    assert out[10, 25, 0] > 0 and out[10, 15, 0] == 0
+    assert out.max() < 255
+
+
+def test_overlap_clip_spans_only_the_window():
+    clip1 = ColorClip(SIZE, color=(0, 0, 0), duration=2)
+    clip2 = ColorClip(SIZE, color=(200, 200, 200), duration=2)
+    effect = TransitionManager().get_effect("fade", 0.5, FPS)
+    overlap = effect.overlap_clip(clip1, clip2)
+
+    assert overlap.duration == 0.5
+    values = [int(overlap.get_frame(i / FPS)[0, 0, 0]) for i in range(effect.n_frames)]
+    assert values == sorted(values) and len(set(values)) == effect.n_frames
+
+
+def test_unknown_transition_falls_back_to_fade():
+    assert isinstance(TransitionManager().get_effect("spiral", 1.0, FPS), FadeTransition)
@@ -0,0 +1,180 @@
+import threading
+import numpy as np
+import pytest
+from PIL import Image
+from moviepy.editor import ColorClip
+from Media_Handler.audio_timeline import narration_timeline, write_wav
+from Media_Handler.video_processor import VideoProcessor, VideoStyle
+from utils.config_loader import load_config
+
+FPS = 30
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = load_config()
+    config['project']['cache_dir'] = str(tmp_path / "cache")
+    config['video_style']['transition'] = "fade"
+    config['video_style']['transition_duration'] = 1.0
+    config['video_style']['enable_animations'] = False
+    config['scene']['random_transitions'] = False
+    return config
+
+
+@pytest.fixture
+def style():
+    style = VideoStyle.get_style("modern")
+    style.resolution = (64, 36)
+    style.fps = FPS
+    return style
+
+
+def timed(*lengths):
+    scenes, start = [], 0.0
+    for i, length in enumerate(lengths):
+        scenes.append({'name': f"Scene {i + 1}", 'timing': f"{start:.1f} to {start + length:.1f}"})
+        start += length
+    return scenes
+
+
+def timeline_frames(items):
+    return sum(
+        int(round((item['end'] - item['start']) * FPS)) if item['kind'] == "scene"
+        else int(round(item['duration'] * FPS))
+        for item in items
+    )
+
+
+def test_plan_timeline_covers_every_scene_frame(config, style):
+    scenes = timed(4.1, 8.2, 8.2, 8.2, 4.1, 8.2)
+    items = VideoProcessor(config).plan_timeline(scenes, style)
+
+    assert [item['kind'] for item in items].count("transition") == 5
+    assert timeline_frames(items) == 1230
+    # Every item is a whole number of frames
+    for item in items:
+        length = item['duration'] if item['kind'] == "transition" else item['end'] - item['start']
+        assert abs(length * FPS - round(length * FPS)) < 1e-6
+
+
+def test_plan_timeline_without_transitions(config, style):
+    config['video_style']['transition'] = "none"
+    items = VideoProcessor(config).plan_timeline(timed(4.1, 2.0), style)
+
+    assert [item['kind'] for item in items] == ["scene", "scene"]
+    assert timeline_frames(items) == 183
+
+
+def test_scene_starts_add_up_whole_frames(config, style):
+    starts = VideoProcessor(config).scene_starts(timed(4.1, 8.2, 2.0), style)
+    assert [round(s * FPS) for s in starts] == [0, 123, 369]
+
+
+def test_time_scenes_to_audio_clamps_and_chains(config, style, tmp_path):
+    config['scene']['min_duration'] = 2
+    config['scene']['max_duration'] = 6
+    processor = VideoProcessor(config)
+    files = []
+    for name, seconds in [("short", 0.5), ("long", 9.0), ("mid", 3.3)]:
+        path = str(tmp_path / f"{name}.wav")
+        write_wav(path, np.zeros((int(44100 * seconds), 1), dtype=np.int16), 44100)
+        files.append(path)
+    scenes = timed(5, 5, 5, 5)
+
+    durations = processor.time_scenes_to_audio(scenes, files + [None], style)
+
+    assert durations == [2.0, 6.0, 3.3, 5.0]
+    assert [scene['timing'] for scene in scenes] == [
+        "0.000 to 2.000", "2.000 to 8.000", "8.000 to 11.300", "11.300 to 16.300"
+    ]
+
+
+
+def test_auto_timed_narration_starts_with_each_scene(config, style, tmp_path):
+    processor = VideoProcessor(config)
+    files = []
+    for i, seconds in enumerate([4.0, 4.0, 3.31, 4.0, 0.2, 4.0]):
+        path = str(tmp_path / f"{i}.wav")
+        write_wav(path, np.zeros((int(round(44100 * seconds)), 1), dtype=np.int16), 44100)
+        files.append(path)
+    scenes = timed(*[5] * 6)
+
+    processor.time_scenes_to_audio(scenes, files, style)
+    starts = processor.scene_starts(scenes, style)
+    timeline = narration_timeline(files, starts)
+
+    assert [start / timeline.sample_rate for start, _ in timeline.clips] == pytest.approx(starts, abs=1e-4)
+    # The last narration ends with the video instead of being cut off
+    assert timeline.end <= starts[-1] + processor._scene_duration(scenes[-1]) + 1e-6
+
+
+def test_fade_across_watermarked_scenes_blends_both_clips(config, style, tmp_path):
+    logo = tmp_path / "logo.png"
+    Image.new('RGBA', (16, 16), (255, 0, 0, 255)).save(logo)
+    config['video_style']['watermark'] = {
+        'enabled': True, 'image_path': str(logo), 'position': "bottom-right", 'opacity': 1.0
+    }
+    processor = VideoProcessor(config, static_fast_path=False)
+    black = processor._composite_layers([ColorClip(style.resolution, color=(0, 0, 0), duration=2)], style, 2)
+    white = processor._composite_layers([ColorClip(style.resolution, color=(255, 255, 255), duration=2)], style, 2)
+
+    fade = processor.build_transition_clip(black, white, "fade", 1.0, style)
+    # Away from the watermark the fade ramps from one scene to the other
+    ramp = [int(fade.get_frame(t)[0, 0, 0]) for t in (0.1, 0.5, 0.9)]
+    assert ramp[0] < 128 < ramp[2]
+    assert ramp == sorted(ramp) and len(set(ramp)) == 3
+    # Both scenes carry the watermark through the transition
+    assert fade.get_frame(0.5)[-5, -5].tolist() == [255, 0, 0]
+
+
+def test_write_clip_encodes_every_frame(config, style):
+    imageio_ffmpeg = pytest.importorskip("imageio_ffmpeg")
+    processor = VideoProcessor(config)
+    clip = ColorClip(style.resolution, color=(10, 20, 30), duration=123 / FPS)
+    output = processor.write_clip(clip, "out.mp4", style, processor.get_encoder("draft"))
+
+    frames, _ = imageio_ffmpeg.count_frames_and_secs(output)
+    assert frames == 123
+
+
+def test_scene_style_uses_the_scenes_own_font(config, style):
+    processor = VideoProcessor(config)
+    manual = {'text': ["Hello"], 'style': {'font_family': "DejaVu Serif", 'font_size': 70}}
+    template = {'text': ["Hello"], 'style': {'font': "DejaVu Sans Mono"}}
+
+    assert processor.scene_style(manual, style).font == "DejaVu Serif"
+    assert processor.scene_style(template, style).font == "DejaVu Sans Mono"
+    assert processor.scene_style({'text': ["Hello"]}, style) is style
+
+
+def test_scene_font_changes_rendered_text_and_scene_hash(config, style):
+    style.resolution = (320, 180)
+    processor = VideoProcessor(config)
+    plain = {'text': ["Hello world"], 'timing': "0 to 2"}
+    serif = dict(plain, style={'font_family': "DejaVu Serif"})
+
+    assert processor.scene_hash(plain, style) != processor.scene_hash(serif, style)
+    frames = [processor.build_scene_clip(scene, style).get_frame(0) for scene in (plain, serif)]
+    assert not np.array_equal(frames[0], frames[1])
+
+
+def test_video_background_color_correction_reuses_frame_buffers(config, style, tmp_path):
+    config['video_style']['color_correction'] = {'enabled': True, 'brightness': 20}
+    processor = VideoProcessor(config)
+    source = processor.write_clip(
+        ColorClip(style.resolution, color=(40, 40, 40), duration=1), str(tmp_path / "bg.mp4"),
+        style, processor.get_encoder("draft")
+    )
+    background = processor._build_background({'background_video': source}, style, 1.0)
+
+    first = background.get_frame(0)
+    assert first[0, 0].min() > 80
+    second = background.get_frame(1 / FPS)
+    assert second is first
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(background.get_frame(2 / FPS)))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
@@ -0,0 +1,141 @@
+import threading
+import time
+import pytest
+
+pytest.importorskip("pyttsx3")
+
+from Media_Handler import voice_system
+from Media_Handler.voice_system import VoiceSystem
+from utils.config_loader import load_config
+
+
+class FakeVoice:
+    def __init__(self, voice_id):
+        self.id = voice_id
+        self.name = voice_id
+        self.languages = ["en-US"]
+        self.gender = "neutral"
+
+
+class FakeEngine:
+    """pyttsx3 stand-in that writes each text as the file's content."""
+    synthesized = []
+
+    def __init__(self):
+        self.properties = {'voices': [FakeVoice("v1")], 'rate': 200, 'volume': 1.0}
+        self.queue = []
+
+    def getProperty(self, name):
+        return self.properties[name]
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def save_to_file(self, text, path):
+        self.queue.append((text, path))
+
+    def runAndWait(self):
+        for text, path in self.queue:
+            FakeEngine.synthesized.append(text)
+            with open(path, 'w') as f:
+                f.write(text)
+        self.queue = []
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(voice_system.pyttsx3, "init", FakeEngine)
+    FakeEngine.synthesized = []
+    config = load_config()
+    config['project']['cache_dir'] = str(tmp_path / "cache")
+    config['sources']['cache']['enabled'] = True
+    config.setdefault('performance', {})['local_tts_processes'] = 1
+    return config
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_tts_key_covers_text_voice_and_engine_settings(config):
+    voices = VoiceSystem(config)
+    key = voices.tts_key("Hello", "local_1")
+
+    assert voices.tts_key("Hello", "local_1") == key
+    assert voices.tts_key("Hello!", "local_1") != key
+    assert voices.tts_key("Hello", "elevenlabs_josh") != key
+    voices.local_engine.setProperty('rate', 150)
+    assert voices.tts_key("Hello", "local_1") != key
+
+
+def test_repeated_and_cached_texts_are_synthesized_once(config):
+    voices = VoiceSystem(config)
+    texts = ["One", "Two", "One", "Three"]
+
+    files = voices.generate_voices(texts, "local_1")
+
+    assert [read(path) for path in files] == texts
+    assert sorted(FakeEngine.synthesized) == ["One", "Three", "Two"]
+
+    again = VoiceSystem(config).generate_voices(["Three", "Four"], "local_1")
+    assert again[0] == files[3]
+    assert FakeEngine.synthesized[3:] == ["Four"]
+
+
+def test_concurrent_requests_keep_text_order(config, monkeypatch):
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "test")
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def post(url, json, headers):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        # Later texts answer first
+        time.sleep(0.05 * (5 - int(json['text'][-1])))
+        with lock:
+            in_flight[0] -= 1
+        return FakeResponse(json['text'].encode())
+
+    monkeypatch.setattr(voice_system.requests, "post", post)
+    voices = VoiceSystem(config)
+    texts = [f"Scene {i}" for i in range(1, 5)]
+
+    files = voices.generate_voices(texts, "elevenlabs_rachel")
+
+    assert [read(path) for path in files] == texts
+    assert peak[0] > 1
+
+
+def test_failed_requests_fall_back_to_the_local_voice(config, monkeypatch):
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "test")
+    error = FakeResponse(b"")
+    error.status_code = 500
+    error.text = "quota exceeded"
+    monkeypatch.setattr(voice_system.requests, "post", lambda url, json, headers: error)
+    voices = VoiceSystem(config)
+
+    files = voices.generate_voices(["First", "Second"], "elevenlabs_sam")
+
+    assert [read(path) for path in files] == ["First", "Second"]
+    assert files[0].endswith(".wav")
+
+
+def test_local_worker_processes_keep_text_order(config):
+    config['performance']['local_tts_processes'] = 2
+    voices = VoiceSystem(config)
+    texts = ["Alpha", "Beta", "Gamma", "Alpha"]
+
+    files = voices.generate_voices(texts, "local_1")
+
+    assert [read(path) for path in files] == texts
+    assert files[0] == files[3]
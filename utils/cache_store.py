@@ -0,0 +1,314 @@
+"""Content-addressed on-disk cache with LRU eviction and expiry."""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Set
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class CacheStore:
+    """Size-bounded file cache under ``project.cache_dir``.
+
+    Entries are stored as ``<namespace>/<key><ext>``. A small JSON index keeps
+    sizes and access times for eviction. Several processes (scene workers,
+    batch jobs) may share a namespace: the index is merged with what is on
+    disk under a file lock before it is saved or used for eviction, and pins
+    are published as lease files so no process evicts what another still
+    needs.
+    """
+    INDEX_FILE = "index.json"
+    LOCK_FILE = "index.lock"
+    PIN_DIR = "pins"
+    # Leases left behind by processes that died are ignored after this long
+    PIN_LEASE_SECONDS = 24 * 3600
+
+    def __init__(self, cache_dir: str, namespace: str, max_size_mb: float = 1000, expiry_days: float = 7):
+        self.cache_dir = os.path.join(cache_dir, namespace)
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.expiry_seconds = expiry_days * 24 * 3600 if expiry_days else None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self.index_file = os.path.join(self.cache_dir, self.INDEX_FILE)
+        self.lock_file = os.path.join(self.cache_dir, self.LOCK_FILE)
+        self.pin_dir = os.path.join(self.cache_dir, self.PIN_DIR)
+        with self._locked():
+            self.index: Dict[str, Dict] = self._load_index()
+            # Files written by processes that exited before saving the index
+            self._adopt_untracked()
+        self.total_bytes = sum(entry['size'] for entry in self.index.values())
+        # Keys the running job still needs; never evicted (see pin)
+        self.pinned: Set[str] = set()
+
+    @classmethod
+    def from_config(cls, config: Dict, namespace: str, share: float = 1.0) -> Optional['CacheStore']:
+        """Create a store from config, or None if caching is disabled.
+
+        ``share`` is the fraction of ``cache.max_size_mb`` this namespace may use,
+        so all namespaces together stay within the configured limit.
+        """
+        cache_config = config.get('sources', {}).get('cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        cache_dir = config.get('project', {}).get('cache_dir', './cache/')
+        return cls(
+            cache_dir,
+            namespace,
+            max_size_mb=cache_config.get('max_size_mb', 1000) * share,
+            expiry_days=cache_config.get('expiry_days', 7)
+        )
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Build a stable content hash from any JSON-serializable parts."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key: str, ext: str = "") -> str:
+        """Get the file path an entry is stored at."""
+        return os.path.join(self.cache_dir, f"{key}{ext}")
+
+    def get(self, key: str, ext: str = "") -> Optional[str]:
+        """Get the path of a cached entry, or None on a miss."""
+        path = self.path_for(key, ext)
+        if not os.path.exists(path):
+            if key in self.index:
+                self._forget(key)
+            return None
+
+        now = time.time()
+        entry = self.index.get(key)
+        if entry is None:
+            # Adopt files written by other processes
+            entry = self._add_entry(key, path, created=os.path.getmtime(path))
+
+        if self.expiry_seconds and now - entry['created'] > self.expiry_seconds:
+            self._remove(key)
+            self._save_index()
+            return None
+
+        entry['accessed'] = now
+        return path
+
+    def put(self, key: str, src_path: str, ext: str = "", move: bool = False) -> str:
+        """Store a file in the cache and return its cached path."""
+        path = self.path_for(key, ext)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        if move:
+            shutil.move(src_path, tmp_path)
+        else:
+            shutil.copyfile(src_path, tmp_path)
+        os.replace(tmp_path, path)
+        return self._commit(key, path)
+
+    def put_bytes(self, key: str, data: bytes, ext: str = "") -> str:
+        """Store raw bytes in the cache and return the cached path."""
+        path = self.path_for(key, ext)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return self._commit(key, path)
+
+    @contextmanager
+    def pin(self, keys: Iterable[str]):
+        """Keep entries from being evicted while the current job still needs them.
+
+        Inside the block the namespace may go over its size limit; the next
+        ``put`` or ``evict`` after it brings it back under. The keys are also
+        written to a lease file that other processes' ``evict`` respects.
+        """
+        added = set(keys) - self.pinned
+        self.pinned |= added
+        lease = os.path.join(self.pin_dir, f"{os.getpid()}-{uuid.uuid4().hex}.json")
+        # Written under the index lock so an eviction already running finishes first
+        with self._locked():
+            os.makedirs(self.pin_dir, exist_ok=True)
+            with open(lease, 'w') as f:
+                json.dump(sorted(added), f)
+        try:
+            yield
+        finally:
+            self.pinned -= added
+            try:
+                os.remove(lease)
+            except FileNotFoundError:
+                pass
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under the size limit.
+
+        Entries are counted across every process sharing the namespace, and
+        entries pinned here or by another process are kept either way.
+        """
+        with self._locked():
+            self._merge_index()
+            pinned = self.pinned | self._leased_keys()
+            now = time.time()
+            if self.expiry_seconds:
+                for key in [k for k, e in self.index.items()
+                            if now - e['created'] > self.expiry_seconds and k not in pinned]:
+                    self._remove(key)
+
+            if self.total_bytes > self.max_bytes:
+                for key in sorted(self.index, key=lambda k: self.index[k]['accessed']):
+                    if self.total_bytes <= self.max_bytes:
+                        break
+                    if key not in pinned:
+                        self._remove(key)
+            self._write_index()
+
+    def flush(self):
+        """Persist access times to the index."""
+        self._save_index()
+
+    def _commit(self, key: str, path: str) -> str:
+        if key in self.index:
+            self._forget(key)
+        self._add_entry(key, path)
+        self.evict()
+        return path
+
+    def _add_entry(self, key: str, path: str, created: Optional[float] = None) -> Dict:
+        now = time.time()
+        entry = {
+            'file': os.path.basename(path),
+            'size': os.path.getsize(path),
+            'created': created or now,
+            'accessed': now
+        }
+        self.index[key] = entry
+        self.total_bytes += entry['size']
+        return entry
+
+    def _forget(self, key: str):
+        entry = self.index.pop(key)
+        self.total_bytes -= entry['size']
+
+    def _remove(self, key: str):
+        entry = self.index[key]
+        try:
+            os.remove(os.path.join(self.cache_dir, entry['file']))
+        except FileNotFoundError:
+            pass
+        self._forget(key)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the namespace's index lock, shared by all processes using it."""
+        with open(self.lock_file, 'a+b') as f:
+            if os.name == "nt":
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass  # LK_LOCK gives up after about 10 seconds; keep waiting
+                try:
+                    yield
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _merge_index(self):
+        """Merge entries other processes saved into this one's index (lock held).
+
+        The newer copy of an entry wins and keeps the latest access time;
+        entries whose files are gone were evicted elsewhere and are dropped.
+        """
+        saved = self._load_index()
+        merged = {}
+        for key in set(saved) | set(self.index):
+            mine, theirs = self.index.get(key), saved.get(key)
+            if mine is None or theirs is None:
+                entry = mine or theirs
+            else:
+                entry = dict(mine if mine['created'] >= theirs['created'] else theirs)
+                entry['accessed'] = max(mine['accessed'], theirs['accessed'])
+            if os.path.exists(os.path.join(self.cache_dir, entry['file'])):
+                merged[key] = entry
+        self.index = merged
+        self.total_bytes = sum(entry['size'] for entry in merged.values())
+
+    def _adopt_untracked(self):
+        """Add cache files that no index lists, so they count toward the size limit."""
+        tracked = {entry['file'] for entry in self.index.values()}
+        for item in os.scandir(self.cache_dir):
+            name = item.name
+            if (not item.is_file() or name in tracked or name.endswith(".tmp")
+                    or name in (self.INDEX_FILE, self.LOCK_FILE)):
+                continue
+            stat = item.stat()
+            self.index[os.path.splitext(name)[0]] = {
+                'file': name, 'size': stat.st_size, 'created': stat.st_mtime, 'accessed': stat.st_mtime
+            }
+
+    def _leased_keys(self) -> Set[str]:
+        """Keys pinned by live processes (lock held); stale leases are removed."""
+        keys: Set[str] = set()
+        try:
+            leases = list(os.scandir(self.pin_dir))
+        except FileNotFoundError:
+            return keys
+        now = time.time()
+        for lease in leases:
+            pid = int(lease.name.split('-', 1)[0]) if lease.name[0].isdigit() else 0
+            try:
+                stale = now - lease.stat().st_mtime > self.PIN_LEASE_SECONDS or not _pid_alive(pid)
+                if stale:
+                    os.remove(lease.path)
+                    continue
+                with open(lease.path, 'r') as f:
+                    keys.update(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue  # Released while we looked
+        return keys
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        # Drop entries whose files were deleted outside the cache
+        return {k: e for k, e in index.items() if os.path.exists(os.path.join(self.cache_dir, e['file']))}
+
+    def _save_index(self):
+        with self._locked():
+            self._merge_index()
+            self._write_index()
+
+    def _write_index(self):
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_file, self.index_file)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process that holds a pin lease is still running."""
+    if pid <= 0:
+        return False
+    if pid == os.getpid() or os.name == "nt":
+        return True  # Windows leases expire by age only
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
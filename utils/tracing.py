@@ -0,0 +1,162 @@
+"""Lightweight pipeline tracing with nested spans and counters.
+
+Traces are written in the Chrome trace event format, so a job's trace file
+opens directly in chrome://tracing or https://ui.perfetto.dev. The file also
+carries a per-stage timing summary and final counter values under
+``otherData``.
+
+    tracer = start_trace("job-42")
+    with tracer.span("tts", scene=3):
+        ...
+    tracer.count("bytes_downloaded", 2048)
+    tracer.write("logs/traces/job-42.json")
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+def _now_us() -> int:
+    # Wall clock so spans from worker processes line up with the parent
+    return time.time_ns() // 1000
+
+
+class Tracer:
+    """Collects spans and counters for one render job."""
+    def __init__(self, name: str = "job"):
+        self.name = name
+        self.events: List[Dict] = []
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.started = _now_us()
+
+    @contextmanager
+    def span(self, name: str, **args):
+        """Time a block as a span; spans opened inside it nest under it."""
+        start = _now_us()
+        try:
+            yield
+        finally:
+            event = {
+                'name': name,
+                'ph': 'X',
+                'ts': start,
+                'dur': _now_us() - start,
+                'pid': os.getpid(),
+                'tid': threading.get_ident(),
+                'args': args
+            }
+            with self._lock:
+                self.events.append(event)
+
+    def count(self, name: str, value: float = 1):
+        """Add to a counter (frames rendered, bytes downloaded, cache hits...)."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            self.events.append({
+                'name': name,
+                'ph': 'C',
+                'ts': _now_us(),
+                'pid': os.getpid(),
+                'args': {name: self.counters[name]}
+            })
+
+    def merge(self, events: List[Dict]):
+        """Add events recorded in another process (e.g. a pool worker)."""
+        with self._lock:
+            for event in events:
+                self.events.append(event)
+                if event['ph'] == 'C':
+                    name = event['name']
+                    # Worker counters are cumulative per worker; fold them into ours
+                    self.counters[name] = self.counters.get(name, 0) + event.get('delta', 0)
+
+    def summary(self) -> Dict:
+        """Total time and call count per span name, plus counter values."""
+        stages: Dict[str, Dict] = {}
+        for event in self.events:
+            if event['ph'] != 'X':
+                continue
+            stage = stages.setdefault(event['name'], {'calls': 0, 'seconds': 0.0})
+            stage['calls'] += 1
+            stage['seconds'] += event['dur'] / 1e6
+        for stage in stages.values():
+            stage['seconds'] = round(stage['seconds'], 4)
+        return {
+            'job': self.name,
+            'wall_seconds': round((_now_us() - self.started) / 1e6, 4),
+            'stages': stages,
+            'counters': dict(self.counters)
+        }
+
+    def export_events(self) -> List[Dict]:
+        """Get events for merging into a parent tracer, with counter deltas."""
+        with self._lock:
+            events = []
+            seen: Dict[str, float] = {}
+            for event in self.events:
+                event = dict(event)
+                if event['ph'] == 'C':
+                    value = event['args'][event['name']]
+                    event['delta'] = value - seen.get(event['name'], 0)
+                    seen[event['name']] = value
+                events.append(event)
+            return events
+
+    def write(self, path: str) -> str:
+        """Write the trace file and return its path."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._lock:
+            events = [{k: v for k, v in e.items() if k != 'delta'} for e in self.events]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'traceEvents': events,
+                'displayTimeUnit': 'ms',
+                'otherData': self.summary()
+            }, f)
+        return path
+
+
+_current: Optional[Tracer] = None
+
+
+def start_trace(name: str = "job") -> Tracer:
+    """Start a new trace for a job and make it the current tracer."""
+    global _current
+    _current = Tracer(name)
+    return _current
+
+
+def get_tracer() -> Tracer:
+    """Get the current tracer, starting one if no job has started a trace."""
+    global _current
+    if _current is None:
+        _current = Tracer()
+    return _current
+
+
+def trace_path(config: Dict, name: str) -> str:
+    """Get the trace file path for a job under the configured log directory."""
+    log_dir = config.get('project', {}).get('log_dir', './logs/')
+    safe_name = ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in name)
+    return os.path.join(log_dir, "traces", f"{safe_name}_{int(time.time())}.json")
+
+
+@contextmanager
+def isolated_trace(name: str = "worker"):
+    """Record into a fresh tracer for the duration of the block.
+
+    Used around work that may run in a pool worker: the caller returns the
+    tracer's ``export_events()`` and the parent merges them, whether the work
+    ran in another process or inline.
+    """
+    global _current
+    previous = _current
+    _current = Tracer(name)
+    try:
+        yield _current
+    finally:
+        _current = previous